@@ -6,29 +6,45 @@ Supports batch reading of academic papers with automatic analysis and summarizat
 
 __version__ = "1.0.0"
 
-from .core import (
-    # Config
-    Config,
-    get_config,
-    reload_config,
+import importlib
 
-    # Models
+from .core.config import Config, get_config, reload_config
+from .core.models import (
     PaperContent,
     PaperAnalysis,
     AggregatedKnowledge,
     Report,
+)
 
+# Pipeline entry points are imported on first attribute access (PEP 562)
+_LAZY_IMPORTS = {
     # Main functions
-    parse_pdf,
-    parse_pdfs,
-    extract_paper_content,
-    extract_papers_content,
-    aggregate_papers,
-    generate_report,
-    save_report,
-)
+    "parse_pdf": ".core.pdf_parser",
+    "parse_pdfs": ".core.pdf_parser",
+    "extract_paper_content": ".core.content_extractor",
+    "extract_papers_content": ".core.content_extractor",
+    "aextract_papers_content": ".core.content_extractor",
+    "aggregate_papers": ".core.knowledge_aggregator",
+    "generate_report": ".core.report_generator",
+    "save_report": ".core.report_generator",
+    "save_reports": ".core.report_generator",
+
+    "PaperAgent": ".agent",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Subsequent lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-from .agent import PaperAgent
 
 __all__ = [
     "__version__",
@@ -43,8 +59,10 @@ __all__ = [
     "parse_pdfs",
     "extract_paper_content",
     "extract_papers_content",
+    "aextract_papers_content",
     "aggregate_papers",
     "generate_report",
     "save_report",
+    "save_reports",
     "PaperAgent",
 ]
@@ -3,21 +3,51 @@ Paper Agent Main Class
 Provides one-click execution of the complete analysis workflow
 """
 import os
+import asyncio
+import logging
 import glob as glob_module
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional, List, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Union
 
 from .core.config import Config, get_config
+from .core.cache import AnalysisCache
+from .core.logger import setup_logging
 from .core.models import PaperContent, PaperAnalysis, AggregatedKnowledge, Report
 from .core.pdf_parser import PDFParser
 from .core.content_extractor import ContentExtractor
 from .core.knowledge_aggregator import KnowledgeAggregator
 from .core.report_generator import ReportGenerator
 
+logger = logging.getLogger(__name__)
+
+
+def _loop_running() -> bool:
+    """Whether this thread is already running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 
 class PaperAgent:
     """Paper Reading Agent"""
 
+    __slots__ = (
+        "config",
+        "pdf_parser",
+        "content_extractor",
+        "knowledge_aggregator",
+        "report_generator",
+        "extract_cache",
+        "aggregate_cache",
+        "_papers",
+        "_analyses",
+        "_knowledge",
+    )
+
     def __init__(self, config_path: Optional[str] = None):
         """Initialize Paper Agent
 
@@ -25,6 +55,7 @@ class PaperAgent:
             config_path: Path to configuration file, auto-detect if not provided
         """
         self.config = Config(config_path) if config_path else get_config()
+        setup_logging(self.config.logging)
 
         # Initialize modules
         self.pdf_parser = PDFParser(self.config)
@@ -32,6 +63,10 @@ class PaperAgent:
         self.knowledge_aggregator = KnowledgeAggregator(self.config)
         self.report_generator = ReportGenerator(self.config)
 
+        # Persistent result caches (keyed by content hash)
+        self.extract_cache = AnalysisCache(self.config.cache, namespace="extract")
+        self.aggregate_cache = AnalysisCache(self.config.cache, namespace="aggregate")
+
         # Cache data
         self._papers: List[PaperContent] = []
         self._analyses: List[PaperAnalysis] = []
@@ -55,9 +90,9 @@ class PaperAgent:
         if not pdf_paths:
             raise ValueError(f"No PDF files found: {input_path}")
 
-        print(f"Loading {len(pdf_paths)} PDF files...")
+        logger.info(f"Loading {len(pdf_paths)} PDF files...")
         self._papers = self.pdf_parser.parse_all(pdf_paths)
-        print(f"Successfully loaded {len(self._papers)} papers")
+        logger.info(f"Successfully loaded {len(self._papers)} papers")
 
         return self._papers
 
@@ -74,18 +109,50 @@ class PaperAgent:
         if not papers:
             raise ValueError("No papers to analyze")
 
-        print(f"Analyzing {len(papers)} papers...")
-        self._analyses = []
-
-        for i, paper in enumerate(papers, 1):
-            print(f"  [{i}/{len(papers)}] Analyzing: {paper.title[:50]}...")
-            try:
-                analysis = self.content_extractor.extract(paper)
-                self._analyses.append(analysis)
-            except Exception as e:
-                print(f"    Failed: {e}")
-
-        print(f"Successfully analyzed {len(self._analyses)} papers")
+        logger.info(f"Analyzing {len(papers)} papers...")
+
+        # Bring back text released by an earlier analyze()
+        for paper in papers:
+            if not paper.full_text and paper.full_text_path:
+                paper.full_text = paper.load_full_text()
+
+        # One slot per paper: workers write by index, so input order is kept for free
+        results: List[Optional[PaperAnalysis]] = [None] * len(papers)
+
+        if self.config.parallel.enabled and len(papers) > 1 and not _loop_running():
+            # Extraction is dominated by LLM round-trips: overlap them on one event loop
+            results = asyncio.run(self._analyze_async(papers))
+        elif self.config.parallel.enabled and len(papers) > 1:
+            # Already inside an event loop (e.g. a notebook), fall back to threads
+            with ThreadPoolExecutor(max_workers=self.config.parallel.max_workers) as executor:
+                futures = {executor.submit(self._extract_cached, paper): i for i, paper in enumerate(papers)}
+
+                # Report progress as papers complete, from this thread only
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                        logger.info(f"  [{done}/{len(papers)}] Analyzed: {papers[i].title[:50]}...")
+                    except Exception as e:
+                        logger.error(f"  [{done}/{len(papers)}] Failed ({papers[i].title[:50]}): {e}")
+        else:
+            for i, paper in enumerate(papers):
+                logger.info(f"  [{i + 1}/{len(papers)}] Analyzing: {paper.title[:50]}...")
+                try:
+                    results[i] = self._extract_cached(paper)
+                except Exception as e:
+                    logger.error(f"    Failed: {e}")
+
+        # Drop failed papers
+        self._analyses = [analysis for analysis in results if analysis is not None]
+
+        if not self.config.pdf_parser.retain_full_text:
+            # Analysis was the last step to read the text: keep it on disk only
+            spill_dir = os.path.join(self.config.cache.cache_dir, "fulltext")
+            for paper in papers:
+                paper.release_full_text(spill_dir)
+
+        logger.info(f"Successfully analyzed {len(self._analyses)} papers")
         return self._analyses
 
     def aggregate(self, analyses: Optional[List[PaperAnalysis]] = None, custom_prompt: Optional[str] = None) -> AggregatedKnowledge:
@@ -102,9 +169,17 @@ class PaperAgent:
         if not analyses:
             raise ValueError("No analysis results to aggregate")
 
-        print(f"Aggregating knowledge from {len(analyses)} papers...")
-        self._knowledge = self.knowledge_aggregator.aggregate(analyses, custom_prompt=custom_prompt)
-        print("Knowledge aggregation complete")
+        logger.info(f"Aggregating knowledge from {len(analyses)} papers...")
+        key = self._aggregate_cache_key(analyses, custom_prompt)
+        knowledge = self.aggregate_cache.get(key)
+        if knowledge is not None:
+            knowledge = replace(knowledge, papers=list(analyses))
+            logger.info("Knowledge aggregation loaded from cache")
+        else:
+            knowledge = self.knowledge_aggregator.aggregate(analyses, custom_prompt=custom_prompt)
+            self.aggregate_cache.put(key, knowledge)
+            logger.info("Knowledge aggregation complete")
+        self._knowledge = knowledge
 
         return self._knowledge
 
@@ -131,7 +206,7 @@ class PaperAgent:
         if report_type in ["comparison", "trend"] and self._knowledge is None:
             self.aggregate()
 
-        print(f"Generating {report_type} report...")
+        logger.info(f"Generating {report_type} report...")
         report = self.report_generator.generate(
             report_type=report_type,
             papers=self._analyses,
@@ -141,7 +216,7 @@ class PaperAgent:
 
         if output_path:
             self.report_generator.save_report(report, output_path, self._analyses)
-            print(f"Report saved to: {output_path}")
+            logger.info(f"Report saved to: {output_path}")
 
         return report
 
@@ -178,21 +253,114 @@ class PaperAgent:
         # Generate report
         return self.generate_report(report_type, title, output_path)
 
+    async def _analyze_async(self, papers: List[PaperContent]) -> List[Optional[PaperAnalysis]]:
+        """Extract papers concurrently, at most parallel.max_workers in flight"""
+        semaphore = asyncio.Semaphore(self.config.parallel.max_workers)
+        done = 0
+
+        async def guarded(paper: PaperContent) -> Optional[PaperAnalysis]:
+            nonlocal done
+            key = self._extract_cache_key(paper)
+            analysis = self.extract_cache.get(key)
+            if analysis is not None:
+                # Cache hits never reach the LLM; copy, as the cached value is shared
+                analysis = replace(analysis, paper=paper)
+            else:
+                async with semaphore:
+                    try:
+                        analysis = await self.content_extractor.extract_async(paper)
+                    except Exception as e:
+                        done += 1
+                        logger.error(f"  [{done}/{len(papers)}] Failed ({paper.title[:50]}): {e}")
+                        return None
+                self._cache_analysis(key, analysis)
+
+            done += 1
+            logger.info(f"  [{done}/{len(papers)}] Analyzed: {paper.title[:50]}...")
+            return analysis
+
+        return list(await asyncio.gather(*(guarded(paper) for paper in papers)))
+
+    def _extract_cached(self, paper: PaperContent) -> PaperAnalysis:
+        """Extract paper content, reusing a cached analysis of identical content"""
+        key = self._extract_cache_key(paper)
+        analysis = self.extract_cache.get(key)
+        if analysis is not None:
+            # A copy pointing at the freshly parsed paper; the cached value is shared with
+            # other hits (e.g. the same paper saved under two names in one batch)
+            return replace(analysis, paper=paper)
+
+        analysis = self.content_extractor.extract(paper)
+        self._cache_analysis(key, analysis)
+        return analysis
+
+    def _cache_analysis(self, key: str, analysis: PaperAnalysis) -> None:
+        """Cache a fresh analysis, unless a dimension came back empty (e.g. a transient API error)"""
+        missing = self.content_extractor.missing_dimensions(analysis)
+        if missing:
+            logger.warning(f"Not caching analysis of {analysis.title[:50]}: no result for {', '.join(missing)}")
+            return
+        self.extract_cache.put(key, analysis)
+
+    def _extract_cache_key(self, paper: PaperContent) -> str:
+        """Cache key for a paper analysis: content plus every setting that shapes the output"""
+        extractor_cfg = self.config.content_extractor
+        report_cfg = self.config.report_generator
+        return AnalysisCache.make_key(
+            paper.load_full_text()[:65536],
+            self.config.llm.provider,
+            self.config.llm.model,
+            self.config.llm.structured_output,
+            tuple(extractor_cfg.dimensions),
+            extractor_cfg.max_length_per_dimension,
+            extractor_cfg.extract_keywords,
+            extractor_cfg.num_keywords,
+            extractor_cfg.fused_call,
+            extractor_cfg.truncate_by_tokens,
+            extractor_cfg.draft_keywords,
+            report_cfg.language,
+            report_cfg.summary_level,
+        )
+
+    def _aggregate_cache_key(self, analyses: List[PaperAnalysis], custom_prompt: Optional[str]) -> str:
+        """Cache key for aggregated knowledge over a set of analyses"""
+        aggregator_cfg = self.config.knowledge_aggregator
+        return AnalysisCache.make_key(
+            tuple((self._extract_cache_key(a.paper), a.summary) for a in analyses),
+            custom_prompt or "",
+            self.config.llm.provider,
+            self.config.llm.model,
+            self.config.llm.structured_output,
+            tuple(aggregator_cfg.comparison_dimensions),
+            aggregator_cfg.generate_timeline,
+            aggregator_cfg.analyze_trends,
+            aggregator_cfg.batch_comparison,
+            aggregator_cfg.truncate_by_tokens,
+            aggregator_cfg.summary_mode,
+            self.config.report_generator.language,
+        )
+
     def _resolve_paths(self, input_path: Union[str, List[str]]) -> List[str]:
-        """Resolve input paths to PDF file list"""
-        if isinstance(input_path, list):
-            paths = []
-            for p in input_path:
-                paths.extend(self._resolve_single_path(p))
-            return paths
-        else:
-            return self._resolve_single_path(input_path)
+        """Resolve input paths to PDF file list (duplicates removed, order preserved)"""
+        inputs = input_path if isinstance(input_path, list) else [input_path]
+
+        # Canonical path -> first spelling seen, so overlapping inputs
+        # (e.g. "papers/" and "papers/*.pdf") are only parsed once
+        seen: Dict[str, str] = {}
+        for p in inputs:
+            for resolved in self._resolve_single_path(p):
+                seen.setdefault(os.path.normcase(os.path.abspath(resolved)), resolved)
+        return list(seen.values())
 
     def _resolve_single_path(self, path: str) -> List[str]:
         """Resolve single path"""
         # Check if it's a glob pattern
         if '*' in path or '?' in path:
-            return sorted(glob_module.glob(path))
+            # Stream matches and keep only PDF files ("**" recurses into subdirectories)
+            return sorted(
+                match for match in glob_module.iglob(path, recursive=True)
+                if match.lower().endswith('.pdf') and os.path.isfile(match)
+            )
 
         path = os.path.abspath(path)
 
@@ -203,11 +371,17 @@ class PaperAgent:
                 return []
 
         elif os.path.isdir(path):
-            # Find all PDFs in directory
-            pdfs = []
-            for ext in ['*.pdf', '*.PDF']:
-                pdfs.extend(glob_module.glob(os.path.join(path, ext)))
-            return sorted(pdfs)
+            # Find all PDFs in directory (single pass, case-insensitive extension)
+            try:
+                with os.scandir(path) as entries:
+                    pdfs = [
+                        entry.path for entry in entries
+                        if entry.name.lower().endswith('.pdf') and entry.is_file()
+                    ]
+            except OSError:
+                return []
+            pdfs.sort()
+            return pdfs
 
         else:
             return []
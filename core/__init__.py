@@ -1,6 +1,7 @@
 """
 Paper Reading Agent - Core Modules
 """
+import importlib
 
 from .config import Config, get_config, reload_config
 from .models import (
@@ -9,12 +10,54 @@ from .models import (
     ExperimentAnalysis, ResultAnalysis,
     AggregatedKnowledge, Report
 )
-from .pdf_parser import PDFParser, parse_pdf, parse_pdfs
-from .structure_analyzer import StructureAnalyzer, analyze_structure
-from .llm_client import LLMClient, LLMHelper, create_llm_client, get_llm_helper
-from .content_extractor import ContentExtractor, extract_paper_content, extract_papers_content
-from .knowledge_aggregator import KnowledgeAggregator, aggregate_papers
-from .report_generator import ReportGenerator, generate_report, save_report
+
+# Heavier modules are imported on first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    # PDF Parser
+    "PDFParser": ".pdf_parser",
+    "parse_pdf": ".pdf_parser",
+    "parse_pdfs": ".pdf_parser",
+
+    # Structure Analyzer
+    "StructureAnalyzer": ".structure_analyzer",
+    "analyze_structure": ".structure_analyzer",
+
+    # LLM Client
+    "LLMClient": ".llm_client",
+    "LLMHelper": ".llm_client",
+    "create_llm_client": ".llm_client",
+    "get_llm_helper": ".llm_client",
+
+    # Content Extractor
+    "ContentExtractor": ".content_extractor",
+    "extract_paper_content": ".content_extractor",
+    "extract_papers_content": ".content_extractor",
+    "aextract_papers_content": ".content_extractor",
+
+    # Knowledge Aggregator
+    "KnowledgeAggregator": ".knowledge_aggregator",
+    "aggregate_papers": ".knowledge_aggregator",
+
+    # Report Generator
+    "ReportGenerator": ".report_generator",
+    "generate_report": ".report_generator",
+    "save_report": ".report_generator",
+    "save_reports": ".report_generator",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Subsequent lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     # Config
@@ -51,6 +94,7 @@ __all__ = [
     "ContentExtractor",
     "extract_paper_content",
     "extract_papers_content",
+    "aextract_papers_content",
 
     # Knowledge Aggregator
     "KnowledgeAggregator",
@@ -60,4 +104,5 @@ __all__ = [
     "ReportGenerator",
     "generate_report",
     "save_report",
+    "save_reports",
 ]
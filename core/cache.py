@@ -0,0 +1,134 @@
+"""
+Cache Module
+Responsible for persisting expensive analysis results between runs
+"""
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .config import CacheConfig
+
+# Keys only identify content (no cryptographic strength needed), so prefer a
+# fast non-cryptographic hash when one is installed. Otherwise use SHA-256,
+# which is hardware-accelerated (SHA-NI / ARMv8 SHA) on most current CPUs and
+# benchmarks faster than hashlib.blake2b there.
+try:
+    from xxhash import xxh3_128 as _new_hasher
+except ImportError:
+    try:
+        from blake3 import blake3 as _new_hasher
+    except ImportError:
+        _new_hasher = hashlib.sha256
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Content-addressed result cache (in-memory LRU in front of pickle files on disk)"""
+
+    def __init__(self, cache_config: CacheConfig, namespace: str = "extract", memory_size: int = 128):
+        """
+        Initialize analysis cache
+
+        Args:
+            cache_config: Cache configuration (enabled, cache_dir, expire_hours)
+            namespace: Subdirectory of cache_dir used for this cache
+            memory_size: Maximum number of entries kept in memory
+        """
+        self.enabled = cache_config.enabled
+        self.cache_dir = os.path.join(cache_config.cache_dir, namespace)
+        self.expire_seconds = cache_config.expire_hours * 3600
+        self.memory_size = memory_size
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from the given parts"""
+        hasher = _new_hasher()
+        for part in parts:
+            if not isinstance(part, bytes):
+                part = str(part).encode("utf-8", errors="surrogatepass")
+            hasher.update(part)
+            hasher.update(b"\x1f")  # Separator so ("ab", "c") != ("a", "bc")
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached value, or None on miss/expiry/disabled cache
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._path_for(key)
+        try:
+            if self.expire_seconds > 0 and time.time() - os.path.getmtime(path) > self.expire_seconds:
+                return None
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key from make_key()
+            value: Picklable value
+        """
+        if not self.enabled:
+            return
+
+        self._remember(key, value)
+
+        path = self._path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=5)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {key[:12]}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory layer (disk entries are kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the in-memory LRU layer"""
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
@@ -5,10 +5,28 @@ Responsible for loading and managing configuration files
 import os
 import re
 import yaml
+from functools import partial
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Optional, Any
 
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# Matches ${VAR_NAME} or ${VAR_NAME:default}
+_ENV_VAR_RE = re.compile(r'\$\{([^}:]+)(?::([^}]*))?\}')
+_ENV_SENTINEL = '${'
+
+
+def _replace_env_var(env: Dict[str, str], match: "re.Match") -> str:
+    """Substitute a single ${VAR_NAME[:default]} match from an environment snapshot"""
+    var_name = match.group(1)
+    default_value = match.group(2) if match.group(2) is not None else ""
+    return env.get(var_name, default_value)
+
 
 @dataclass
 class LLMConfig:
@@ -22,6 +40,7 @@ class LLMConfig:
     timeout: int = 120
     max_retries: int = 3
     retry_delay: int = 2
+    structured_output: bool = False  # Pass JSON schemas out-of-band instead of in the prompt
 
 
 @dataclass
@@ -32,6 +51,10 @@ class PDFParserConfig:
     extract_tables: bool = True
     max_pages: int = 0
     encoding: str = "utf-8"
+    page_workers: int = 0  # Worker processes per long PDF (pymupdf), 0 = sequential
+    lazy_images: bool = False  # Decode figures / render table screenshots on first use, not at parse time
+    compact_table_screenshots: bool = False  # Grayscale, adaptive-DPI, palette PNG table screenshots
+    retain_full_text: bool = True  # False: spill each paper's full text to disk once it is analyzed
 
 
 @dataclass
@@ -47,6 +70,9 @@ class ContentExtractorConfig:
     max_length_per_dimension: int = 2000
     extract_keywords: bool = True
     num_keywords: int = 10
+    fused_call: bool = False  # Extract all dimensions with a single LLM request
+    truncate_by_tokens: bool = False  # Apply length limits as token budgets (needs tiktoken)
+    draft_keywords: bool = False  # Draft keyword candidates locally, LLM only selects
 
 
 @dataclass
@@ -55,6 +81,9 @@ class KnowledgeAggregatorConfig:
     comparison_dimensions: List[str] = field(default_factory=lambda: ["architecture", "training_method", "performance"])
     generate_timeline: bool = True
     analyze_trends: bool = True
+    batch_comparison: bool = False  # Compare all dimensions in one LLM request
+    truncate_by_tokens: bool = False  # Apply summary input limits as token budgets (needs tiktoken)
+    summary_mode: str = "llm"  # Overall summary: llm, template, or hybrid
 
 
 @dataclass
@@ -72,6 +101,7 @@ class ParallelConfig:
     """Parallel Processing Configuration"""
     enabled: bool = True
     max_workers: int = 4
+    mode: str = "process"  # PDF parsing workers: "process" or "thread"
 
 
 @dataclass
@@ -90,6 +120,18 @@ class LoggingConfig:
     console: bool = True
 
 
+# Configuration file search order
+_LOCAL_CONFIG_PATHS = (
+    "./config.yaml",
+    "./paper_agent/config.yaml",
+    "../config.yaml",
+)
+_HOME_CONFIG_PATH = "~/.paper_agent/config.yaml"
+
+# Field names of the LLM config, used for validated in-place updates
+_LLM_FIELDS = frozenset(f.name for f in fields(LLMConfig))
+
+
 class Config:
     """Configuration Manager"""
 
@@ -116,19 +158,15 @@ class Config:
 
     def _find_config_file(self) -> Optional[str]:
         """Find configuration file"""
-        search_paths = [
-            "./config.yaml",
-            "./paper_agent/config.yaml",
-            "../config.yaml",
-            os.path.expanduser("~/.paper_agent/config.yaml"),
-        ]
-
-        for path in search_paths:
-            if os.path.exists(path):
+        for path in _LOCAL_CONFIG_PATHS:
+            if os.path.isfile(path):
                 return path
-        return None
 
-    def _resolve_env_vars(self, value: Any) -> Any:
+        # Only expand the home directory when no local config exists
+        home_config = os.path.expanduser(_HOME_CONFIG_PATH)
+        return home_config if os.path.isfile(home_config) else None
+
+    def _resolve_env_vars(self, value: Any, env: Optional[Dict[str, str]] = None) -> Any:
         """
         Resolve environment variables in configuration values.
 
@@ -140,21 +178,41 @@ class Config:
             ${OPENAI_API_KEY} -> value of OPENAI_API_KEY or ""
             ${LLM_PROVIDER:openai} -> value of LLM_PROVIDER or "openai"
             ${LLM_API_BASE:} -> value of LLM_API_BASE or ""
+
+        Nested dicts and lists are walked iteratively and updated in place;
+        only strings that actually contain a placeholder are rewritten.
+
+        Args:
+            value: Configuration value (str, dict, list or scalar)
+            env: Environment snapshot shared across the traversal, taken from os.environ if not provided
+
+        Returns:
+            The resolved value (the same container object for dicts and lists)
         """
-        if isinstance(value, str):
-            # Match ${VAR_NAME} or ${VAR_NAME:default} format
-            pattern = r'\$\{([^}:]+)(?::([^}]*))?\}'
+        if env is None:
+            env = dict(os.environ)
+        replace = partial(_replace_env_var, env)
 
-            def replace_env_var(match):
-                var_name = match.group(1)
-                default_value = match.group(2) if match.group(2) is not None else ""
-                return os.environ.get(var_name, default_value)
+        if isinstance(value, str):
+            return _ENV_VAR_RE.sub(replace, value) if _ENV_SENTINEL in value else value
 
-            return re.sub(pattern, replace_env_var, value)
-        elif isinstance(value, dict):
-            return {k: self._resolve_env_vars(v) for k, v in value.items()}
+        # (container, key/index, child) triples still to visit
+        stack: List[Any] = []
+        if isinstance(value, dict):
+            stack.extend((value, k, v) for k, v in value.items())
         elif isinstance(value, list):
-            return [self._resolve_env_vars(v) for v in value]
+            stack.extend((value, i, v) for i, v in enumerate(value))
+
+        while stack:
+            parent, key, node = stack.pop()
+            if isinstance(node, str):
+                if _ENV_SENTINEL in node:
+                    parent[key] = _ENV_VAR_RE.sub(replace, node)
+            elif isinstance(node, dict):
+                stack.extend((node, k, v) for k, v in node.items())
+            elif isinstance(node, list):
+                stack.extend((node, i, v) for i, v in enumerate(node))
+
         return value
 
     def load(self) -> None:
@@ -163,10 +221,10 @@ class Config:
             return
 
         with open(self.config_path, 'r', encoding='utf-8') as f:
-            self._raw_config = yaml.safe_load(f) or {}
+            self._raw_config = yaml.load(f, Loader=_YamlLoader) or {}
 
-        # Resolve environment variables
-        self._raw_config = self._resolve_env_vars(self._raw_config)
+        # Resolve environment variables against a single snapshot of os.environ
+        self._raw_config = self._resolve_env_vars(self._raw_config, dict(os.environ))
 
         # Load module configurations
         self._load_llm_config()
@@ -220,6 +278,7 @@ class Config:
             timeout=llm_cfg.get("timeout", 120),
             max_retries=llm_cfg.get("max_retries", 3),
             retry_delay=llm_cfg.get("retry_delay", 2),
+            structured_output=llm_cfg.get("structured_output", False),
         )
 
     def _load_pdf_parser_config(self) -> None:
@@ -230,6 +289,10 @@ class Config:
             extract_images=cfg.get("extract_images", False),
             extract_tables=cfg.get("extract_tables", True),
             max_pages=cfg.get("max_pages", 0),
+            page_workers=cfg.get("page_workers", 0),
+            lazy_images=cfg.get("lazy_images", False),
+            compact_table_screenshots=cfg.get("compact_table_screenshots", False),
+            retain_full_text=cfg.get("retain_full_text", True),
             encoding=cfg.get("encoding", "utf-8"),
         )
 
@@ -248,6 +311,9 @@ class Config:
             max_length_per_dimension=cfg.get("max_length_per_dimension", 2000),
             extract_keywords=cfg.get("extract_keywords", True),
             num_keywords=cfg.get("num_keywords", 10),
+            fused_call=cfg.get("fused_call", False),
+            truncate_by_tokens=cfg.get("truncate_by_tokens", False),
+            draft_keywords=cfg.get("draft_keywords", False),
         )
 
     def _load_knowledge_aggregator_config(self) -> None:
@@ -257,6 +323,9 @@ class Config:
             comparison_dimensions=cfg.get("comparison_dimensions", ["architecture", "training_method", "performance"]),
             generate_timeline=cfg.get("generate_timeline", True),
             analyze_trends=cfg.get("analyze_trends", True),
+            batch_comparison=cfg.get("batch_comparison", False),
+            truncate_by_tokens=cfg.get("truncate_by_tokens", False),
+            summary_mode=cfg.get("summary_mode", "llm"),
         )
 
     def _load_report_generator_config(self) -> None:
@@ -276,6 +345,7 @@ class Config:
         self.parallel = ParallelConfig(
             enabled=cfg.get("enabled", True),
             max_workers=cfg.get("max_workers", 4),
+            mode=cfg.get("mode", "process"),
         )
 
     def _load_cache_config(self) -> None:
@@ -297,12 +367,8 @@ class Config:
         )
 
     def get_llm_api_base(self) -> str:
-        """Get LLM API base URL"""
-        if self.llm.api_base:
-            return self.llm.api_base
-
-        provider_config = self.llm_providers.get(self.llm.provider, {})
-        return provider_config.get("api_base", "")
+        """Get LLM API base URL (provider preset is folded into llm.api_base at load/update time)"""
+        return self.llm.api_base
 
     def save(self, path: Optional[str] = None) -> None:
         """Save configuration to file"""
@@ -311,13 +377,19 @@ class Config:
             raise ValueError("No config path specified")
 
         with open(save_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self._raw_config, f, allow_unicode=True, default_flow_style=False)
+            yaml.dump(self._raw_config, f, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False)
 
     def update_llm(self, **kwargs) -> None:
         """Update LLM configuration"""
+        llm_dict = self.llm.__dict__
+        provider_changed = "provider" in kwargs and kwargs["provider"] != self.llm.provider
         for key, value in kwargs.items():
-            if hasattr(self.llm, key):
-                setattr(self.llm, key, value)
+            if key in _LLM_FIELDS:
+                llm_dict[key] = value
+
+        # Switching provider without an explicit endpoint picks up the new preset's api_base
+        if provider_changed and "api_base" not in kwargs:
+            llm_dict["api_base"] = self.llm_providers.get(self.llm.provider, {}).get("api_base", "")
 
     def __repr__(self) -> str:
         return f"Config(llm={self.llm.provider}:{self.llm.model})"
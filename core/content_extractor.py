@@ -2,8 +2,18 @@
 Content Extractor Module
 Responsible for extracting key information from papers using LLM
 """
+import io
+import logging
+import re
 import json
-from typing import Optional, List, Dict, Any
+import bisect
+import itertools
+import asyncio
+import string
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .models import (
@@ -12,7 +22,48 @@ from .models import (
 )
 from .config import Config, get_config
 from .structure_analyzer import StructureAnalyzer
-from .llm_client import LLMHelper
+from .llm_client import LLMHelper, _run_sync
+from .cache import AnalysisCache
+from .keywords import draft_keywords
+from .tokens import CHARS_PER_TOKEN, truncate_tokens
+from .schemas import object_schema, text_schema, text_list_schema
+
+logger = logging.getLogger(__name__)
+
+
+# Summary language -> natural language name used in the prompt
+_LANGUAGE_NAMES = {"english": "English", "chinese": "Chinese"}
+
+# (language, summary_level) -> length instruction used in the summary prompt
+_DETAIL_LEVELS = {
+    ("english", "brief"): "brief (200-300 words)",
+    ("english", "detailed"): "detailed (400-600 words)",
+    ("english", "comprehensive"): "comprehensive (800-1000 words)",
+    ("chinese", "brief"): "简短（200-300字）",
+    ("chinese", "detailed"): "详细（400-600字）",
+    ("chinese", "comprehensive"): "全面（800-1000字）",
+}
+
+
+def _static_prefix(template: str) -> str:
+    """Rendered text of a format template up to its first replacement field"""
+    parts = []
+    for literal, field_name, _, _ in string.Formatter().parse(template):
+        parts.append(literal)
+        if field_name is not None:
+            break
+    return "".join(parts)
+
+
+def _split_on_content(template: str) -> Tuple[str, str]:
+    """Render a template whose only field is {content} into (prefix, suffix)"""
+    prefix, suffix = template.format(content="\x00").split("\x00")
+    return prefix, suffix
+
+
+# "Please return results in JSON format ... }}" block of a prompt, redundant
+# when the schema is sent out-of-band (llm.structured_output)
+_JSON_FORMAT_BLOCK_RE = re.compile(r"Please return results in JSON format.*?\n\}\n\n", re.DOTALL)
 
 
 class ContentExtractor:
@@ -20,10 +71,7 @@ class ContentExtractor:
 
     # Four-dimension extraction prompts
     EXTRACTION_PROMPTS = {
-        "background": """Analyze the research background of this paper and extract the following information:
-
-Paper content:
-{content}
+        "background": """Analyze the research background of this paper and extract the following information.
 
 Please return results in JSON format, including:
 {{
@@ -34,12 +82,12 @@ Please return results in JSON format, including:
     "research_goals": "Research goals"
 }}
 
-Be concise and accurate in your extraction.""",
-
-        "technology": """Analyze the technical methods of this paper and extract the following information:
+Be concise and accurate in your extraction.
 
 Paper content:
-{content}
+{content}""",
+
+        "technology": """Analyze the technical methods of this paper and extract the following information.
 
 Please return results in JSON format, including:
 {{
@@ -57,12 +105,12 @@ Please return results in JSON format, including:
 Focus on core technical contributions. Pay special attention to:
 1. Correctly identifying the architecture type
 2. DISTINGUISHING the model type - especially between LLM and Multimodal models
-3. Identifying the PRIMARY application scenarios based on the paper's focus""",
-
-        "experiment": """Analyze the experimental design of this paper and extract the following information:
+3. Identifying the PRIMARY application scenarios based on the paper's focus
 
 Paper content:
-{content}
+{content}""",
+
+        "experiment": """Analyze the experimental design of this paper and extract the following information.
 
 Please return results in JSON format, including:
 {{
@@ -73,12 +121,12 @@ Please return results in JSON format, including:
     "ablation_studies": "Description of ablation studies (if any)"
 }}
 
-Include specific dataset names and metrics.""",
-
-        "result": """Analyze the results of this paper and extract the following information:
+Include specific dataset names and metrics.
 
 Paper content:
-{content}
+{content}""",
+
+        "result": """Analyze the results of this paper and extract the following information.
 
 Please return results in JSON format, including:
 {{
@@ -89,45 +137,160 @@ Please return results in JSON format, including:
     "future_work": "Future work directions"
 }}
 
-Summarize the results accurately.""",
+Summarize the results accurately.
+
+Paper content:
+{content}""",
     }
 
-    # Section analysis prompt
-    SECTION_ANALYSIS_PROMPT = """Analyze this section and extract key information:
+    # Schemas of the four dimensions, sent out-of-band with llm.structured_output
+    DIMENSION_SCHEMAS = {
+        "background": object_schema({
+            "research_field": text_schema("Research field and domain"),
+            "problem_definition": text_schema("Problem being solved"),
+            "motivation": text_schema("Research motivation"),
+            "existing_limitations": text_schema("Limitations of existing methods"),
+            "research_goals": text_schema("Research goals"),
+        }),
+        "technology": object_schema({
+            "method_overview": text_schema("Overall description of the method"),
+            "innovations": text_list_schema("Innovations"),
+            "key_designs": text_list_schema("Key designs"),
+            "implementation_details": text_schema("Important implementation details"),
+            "architecture": text_schema("Model/system architecture description"),
+            "architecture_type": text_schema(
+                "One of: MoE (Mixture-of-Experts), Dense, Hybrid, or Other. Check for 'MoE', "
+                "'Mixture-of-Experts', 'sparse activation', 'expert routing', 'total parameters vs "
+                "activated parameters'. A model built on another model inherits its architecture type."
+            ),
+            "model_scale": text_schema(
+                "Total parameters and activated parameters (if MoE), e.g. 'XXB total, YYB activated "
+                "per token' or 'ZZB parameters' for dense models"
+            ),
+            "model_type": text_schema(
+                "PRIMARY model type, ONE of: LLM, Multimodal, Vision, Audio, Code, Reasoning, or Other. "
+                "Do NOT confuse models from the same series (e.g. Model-VL is Multimodal, Model-LLM is LLM)."
+            ),
+            "application_scenarios": text_list_schema(
+                "MAIN intended use cases, e.g. text generation, image understanding, "
+                "visual question answering, code generation, mathematical reasoning"
+            ),
+        }),
+        "experiment": object_schema({
+            "datasets": text_list_schema("Dataset names"),
+            "metrics": text_list_schema("Evaluation metrics"),
+            "baselines": text_list_schema("Baseline methods"),
+            "setup": text_schema("Experimental setup description"),
+            "ablation_studies": text_schema("Description of ablation studies (if any)"),
+        }),
+        "result": object_schema({
+            "main_results": text_schema("Key experimental results"),
+            "performance_improvements": text_schema("Performance improvements compared to baselines"),
+            "key_findings": text_list_schema("Key findings"),
+            "limitations": text_schema("Known limitations of the method"),
+            "future_work": text_schema("Future work directions"),
+        }),
+    }
 
-Section type: {section_type}
-Content:
-{content}
+    # All dimensions in one request (content_extractor.fused_call)
+    FUSED_EXTRACTION_PROMPT = """Analyze this paper along several dimensions at once.
+
+Return ONE JSON object whose top-level keys are {dimensions}. The value of each key is the JSON object described by that dimension's instructions below.
+
+{instructions}
+
+Paper content for each dimension:
+
+{contents}"""
+
+    # Quick summary prompts (extract_quick / extract_quick_batch)
+    QUICK_SUMMARY_PROMPT = """Generate a brief summary of this paper (around 200 words):
+
+Title: {title}
+Abstract: {abstract}
+
+Include: main problem, proposed method, and key results."""
+
+    QUICK_SUMMARY_BATCH_PROMPT = """Generate a brief summary (around 200 words) for each of the papers below.
+Each summary should include: main problem, proposed method, and key results.
+
+Please return results in JSON format, with one entry per paper in the given order:
+{{
+    "summaries": [
+        {{"index": 1, "summary": "Summary of paper 1"}},
+        {{"index": 2, "summary": "Summary of paper 2"}},
+        ...
+    ]
+}}
+
+Number of papers: {count}
+
+{papers}"""
+
+    # Section analysis prompt
+    SECTION_ANALYSIS_PROMPT = """Analyze this section and extract key information.
 
 Please return results in JSON format, including:
 {{
     "key_points": ["Key point 1", "Key point 2", ...],
     "summary": "Brief summary",
     "keywords": ["Keyword 1", "Keyword 2", ...]
-}}"""
+}}
+
+Section type: {section_type}
+Content:
+{content}"""
 
     # Keyword extraction prompt
-    KEYWORDS_PROMPT = """Extract {num_keywords} core keywords from the following paper abstract and content.
+    KEYWORDS_PROMPT = """Extract core keywords from the paper abstract and content below.
+
+Please return results in JSON format:
+{{
+    "keywords": ["keyword1", "keyword2", ...]
+}}
+
+Keywords should cover:
+1. Research field/domain
+2. Core methods/techniques
+3. Key contributions
+4. Application areas
+
+Number of keywords: {num_keywords}
 
 Title: {title}
 Abstract: {abstract}
 
 Main content:
-{content}
+{content}"""
+
+    # Keyword verification prompt (content_extractor.draft_keywords)
+    KEYWORDS_VERIFY_PROMPT = """From the candidate keywords below, drafted automatically from a paper, select the most important ones.
 
 Please return results in JSON format:
 {{
     "keywords": ["keyword1", "keyword2", ...]
 }}
 
-Keywords should cover:
-1. Research field/domain
-2. Core methods/techniques
-3. Key contributions
-4. Application areas"""
+Prefer candidates covering the research field, core methods, key contributions and application areas. Fix capitalization and merge near-duplicates; do not invent keywords that are not supported by the candidates.
+
+Number of keywords: {num_keywords}
+
+Title: {title}
+
+Candidates:
+{candidates}"""
 
     # Summary generation prompt
-    SUMMARY_PROMPT = """Generate a comprehensive summary of this paper in {language}.
+    SUMMARY_PROMPT = """Generate a comprehensive summary of the paper below, covering:
+1. Research problem and motivation
+2. Proposed method and innovations
+3. Experimental validation and main results
+4. Paper contributions and significance
+
+Output the summary directly, no JSON format needed.
+
+Language: {language}
+Length: {detail_level}
 
 Paper title: {title}
 Abstract: {abstract}
@@ -136,21 +299,82 @@ Main analysis results:
 - Research background: {background}
 - Core technology: {technology}
 - Experimental design: {experiment}
-- Main results: {result}
-
-Please generate a {detail_level} summary covering:
-1. Research problem and motivation
-2. Proposed method and innovations
-3. Experimental validation and main results
-4. Paper contributions and significance
-
-Output the summary directly, no JSON format needed."""
+- Main results: {result}"""
+
+    # Search for architecture-critical paragraphs using GENERIC keywords
+    ARCH_KEYWORDS = (
+        # Model initialization/heritage keywords
+        'base model', 'built on', 'based on', 'starting from',
+        'initialized from', 'inherit', 'extend',
+        # Architecture type keywords
+        'architecture', 'moe', 'mixture-of-experts', 'mixture of experts',
+        'dense', 'sparse', 'transformer', 'attention',
+        # Model scale keywords
+        'parameters', 'param', 'billion', 'million',
+        'total parameters', 'activated parameters',
+        # Expert-related keywords
+        'expert', 'routing', 'gating', 'load balancing'
+    )
+    # One case-insensitive pass per paragraph instead of one substring scan per keyword
+    ARCH_KEYWORDS_RE = re.compile("|".join(map(re.escape, ARCH_KEYWORDS)), re.IGNORECASE)
+
+    # Most key resources the LLM is asked to select (see _key_resources_prompt)
+    MAX_KEY_FIGURES = 3
+    MAX_KEY_TABLES = 3
+    MAX_KEY_EQUATIONS = 5
+
+    # Above MAX_LISTED_RESOURCES figures+tables+equations, the key resource
+    # prompt lists only the most descriptive MAX_LISTED_PER_KIND of each kind
+    MAX_LISTED_RESOURCES = 200
+    MAX_LISTED_PER_KIND = 60
+
+    # Entries kept by the truncation memo (a paper needs about a dozen)
+    TRUNCATE_CACHE_SIZE = 256
+
+    # Extraction prompts split once around {content}: rendering is plain concatenation
+    EXTRACTION_PARTS = {dim: _split_on_content(template) for dim, template in EXTRACTION_PROMPTS.items()}
+
+    # Static prompt heads; variable fields come last so providers can cache these
+    EXTRACTION_PREFIXES = {dim: prefix for dim, (prefix, _) in EXTRACTION_PARTS.items()}
+
+    # Extraction prompt heads without the inline JSON description (llm.structured_output)
+    STRUCTURED_PREFIXES = {dim: _JSON_FORMAT_BLOCK_RE.sub("", prefix) for dim, prefix in EXTRACTION_PREFIXES.items()}
+    SECTION_ANALYSIS_PREFIX = _static_prefix(SECTION_ANALYSIS_PROMPT)
+    KEYWORDS_PREFIX = _static_prefix(KEYWORDS_PROMPT)
 
     def __init__(self, config: Optional[Config] = None):
         self.config = config or get_config()
         self.extractor_config = self.config.content_extractor
         self.structure_analyzer = StructureAnalyzer(self.config)
-        self.llm_helper = LLMHelper(self.config)
+        # Re-running on the same paper replays every LLM response from this cache
+        self.llm_cache = AnalysisCache(self.config.cache, namespace="llm", memory_size=1000)
+        self.llm_helper = LLMHelper(self.config, cache=self.llm_cache)
+        # Token-based truncations, keyed by (text, max_chars)
+        self._truncate_cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._truncate_lock = threading.Lock()
+        # Worker threads are created on first parallel extract() and reused across papers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool shared by every extract() call of this extractor"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.parallel.max_workers,
+                thread_name_prefix="content-extractor",
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the worker threads (a later extract() starts new ones)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __del__(self):
+        # __init__ may not have got as far as creating the attribute
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
 
     def extract(self, paper: PaperContent) -> PaperAnalysis:
         """Comprehensively extract paper content"""
@@ -160,48 +384,190 @@ Output the summary directly, no JSON format needed."""
         # Create analysis result object
         analysis = PaperAnalysis(paper=paper)
 
-        # Extract each dimension in parallel
-        dimensions = self.extractor_config.dimensions
         dimension_contents = self._prepare_dimension_contents(paper, sections)
+        dimension_contents = {
+            dim: dimension_contents[dim] for dim in self.extractor_config.dimensions if dim in dimension_contents
+        }
 
-        if self.config.parallel.enabled:
-            with ThreadPoolExecutor(max_workers=min(len(dimensions), self.config.parallel.max_workers)) as executor:
-                futures = {}
-                for dim in dimensions:
-                    if dim in dimension_contents:
-                        futures[executor.submit(self._extract_dimension, dim, dimension_contents[dim])] = dim
+        if not self.config.parallel.enabled:
+            self._extract_dimensions_serial(analysis, dimension_contents)
+
+            # Extract keywords
+            if self.extractor_config.extract_keywords:
+                analysis.keywords = self._extract_keywords(paper)
+
+            # Generate summary
+            analysis.summary = self._generate_summary(paper, analysis)
+
+            # Identify key figures, tables, and equations
+            self._identify_key_resources(paper, analysis)
 
+            # Analyze sections
+            analysis.sections = self._analyze_sections(sections)
+
+            return analysis
+
+        # Only summary -> key resources depend on the dimension results; start
+        # keywords and sections together with the dimensions. Tasks never wait
+        # on other tasks, so sharing the pool across concurrent extract() calls
+        # cannot deadlock.
+        executor = self.executor
+        keywords_future = (
+            executor.submit(self._extract_keywords, paper)
+            if self.extractor_config.extract_keywords else None
+        )
+        sections_future = executor.submit(self._analyze_sections, sections)
+        # Futures still pending when something below raises are cancelled, so a
+        # failed paper does not leave its queued requests running on the pool
+        pending = [future for future in (keywords_future, sections_future) if future is not None]
+        try:
+            if self.extractor_config.fused_call:
+                # One request returning every dimension
+                for dim, result in self._extract_dimensions_fused(dimension_contents):
+                    self._set_dimension_result(analysis, dim, result)
+            else:
+                # Dimensions with identical content share one request
+                futures = {
+                    executor.submit(self._extract_dimension_group, group): group
+                    for group in self._group_by_content(dimension_contents)
+                }
+                pending.extend(futures)
                 for future in as_completed(futures):
-                    dim = futures[future]
                     try:
-                        result = future.result()
-                        self._set_dimension_result(analysis, dim, result)
+                        for dim, result in future.result().items():
+                            self._set_dimension_result(analysis, dim, result)
                     except Exception as e:
-                        print(f"Failed to extract {dim}: {e}")
-        else:
-            for dim in dimensions:
-                if dim in dimension_contents:
-                    try:
-                        result = self._extract_dimension(dim, dimension_contents[dim])
-                        self._set_dimension_result(analysis, dim, result)
-                    except Exception as e:
-                        print(f"Failed to extract {dim}: {e}")
+                        logger.warning(f"Failed to extract {', '.join(futures[future])}: {e}")
 
-        # Extract keywords
-        if self.extractor_config.extract_keywords:
-            analysis.keywords = self._extract_keywords(paper)
+            # Generate summary, then pick key resources based on it
+            analysis.summary = self._generate_summary(paper, analysis)
+            self._identify_key_resources(paper, analysis)
+
+            if keywords_future is not None:
+                analysis.keywords = keywords_future.result()
+            analysis.sections = sections_future.result()
+
+            return analysis
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _extract_dimensions_serial(self, analysis: PaperAnalysis, dimension_contents: Dict[str, str]) -> None:
+        """Extract dimensions one request at a time"""
+        if self.extractor_config.fused_call:
+            for dim, result in self._extract_dimensions_fused(dimension_contents):
+                self._set_dimension_result(analysis, dim, result)
+            return
+
+        for group in self._group_by_content(dimension_contents):
+            try:
+                for dim, result in self._extract_dimension_group(group).items():
+                    self._set_dimension_result(analysis, dim, result)
+            except Exception as e:
+                logger.warning(f"Failed to extract {', '.join(group)}: {e}")
+
+    @staticmethod
+    def _group_by_content(dimension_contents: Dict[str, str]) -> List[Dict[str, str]]:
+        """Group dimensions whose prepared content is identical (e.g. abstract fallbacks)"""
+        groups: Dict[str, Dict[str, str]] = {}
+        for dim, content in dimension_contents.items():
+            groups.setdefault(content, {})[dim] = content
+        return list(groups.values())
+
+    def _extract_dimension_group(self, group: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Extract dimensions sharing one content: a single dimension call, or one fused call"""
+        if len(group) == 1:
+            (dim, content), = group.items()
+            return {dim: self._extract_dimension(dim, content)}
+        return dict(self._extract_dimensions_fused(group))
+
+    async def _aextract_dimension_group(self, group: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Extract dimensions sharing one content (async)"""
+        if len(group) == 1:
+            (dim, content), = group.items()
+            return {dim: await self._aextract_dimension(dim, content)}
+        return await self._aextract_dimensions_fused(group)
+
+    async def extract_async(self, paper: PaperContent) -> PaperAnalysis:
+        """
+        Comprehensively extract paper content without blocking the event loop
 
-        # Generate summary
-        analysis.summary = self._generate_summary(paper, analysis)
+        Same output as extract(), but all independent LLM calls of a paper
+        (dimensions, keywords, sections) are issued concurrently.
+        """
+        sections = self.structure_analyzer.analyze(paper)
+        analysis = PaperAnalysis(paper=paper)
 
-        # Identify key figures, tables, and equations
-        self._identify_key_resources(paper, analysis)
+        dimension_contents = self._prepare_dimension_contents(paper, sections)
+        dimensions = [dim for dim in self.extractor_config.dimensions if dim in dimension_contents]
 
-        # Analyze sections
-        analysis.sections = self._analyze_sections(sections)
+        async def no_keywords() -> List[str]:
+            return []
+
+        if self.extractor_config.fused_call:
+            async def extract_dimensions() -> List[Dict[str, Any]]:
+                results = await self._aextract_dimensions_fused({dim: dimension_contents[dim] for dim in dimensions})
+                return [results.get(dim, {}) for dim in dimensions]
+        else:
+            async def extract_dimensions() -> List[Dict[str, Any]]:
+                # Dimensions with identical content share one request
+                groups = self._group_by_content({dim: dimension_contents[dim] for dim in dimensions})
+                if self.config.parallel.enabled:
+                    group_results = await asyncio.gather(*(self._aextract_dimension_group(g) for g in groups))
+                else:
+                    group_results = [await self._aextract_dimension_group(g) for g in groups]
+                results = {dim: result for group_result in group_results for dim, result in group_result.items()}
+                return [results.get(dim, {}) for dim in dimensions]
+
+        if self.config.parallel.enabled:
+            dimension_results, keywords, section_results = await asyncio.gather(
+                extract_dimensions(),
+                self._aextract_keywords(paper) if self.extractor_config.extract_keywords else no_keywords(),
+                self._aanalyze_sections(sections),
+            )
+        else:
+            dimension_results = await extract_dimensions()
+            keywords = await self._aextract_keywords(paper) if self.extractor_config.extract_keywords else []
+            section_results = await self._aanalyze_sections(sections)
+
+        for dim, result in zip(dimensions, dimension_results):
+            self._set_dimension_result(analysis, dim, result)
+        analysis.keywords = keywords
+        analysis.sections = section_results
+
+        # Summary and key resources depend on the dimension results
+        analysis.summary = await self.llm_helper.aask(self._summary_prompt(paper, analysis))
+        await self._aidentify_key_resources(paper, analysis)
 
         return analysis
 
+    def extract_many(self, papers: List[PaperContent], max_concurrency: Optional[int] = None) -> List[Optional[PaperAnalysis]]:
+        """
+        Extract several papers concurrently on one event loop
+
+        Args:
+            papers: Papers to extract
+            max_concurrency: Maximum papers in flight, defaults to parallel.max_workers
+
+        Returns:
+            Analyses in input order (None for papers that failed)
+        """
+        return _run_sync(self.extract_many_async(papers, max_concurrency))
+
+    async def extract_many_async(self, papers: List[PaperContent], max_concurrency: Optional[int] = None) -> List[Optional[PaperAnalysis]]:
+        """Coroutine behind extract_many()"""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.config.parallel.max_workers))
+
+        async def guarded(paper: PaperContent) -> Optional[PaperAnalysis]:
+            async with semaphore:
+                try:
+                    return await self.extract_async(paper)
+                except Exception as e:
+                    logger.warning(f"Failed to extract {paper.title}: {e}")
+                    return None
+
+        return list(await asyncio.gather(*(guarded(paper) for paper in papers)))
+
     def extract_quick(self, paper: PaperContent) -> PaperAnalysis:
         """Quick extraction - only extract keywords and brief summary"""
         analysis = PaperAnalysis(paper=paper)
@@ -211,16 +577,109 @@ Output the summary directly, no JSON format needed."""
             analysis.keywords = self._extract_keywords(paper)
 
         # Generate brief summary
-        prompt = f"""Generate a brief summary of this paper (around 200 words):
+        prompt = self.QUICK_SUMMARY_PROMPT.format(title=paper.title, abstract=paper.abstract)
+        analysis.summary = self.llm_helper.ask(prompt)
 
-Title: {paper.title}
-Abstract: {paper.abstract}
+        return analysis
 
-Include: main problem, proposed method, and key results."""
+    def extract_quick_batch(self, papers: List[PaperContent], batch_size: int = 8) -> List[PaperAnalysis]:
+        """
+        Quick extraction of many papers, several brief summaries per LLM call
 
-        analysis.summary = self.llm_helper.ask(prompt)
+        Args:
+            papers: Papers to extract
+            batch_size: Papers summarized by one request
 
-        return analysis
+        Returns:
+            Analyses in input order
+        """
+        return _run_sync(self.aextract_quick_batch(papers, batch_size))
+
+    async def aextract_quick_batch(self, papers: List[PaperContent], batch_size: int = 8) -> List[PaperAnalysis]:
+        """Coroutine behind extract_quick_batch(); independent batches overlap on the network"""
+        analyses = [PaperAnalysis(paper=paper) for paper in papers]
+        batch_size = max(1, batch_size)
+        semaphore = asyncio.Semaphore(self.config.parallel.max_workers if self.config.parallel.enabled else 1)
+
+        async def summarize(start: int) -> None:
+            batch = papers[start:start + batch_size]
+            async with semaphore:
+                summaries = await self._aquick_summaries(batch)
+            for offset, summary in enumerate(summaries):
+                analyses[start + offset].summary = summary
+
+        async def keywords(analysis: PaperAnalysis) -> None:
+            async with semaphore:
+                analysis.keywords = await self._aextract_keywords(analysis.paper)
+
+        tasks = [summarize(start) for start in range(0, len(papers), batch_size)]
+        if self.extractor_config.extract_keywords:
+            tasks.extend(keywords(analysis) for analysis in analyses)
+        await asyncio.gather(*tasks)
+
+        return analyses
+
+    async def _aquick_summaries(self, papers: List[PaperContent]) -> List[str]:
+        """Brief summaries for a batch of papers, in order"""
+        if len(papers) == 1:
+            paper = papers[0]
+            return [await self.llm_helper.aask(self.QUICK_SUMMARY_PROMPT.format(title=paper.title, abstract=paper.abstract))]
+
+        numbered = "\n\n".join(
+            f"Paper {idx}:\nTitle: {paper.title}\nAbstract: {paper.abstract}"
+            for idx, paper in enumerate(papers, 1)
+        )
+        prompt = self.QUICK_SUMMARY_BATCH_PROMPT.format(count=len(papers), papers=numbered)
+
+        summaries: Dict[int, str] = {}
+        try:
+            result = await self.llm_helper.aextract_json(prompt)
+            for item in result.get("summaries", []):
+                if isinstance(item, dict) and isinstance(item.get("summary"), str):
+                    summaries[int(item.get("index", 0))] = item["summary"]
+        except Exception as e:
+            logger.warning(f"Failed to summarize batch of {len(papers)} papers: {e}")
+
+        # Papers the batch answer missed are summarized on their own
+        missing = [idx for idx in range(1, len(papers) + 1) if not summaries.get(idx)]
+        if missing:
+            retried = await asyncio.gather(*(self._aquick_summaries([papers[idx - 1]]) for idx in missing))
+            for idx, (summary,) in zip(missing, retried):
+                summaries[idx] = summary
+
+        return [summaries[idx] for idx in range(1, len(papers) + 1)]
+
+    def _truncate(self, text: str, max_chars: int) -> str:
+        """
+        Cut text down to a length budget
+
+        Budgets are given in characters. With content_extractor.truncate_by_tokens
+        and tiktoken installed, the budget is converted to tokens
+        (CHARS_PER_TOKEN characters each) and the text is cut on token
+        boundaries, which tracks the real prompt cost for CJK text and code.
+        """
+        if not self.extractor_config.truncate_by_tokens:
+            return text[:max_chars]
+
+        max_tokens = max(1, max_chars // CHARS_PER_TOKEN)
+        if len(text) <= max_tokens:
+            return text  # Every token is at least one character
+
+        # Dimension contents and section analysis cut the same sections to the
+        # same budgets (e.g. introduction/experiment at 2000), so share the work
+        key = (text, max_chars)
+        with self._truncate_lock:
+            if key in self._truncate_cache:
+                self._truncate_cache.move_to_end(key)
+                return self._truncate_cache[key]
+
+        truncated = truncate_tokens(text, max_chars)
+
+        with self._truncate_lock:
+            self._truncate_cache[key] = truncated
+            while len(self._truncate_cache) > self.TRUNCATE_CACHE_SIZE:
+                self._truncate_cache.popitem(last=False)
+        return truncated
 
     def _prepare_dimension_contents(self, paper: PaperContent, sections: Dict[str, str]) -> Dict[str, str]:
         """Prepare content for each dimension extraction"""
@@ -229,9 +688,9 @@ Include: main problem, proposed method, and key results."""
         # Background: abstract + introduction + related work
         background_parts = [paper.abstract]
         if "introduction" in sections:
-            background_parts.append(sections["introduction"][:2000])
+            background_parts.append(self._truncate(sections["introduction"], 2000))
         if "related_work" in sections:
-            background_parts.append(sections["related_work"][:1000])
+            background_parts.append(self._truncate(sections["related_work"], 1000))
         contents["background"] = "\n\n".join(background_parts)
 
         # Technology: method + architecture parts
@@ -241,45 +700,39 @@ Include: main problem, proposed method, and key results."""
             method_text = sections["method"]
 
             # Take first part (overview)
-            tech_parts.append(method_text[:1500])
-
-            # Search for architecture-critical paragraphs using GENERIC keywords
-            arch_keywords = [
-                # Model initialization/heritage keywords
-                'base model', 'built on', 'based on', 'starting from',
-                'initialized from', 'inherit', 'extend',
-                # Architecture type keywords
-                'architecture', 'moe', 'mixture-of-experts', 'mixture of experts',
-                'dense', 'sparse', 'transformer', 'attention',
-                # Model scale keywords
-                'parameters', 'param', 'billion', 'million',
-                'total parameters', 'activated parameters',
-                # Expert-related keywords
-                'expert', 'routing', 'gating', 'load balancing'
-            ]
+            tech_parts.append(self._truncate(method_text, 1500))
 
             # Split into paragraphs and find architecture-related ones
+            total_length = len(tech_parts[0])
             paragraphs = method_text.split('\n\n')
-            for para in paragraphs:
-                para_lower = para.lower()
-                # Check if paragraph contains architecture-related information
-                if any(keyword in para_lower for keyword in arch_keywords):
-                    # Found architecture-related paragraph
-                    if para not in tech_parts[0]:  # Avoid duplication
-                        tech_parts.append(para[:500])  # Add up to 500 chars of this paragraph
-                        if sum(len(p) for p in tech_parts) > 2500:  # Soft limit
-                            break
+            # Offset of each paragraph in method_text (separators are 2 chars)
+            starts = [0, *itertools.accumulate(len(para) + 2 for para in paragraphs[:-1])]
+
+            # Scan the whole section in one regex pass; Python only sees the
+            # paragraphs that contain an architecture keyword
+            pos = 0
+            while total_length <= 2500:  # Soft limit
+                match = self.ARCH_KEYWORDS_RE.search(method_text, pos)
+                if match is None:
+                    break
+                index = bisect.bisect_right(starts, match.start()) - 1
+                para = paragraphs[index]
+                if para not in tech_parts[0]:  # Avoid duplication
+                    tech_parts.append(self._truncate(para, 500))  # Add up to 500 chars of this paragraph
+                    total_length += len(tech_parts[-1])
+                # Continue after this paragraph
+                pos = starts[index + 1] if index + 1 < len(starts) else len(method_text)
         elif "abstract" in sections:
             tech_parts.append(sections.get("abstract", paper.abstract))
 
         # Combine and limit total length
-        contents["technology"] = "\n\n".join(tech_parts)[:self.extractor_config.max_length_per_dimension]
+        contents["technology"] = self._truncate("\n\n".join(tech_parts), self.extractor_config.max_length_per_dimension)
 
         # Experiment: experiment section
         if "experiment" in sections:
-            contents["experiment"] = sections["experiment"][:self.extractor_config.max_length_per_dimension]
+            contents["experiment"] = self._truncate(sections["experiment"], self.extractor_config.max_length_per_dimension)
         else:
-            contents["experiment"] = paper.full_text[:self.extractor_config.max_length_per_dimension]
+            contents["experiment"] = self._truncate(paper.full_text, self.extractor_config.max_length_per_dimension)
 
         # Result: result + conclusion sections
         result_parts = []
@@ -288,7 +741,7 @@ Include: main problem, proposed method, and key results."""
         if "conclusion" in sections:
             result_parts.append(sections["conclusion"])
         if result_parts:
-            contents["result"] = "\n\n".join(result_parts)[:self.extractor_config.max_length_per_dimension]
+            contents["result"] = self._truncate("\n\n".join(result_parts), self.extractor_config.max_length_per_dimension)
         else:
             contents["result"] = paper.abstract
 
@@ -299,14 +752,106 @@ Include: main problem, proposed method, and key results."""
         if dimension not in self.EXTRACTION_PROMPTS:
             return {}
 
-        prompt = self.EXTRACTION_PROMPTS[dimension].format(content=content)
+        prefix, suffix = self.EXTRACTION_PARTS[dimension]
+        prompt = prefix + content + suffix
+
+        try:
+            if self.config.llm.structured_output:
+                structured_prefix = self.STRUCTURED_PREFIXES[dimension]
+                return self.llm_helper.extract_structured(
+                    structured_prefix + content + suffix, self.DIMENSION_SCHEMAS[dimension], dimension,
+                    fallback_prompt=prompt, cache_prefix=structured_prefix,
+                )
+            return self.llm_helper.extract_json(prompt, cache_prefix=self.EXTRACTION_PREFIXES[dimension])
+        except Exception as e:
+            logger.warning(f"Failed to extract {dimension}: {e}")
+            return {}
+
+    async def _aextract_dimension(self, dimension: str, content: str) -> Dict[str, Any]:
+        """Extract single dimension (async)"""
+        if dimension not in self.EXTRACTION_PROMPTS:
+            return {}
+
+        prefix, suffix = self.EXTRACTION_PARTS[dimension]
+        prompt = prefix + content + suffix
+
+        try:
+            if self.config.llm.structured_output:
+                structured_prefix = self.STRUCTURED_PREFIXES[dimension]
+                return await self.llm_helper.aextract_structured(
+                    structured_prefix + content + suffix, self.DIMENSION_SCHEMAS[dimension], dimension,
+                    fallback_prompt=prompt, cache_prefix=structured_prefix,
+                )
+            return await self.llm_helper.aextract_json(prompt, cache_prefix=self.EXTRACTION_PREFIXES[dimension])
+        except Exception as e:
+            logger.warning(f"Failed to extract {dimension}: {e}")
+            return {}
+
+    def _fused_prompt(self, dimension_contents: Dict[str, str]) -> str:
+        """Build one prompt that asks for every dimension at once"""
+        instructions = []
+        for dim in dimension_contents:
+            # Reuse the per-dimension instructions (everything before "Paper content:")
+            head = self.EXTRACTION_PREFIXES[dim].rsplit("Paper content:", 1)[0].strip()
+            instructions.append(f"### {dim}\n{head}")
+
+        # Identical contents are sent once, headed by every dimension that uses them
+        contents = []
+        for group in self._group_by_content(dimension_contents):
+            content = next(iter(group.values()))
+            contents.append(f"### {', '.join(group)}\n{content}")
+
+        return self.FUSED_EXTRACTION_PROMPT.format(
+            dimensions=", ".join(f'"{dim}"' for dim in dimension_contents),
+            instructions="\n\n".join(instructions),
+            contents="\n\n".join(contents),
+        )
+
+    @staticmethod
+    def _split_fused_result(result: Dict[str, Any], dimensions) -> Dict[str, Dict[str, Any]]:
+        return {
+            dim: result[dim] if isinstance(result.get(dim), dict) else {}
+            for dim in dimensions
+        }
+
+    def _extract_dimensions_fused(self, dimension_contents: Dict[str, str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Extract all dimensions with a single LLM call
+
+        The response is streamed, and each dimension is yielded as soon as its
+        JSON member is complete, so callers can process it while the rest of
+        the response is still being generated.
+        """
+        dimension_contents = {dim: c for dim, c in dimension_contents.items() if dim in self.EXTRACTION_PROMPTS}
+        if not dimension_contents:
+            return
 
+        pending = set(dimension_contents)
         try:
-            return self.llm_helper.extract_json(prompt)
+            for dim, result in self.llm_helper.stream_extract_json(self._fused_prompt(dimension_contents)):
+                if dim in pending:
+                    pending.discard(dim)
+                    yield dim, result if isinstance(result, dict) else {}
         except Exception as e:
-            print(f"Failed to extract {dimension}: {e}")
+            logger.warning(f"Failed to extract dimensions: {e}")
+
+        for dim in dimension_contents:
+            if dim in pending:
+                yield dim, {}
+
+    async def _aextract_dimensions_fused(self, dimension_contents: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Extract all dimensions with a single LLM call (async)"""
+        dimension_contents = {dim: c for dim, c in dimension_contents.items() if dim in self.EXTRACTION_PROMPTS}
+        if not dimension_contents:
             return {}
 
+        try:
+            result = await self.llm_helper.aextract_json(self._fused_prompt(dimension_contents))
+        except Exception as e:
+            logger.warning(f"Failed to extract dimensions: {e}")
+            result = {}
+        return self._split_fused_result(result, dimension_contents)
+
     def _set_dimension_result(self, analysis: PaperAnalysis, dimension: str, result: Dict[str, Any]) -> None:
         """Set dimension extraction result to analysis object"""
         if dimension == "background":
@@ -342,44 +887,95 @@ Include: main problem, proposed method, and key results."""
                 future_work=result.get("future_work", ""),
             )
 
-    def _extract_keywords(self, paper: PaperContent) -> List[str]:
-        """Extract keywords"""
-        prompt = self.KEYWORDS_PROMPT.format(
+    def missing_dimensions(self, analysis: PaperAnalysis) -> List[str]:
+        """
+        Configured dimensions left empty, e.g. because their request failed
+
+        Failures are logged and leave the dimension blank rather than failing
+        the paper, so callers check this before caching an analysis.
+        """
+        return [
+            dim for dim in self.extractor_config.dimensions
+            if dim in self.EXTRACTION_PROMPTS
+            and not any(getattr(getattr(analysis, dim), f.name) for f in fields(getattr(analysis, dim)))
+        ]
+
+    def _keywords_prompt(self, paper: PaperContent) -> str:
+        return self.KEYWORDS_PROMPT.format(
             num_keywords=self.extractor_config.num_keywords,
             title=paper.title,
             abstract=paper.abstract,
-            content=paper.full_text[:3000],
+            content=self._truncate(paper.full_text, 3000),
+        )
+
+    def _keywords_verify_prompt(self, paper: PaperContent) -> Optional[str]:
+        """Short prompt asking the LLM to pick from locally drafted candidates, or None"""
+        if not self.extractor_config.draft_keywords:
+            return None
+        candidates = draft_keywords(paper.full_text[:10000], top=30)
+        if not candidates:
+            return None
+        return self.KEYWORDS_VERIFY_PROMPT.format(
+            num_keywords=self.extractor_config.num_keywords,
+            candidates="\n".join(f"- {candidate}" for candidate in candidates),
+            title=paper.title,
         )
 
+    def _extract_keywords(self, paper: PaperContent) -> List[str]:
+        """Extract keywords"""
+        verify_prompt = self._keywords_verify_prompt(paper)
+        if verify_prompt is not None:
+            try:
+                keywords = self.llm_helper.extract_json(verify_prompt).get("keywords", [])
+                if keywords:
+                    return keywords
+            except Exception as e:
+                logger.warning(f"Failed to verify drafted keywords: {e}")
+
         try:
-            result = self.llm_helper.extract_json(prompt)
+            result = self.llm_helper.extract_json(self._keywords_prompt(paper), cache_prefix=self.KEYWORDS_PREFIX)
             return result.get("keywords", [])
         except Exception as e:
-            print(f"Failed to extract keywords: {e}")
+            logger.warning(f"Failed to extract keywords: {e}")
+            return []
+
+    async def _aextract_keywords(self, paper: PaperContent) -> List[str]:
+        """Extract keywords (async)"""
+        verify_prompt = self._keywords_verify_prompt(paper)
+        if verify_prompt is not None:
+            try:
+                keywords = (await self.llm_helper.aextract_json(verify_prompt)).get("keywords", [])
+                if keywords:
+                    return keywords
+            except Exception as e:
+                logger.warning(f"Failed to verify drafted keywords: {e}")
+
+        try:
+            result = await self.llm_helper.aextract_json(self._keywords_prompt(paper), cache_prefix=self.KEYWORDS_PREFIX)
+            return result.get("keywords", [])
+        except Exception as e:
+            logger.warning(f"Failed to extract keywords: {e}")
             return []
 
     def _generate_summary(self, paper: PaperContent, analysis: PaperAnalysis) -> str:
         """Generate paper summary"""
+        return self.llm_helper.ask(self._summary_prompt(paper, analysis))
+
+    def _summary_prompt(self, paper: PaperContent, analysis: PaperAnalysis) -> str:
+        """Build the summary prompt from the dimension results"""
         # Determine language - force chinese or english only
         language = self.config.report_generator.language.lower()
-        if language not in ["chinese", "english"]:
-            language = "english"  # Default to english if invalid
-
-        # Map to natural language name
-        language_name = "Chinese" if language == "chinese" else "English"
+        language_name = _LANGUAGE_NAMES.get(language)
+        if language_name is None:
+            language, language_name = "english", "English"  # Default to english if invalid
 
         # Determine detail level
-        detail_level_map = {
-            "brief": "brief (200-300 words)" if language == "english" else "简短（200-300字）",
-            "detailed": "detailed (400-600 words)" if language == "english" else "详细（400-600字）",
-            "comprehensive": "comprehensive (800-1000 words)" if language == "english" else "全面（800-1000字）",
-        }
-        detail_level = detail_level_map.get(
-            self.config.report_generator.summary_level,
-            "detailed (400-600 words)" if language == "english" else "详细（400-600字）"
+        detail_level = _DETAIL_LEVELS.get(
+            (language, self.config.report_generator.summary_level),
+            _DETAIL_LEVELS[(language, "detailed")],
         )
 
-        prompt = self.SUMMARY_PROMPT.format(
+        return self.SUMMARY_PROMPT.format(
             language=language_name,
             title=paper.title,
             abstract=paper.abstract,
@@ -390,34 +986,59 @@ Include: main problem, proposed method, and key results."""
             detail_level=detail_level,
         )
 
-        return self.llm_helper.ask(prompt)
-
-    def _analyze_sections(self, sections: Dict[str, str]) -> Dict[str, SectionAnalysis]:
-        """Analyze each section"""
-        result = {}
+    # Only analyze main sections
+    MAIN_SECTIONS = ["abstract", "introduction", "method", "experiment", "result", "conclusion"]
 
-        # Only analyze main sections
-        main_sections = ["abstract", "introduction", "method", "experiment", "result", "conclusion"]
-
-        for section_type in main_sections:
+    def _section_jobs(self, sections: Dict[str, str]) -> List[Tuple[str, str, str]]:
+        """(section_type, content, prompt) for each main section present"""
+        jobs = []
+        for section_type in self.MAIN_SECTIONS:
             if section_type in sections and sections[section_type]:
-                content = sections[section_type][:2000]
+                content = self._truncate(sections[section_type], 2000)
                 prompt = self.SECTION_ANALYSIS_PROMPT.format(
                     section_type=section_type,
                     content=content,
                 )
+                jobs.append((section_type, content, prompt))
+        return jobs
+
+    @staticmethod
+    def _make_section_analysis(section_type: str, content: str, analysis_result: Dict[str, Any]) -> SectionAnalysis:
+        return SectionAnalysis(
+            section_type=section_type,
+            original_content=content,
+            key_points=analysis_result.get("key_points", []),
+            summary=analysis_result.get("summary", ""),
+            keywords=analysis_result.get("keywords", []),
+        )
 
-                try:
-                    analysis_result = self.llm_helper.extract_json(prompt)
-                    result[section_type] = SectionAnalysis(
-                        section_type=section_type,
-                        original_content=content,
-                        key_points=analysis_result.get("key_points", []),
-                        summary=analysis_result.get("summary", ""),
-                        keywords=analysis_result.get("keywords", []),
-                    )
-                except Exception as e:
-                    print(f"Failed to analyze section {section_type}: {e}")
+    def _analyze_sections(self, sections: Dict[str, str]) -> Dict[str, SectionAnalysis]:
+        """Analyze each section"""
+        result = {}
+
+        for section_type, content, prompt in self._section_jobs(sections):
+            try:
+                analysis_result = self.llm_helper.extract_json(prompt, cache_prefix=self.SECTION_ANALYSIS_PREFIX)
+                result[section_type] = self._make_section_analysis(section_type, content, analysis_result)
+            except Exception as e:
+                logger.warning(f"Failed to analyze section {section_type}: {e}")
+
+        return result
+
+    async def _aanalyze_sections(self, sections: Dict[str, str]) -> Dict[str, SectionAnalysis]:
+        """Analyze each section (async, sections in parallel)"""
+        jobs = self._section_jobs(sections)
+        responses = await asyncio.gather(
+            *(self.llm_helper.aextract_json(prompt, cache_prefix=self.SECTION_ANALYSIS_PREFIX) for _, _, prompt in jobs),
+            return_exceptions=True,
+        )
+
+        result = {}
+        for (section_type, content, _), analysis_result in zip(jobs, responses):
+            if isinstance(analysis_result, Exception):
+                logger.warning(f"Failed to analyze section {section_type}: {analysis_result}")
+                continue
+            result[section_type] = self._make_section_analysis(section_type, content, analysis_result)
 
         return result
 
@@ -427,33 +1048,125 @@ Include: main problem, proposed method, and key results."""
 
         Uses LLM to determine which visual elements are most important
         """
+        if self._select_all_resources(paper, analysis):
+            return
+
+        prompt = self._key_resources_prompt(paper, analysis)
+        if prompt is None:
+            return  # No resources to identify
+
+        try:
+            result = self.llm_helper.extract_json(prompt)
+        except Exception as e:
+            logger.warning(f"Failed to identify key resources: {e}")
+            result = None
+        self._apply_key_resources(paper, analysis, result)
+
+    async def _aidentify_key_resources(self, paper: PaperContent, analysis: PaperAnalysis) -> None:
+        """Identify key figures, tables, and equations (async)"""
+        if self._select_all_resources(paper, analysis):
+            return
+
+        prompt = self._key_resources_prompt(paper, analysis)
+        if prompt is None:
+            return
+
+        try:
+            result = await self.llm_helper.aextract_json(prompt)
+        except Exception as e:
+            logger.warning(f"Failed to identify key resources: {e}")
+            result = None
+        self._apply_key_resources(paper, analysis, result)
+
+    @classmethod
+    def _select_all_resources(cls, paper: PaperContent, analysis: PaperAnalysis) -> bool:
+        """
+        Select every resource without asking the LLM when the paper has no more
+        than the selection limits (3 figures, 3 tables, 5 equations) anyway
+
+        Returns:
+            True if the selection was made
+        """
+        if (len(paper.figures) > cls.MAX_KEY_FIGURES or len(paper.tables) > cls.MAX_KEY_TABLES
+                or len(paper.equations) > cls.MAX_KEY_EQUATIONS):
+            return False
+
+        analysis.key_figures = list(range(1, len(paper.figures) + 1))
+        analysis.key_tables = list(range(1, len(paper.tables) + 1))
+        analysis.key_equations = list(range(1, len(paper.equations) + 1))
+        return True
+
+    @staticmethod
+    def _apply_key_resources(paper: PaperContent, analysis: PaperAnalysis, result: Optional[Dict[str, Any]]) -> None:
+        """Store the identified key resources, falling back to the first few of each"""
+        if not isinstance(result, dict):
+            # Fallback: select first few of each if available
+            analysis.key_figures = list(range(1, min(4, len(paper.figures) + 1)))
+            analysis.key_tables = list(range(1, min(4, len(paper.tables) + 1)))
+            analysis.key_equations = list(range(1, min(6, len(paper.equations) + 1)))
+            return
+
+        analysis.key_figures = result.get("key_figures", [])
+        analysis.key_tables = result.get("key_tables", [])
+        analysis.key_equations = result.get("key_equations", [])
+
+        if result.get("reasoning"):
+            logger.info(f"Resource selection reasoning: {result['reasoning']}")
+
+    @classmethod
+    def _shortlist(cls, items: list, score, total: int) -> List[Tuple[int, Any]]:
+        """
+        (1-based index, item) pairs to list in the key resource prompt
+
+        Papers with hundreds of resources only list the top MAX_LISTED_PER_KIND
+        items of each kind by score, keeping their original numbering and order.
+        """
+        indexed = list(enumerate(items, 1))
+        if total <= cls.MAX_LISTED_RESOURCES or len(indexed) <= cls.MAX_LISTED_PER_KIND:
+            return indexed
+        top = sorted(indexed, key=lambda pair: score(pair[1]), reverse=True)[:cls.MAX_LISTED_PER_KIND]
+        return sorted(top, key=lambda pair: pair[0])
+
+    @staticmethod
+    def _shown(listed: list, items: list) -> str:
+        return f", {len(listed)} shown" if len(listed) < len(items) else ""
+
+    def _key_resources_prompt(self, paper: PaperContent, analysis: PaperAnalysis) -> Optional[str]:
+        """Build the key resource selection prompt, or None if the paper has no resources"""
+        total = len(paper.figures) + len(paper.tables) + len(paper.equations)
+        if total == 0:
+            return None
+
         # Prepare resource information
-        resources_info = []
+        buf = io.StringIO()
+        write = buf.write
 
         if paper.figures:
-            resources_info.append(f"\n**Available Figures ({len(paper.figures)} total):**")
-            for idx, fig in enumerate(paper.figures, 1):
-                resources_info.append(f"  Figure {idx}: {fig.caption} (Page {fig.page})")
+            figures = self._shortlist(paper.figures, lambda fig: len(fig.caption), total)
+            write(f"\n**Available Figures ({len(paper.figures)} total{self._shown(figures, paper.figures)}):**\n")
+            for idx, fig in figures:
+                write(f"  Figure {idx}: {fig.caption} (Page {fig.page})\n")
 
         if paper.tables:
-            resources_info.append(f"\n**Available Tables ({len(paper.tables)} total):**")
-            for idx, table in enumerate(paper.tables, 1):
+            tables = self._shortlist(paper.tables, lambda table: len(table.caption), total)
+            write(f"\n**Available Tables ({len(paper.tables)} total{self._shown(tables, paper.tables)}):**\n")
+            for idx, table in tables:
                 caption = table.caption if table.caption else f"Table on page {table.page}"
-                resources_info.append(f"  Table {idx}: {caption}")
+                write(f"  Table {idx}: {caption}\n")
 
         if paper.equations:
-            resources_info.append(f"\n**Available Equations ({len(paper.equations)} total):**")
-            for idx, eq in enumerate(paper.equations, 1):
+            # Numbered equations are the ones the text refers to
+            equations = self._shortlist(
+                paper.equations, lambda eq: (eq.equation_number is not None, len(eq.equation_text)), total
+            )
+            write(f"\n**Available Equations ({len(paper.equations)} total{self._shown(equations, paper.equations)}):**\n")
+            for idx, eq in equations:
                 eq_desc = eq.equation_number if eq.equation_number else f"Equation {idx}"
-                resources_info.append(f"  {eq_desc}: {eq.equation_text[:80]}...")
-
-        if not resources_info:
-            return  # No resources to identify
+                write(f"  {eq_desc}: {eq.equation_text:.80}...\n")
 
-        resources_text = "\n".join(resources_info)
+        resources_text = buf.getvalue().rstrip("\n")
 
-        # Construct prompt
-        prompt = f"""Based on the paper analysis, identify the most important figures, tables, and equations that should be included in the summary report.
+        return f"""Based on the paper analysis, identify the most important figures, tables, and equations that should be included in the summary report.
 
 Paper: {paper.title}
 
@@ -469,9 +1182,9 @@ Main Results:
 {resources_text}
 
 Please identify which resources are KEY/CRITICAL for understanding this paper. Select up to:
-- 3 most important figures
-- 3 most important tables
-- 5 most important equations
+- {self.MAX_KEY_FIGURES} most important figures
+- {self.MAX_KEY_TABLES} most important tables
+- {self.MAX_KEY_EQUATIONS} most important equations
 
 Return results in JSON format:
 {{
@@ -483,24 +1196,6 @@ Return results in JSON format:
 
 If a category has no key resources, return an empty list []."""
 
-        try:
-            result = self.llm_helper.extract_json(prompt)
-
-            # Store the identified key resources
-            analysis.key_figures = result.get("key_figures", [])
-            analysis.key_tables = result.get("key_tables", [])
-            analysis.key_equations = result.get("key_equations", [])
-
-            if result.get("reasoning"):
-                print(f"Resource selection reasoning: {result['reasoning']}")
-
-        except Exception as e:
-            print(f"Failed to identify key resources: {e}")
-            # Fallback: select first few of each if available
-            analysis.key_figures = list(range(1, min(4, len(paper.figures) + 1)))
-            analysis.key_tables = list(range(1, min(4, len(paper.tables) + 1)))
-            analysis.key_equations = list(range(1, min(6, len(paper.equations) + 1)))
-
 
 def extract_paper_content(paper: PaperContent, config: Optional[Config] = None) -> PaperAnalysis:
     """Convenience function: Extract paper content"""
@@ -510,24 +1205,23 @@ def extract_paper_content(paper: PaperContent, config: Optional[Config] = None)
 
 def extract_papers_content(papers: List[PaperContent], config: Optional[Config] = None) -> List[PaperAnalysis]:
     """Convenience function: Batch extract paper content"""
+    return _run_sync(aextract_papers_content(papers, config))
+
+
+async def aextract_papers_content(papers: List[PaperContent], config: Optional[Config] = None) -> List[PaperAnalysis]:
+    """
+    Convenience function: Batch extract paper content on the running event loop
+
+    Papers are extracted concurrently (at most parallel.max_workers at a time,
+    or one at a time when parallel is disabled), all sharing the extractor's
+    async LLM client.
+
+    Returns:
+        Analyses of the papers that succeeded, in input order
+    """
     config = config or get_config()
     extractor = ContentExtractor(config)
 
-    results = []
-    if config.parallel.enabled:
-        with ThreadPoolExecutor(max_workers=config.parallel.max_workers) as executor:
-            futures = {executor.submit(extractor.extract, paper): paper for paper in papers}
-            for future in as_completed(futures):
-                try:
-                    results.append(future.result())
-                except Exception as e:
-                    paper = futures[future]
-                    print(f"Failed to extract {paper.title}: {e}")
-    else:
-        for paper in papers:
-            try:
-                results.append(extractor.extract(paper))
-            except Exception as e:
-                print(f"Failed to extract {paper.title}: {e}")
-
-    return results
+    max_concurrency = config.parallel.max_workers if config.parallel.enabled else 1
+    results = await extractor.extract_many_async(papers, max_concurrency)
+    return [analysis for analysis in results if analysis is not None]
@@ -0,0 +1,81 @@
+"""
+Keyword Drafting Module
+Cheap local keyword candidates (RAKE) for the LLM to verify
+"""
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+# Common English function words plus words frequent in papers but never keywords
+STOPWORDS = frozenset("""
+a about above after again against all also although am an and any are as at be because been before being
+below between both but by can could did do does doing done down during each either et etc few for from
+further had has have having here how however i if in into is it its itself just may might more most much
+must no nor not of off on once only or other our ours out over own per same shall should so some such
+than that the their them then there these they this those through thus to too under until up upon us very
+via was we were what when where whether which while who whom why will with within without would yet you
+al fig figure table section paper work approach propose proposed show shows shown use used using based
+new results result method methods model models different several various many first second third one two
+three can significantly respectively well better best large small high low uses use improves improve
+achieves achieve outperforms outperform introduce introduces present presents demonstrate demonstrates
+provide provides enable enables make makes
+""".split())
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-]*")
+_PHRASE_BREAK_RE = re.compile(r"[.,;:!?()\[\]{}\"'\n]+")
+
+
+def draft_keywords(text: str, top: int = 30, max_words: int = 3) -> List[str]:
+    """
+    Rank candidate keyphrases with RAKE (Rapid Automatic Keyword Extraction)
+
+    Phrases are maximal runs of non-stopwords (longer runs are cut into
+    max_words windows); each word scores degree / frequency and a phrase
+    scores the sum of its words.
+
+    Args:
+        text: Source text
+        top: Maximum number of candidates returned
+        max_words: Longest phrase kept
+
+    Returns:
+        Candidate phrases, best first
+    """
+    phrases: List[List[str]] = []
+    for fragment in _PHRASE_BREAK_RE.split(text.lower()):
+        current: List[str] = []
+        for word in _WORD_RE.findall(fragment):
+            if word in STOPWORDS or len(word) < 3:
+                if current:
+                    phrases.append(current)
+                    current = []
+            else:
+                current.append(word)
+        if current:
+            phrases.append(current)
+
+    # Long runs (few stopwords in technical prose) become sliding windows
+    phrases = [
+        window
+        for phrase in phrases
+        for window in (
+            [phrase] if len(phrase) <= max_words
+            else (phrase[i:i + max_words] for i in range(len(phrase) - max_words + 1))
+        )
+    ]
+
+    frequency: Dict[str, int] = defaultdict(int)
+    degree: Dict[str, int] = defaultdict(int)
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+
+    scores: Dict[str, float] = {}
+    for phrase in phrases:
+        key = " ".join(phrase)
+        if key not in scores:
+            scores[key] = sum(degree[word] / frequency[word] for word in phrase)
+
+    # Ties keep first-occurrence order
+    return sorted(scores, key=scores.get, reverse=True)[:top]
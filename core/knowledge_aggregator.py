@@ -3,24 +3,51 @@ Knowledge Aggregator Module
 Responsible for aggregating and comparing knowledge from multiple papers
 """
 import json
-from typing import Optional, List, Dict, Any
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, Iterable
 
 from .models import (
     PaperAnalysis, AggregatedKnowledge,
     ComparisonItem, TimelineItem, TrendItem
 )
 from .config import Config, get_config
-from .llm_client import LLMHelper
+from .llm_client import LLMHelper, _run_sync
+from .cache import AnalysisCache
+from .tokens import truncate_tokens
+from .schemas import object_schema, text_schema, text_list_schema, text_map_schema
+
+logger = logging.getLogger(__name__)
+
+
+def _join_within(parts: Iterable[str], max_chars: int) -> str:
+    """Concatenate parts, stopping once the text covers max_chars (it is truncated afterwards)"""
+    joined = []
+    length = 0
+    for part in parts:
+        joined.append(part)
+        length += len(part)
+        if length >= max_chars:
+            break
+    return "".join(joined)
 
 
 class KnowledgeAggregator:
     """Knowledge Aggregator"""
 
-    # Comparison prompt
-    COMPARISON_PROMPT = """Compare and analyze the following papers:
+    # Shared head of every multi-paper prompt: byte-identical across calls so
+    # providers can serve it from their prompt cache
+    PAPERS_PREFIX = """The following papers are being analyzed:
 
 {papers_info}
 
+---
+
+"""
+
+    # Comparison prompt
+    COMPARISON_PROMPT = """Compare and analyze the papers above.
+
 Please analyze from the "{dimension}" dimension and return results in JSON format:
 {{
     "comparison": {{
@@ -36,9 +63,7 @@ Please analyze from the "{dimension}" dimension and return results in JSON forma
 Be specific and detailed in your comparison."""
 
     # Architecture-specific comparison prompt
-    ARCHITECTURE_COMPARISON_PROMPT = """Compare and analyze the MODEL ARCHITECTURES of the following papers:
-
-{papers_info}
+    ARCHITECTURE_COMPARISON_PROMPT = """Compare and analyze the MODEL ARCHITECTURES of the papers above.
 
 CRITICAL: Pay special attention to the architecture type. Check if each model is:
 - **MoE (Mixture-of-Experts)**: Keywords like "mixture-of-experts", "MoE", "sparse activation", "expert routing", "X total parameters, Y activated parameters"
@@ -74,10 +99,33 @@ Example response format:
 
 Be precise and accurate. Double-check architecture types."""
 
-    # Timeline construction prompt
-    TIMELINE_PROMPT = """Construct a technology development timeline based on the following papers:
+    # All comparison dimensions in one request (knowledge_aggregator.batch_comparison)
+    BATCH_COMPARISON_PROMPT = """Compare and analyze the papers above along each of these dimensions: {dimensions}
 
-{papers_info}
+For an "architecture" dimension, state each model's architecture type (MoE / Dense / Hybrid / Other) and scale; a model "based on" or "built on" another model inherits that model's architecture type.
+
+Please return results in JSON format, with one key per dimension (use the dimension names exactly as given):
+{{
+    "dimension_name": {{
+        "comparison": {{
+            "paper1_title": "value/description",
+            "paper2_title": "value/description",
+            ...
+        }},
+        "similarities": ["Similarity 1", "Similarity 2", ...],
+        "differences": ["Difference 1", "Difference 2", ...],
+        "analysis": "Overall analysis"
+    }},
+    ...
+}}
+
+Be specific and detailed in your comparison."""
+
+    # Above this many dimensions one combined answer gets too long; compare per dimension
+    MAX_BATCHED_DIMENSIONS = 6
+
+    # Timeline construction prompt
+    TIMELINE_PROMPT = """Construct a technology development timeline based on the papers above.
 
 Consider:
 1. Publication time (if available)
@@ -100,9 +148,7 @@ Please return results in JSON format:
 Order should reflect logical development of the technology, not necessarily chronological."""
 
     # Trend analysis prompt
-    TREND_PROMPT = """Analyze the technology trends shown across the following papers:
-
-{papers_info}
+    TREND_PROMPT = """Analyze the technology trends shown across the papers above.
 
 Please identify 3-5 main trends and return results in JSON format:
 {{
@@ -120,6 +166,14 @@ Please identify 3-5 main trends and return results in JSON format:
     "future_directions": ["Direction 1", "Direction 2", ...]
 }}"""
 
+    # Instruction prompts rendered once: the field-less ones are constant text
+    # and the comparison prompt is split around {dimension}, so per-call
+    # rendering is plain concatenation instead of a str.format parse
+    ARCHITECTURE_COMPARISON_TEXT = ARCHITECTURE_COMPARISON_PROMPT.format()
+    COMPARISON_PARTS = tuple(COMPARISON_PROMPT.format(dimension="\x00").split("\x00"))
+    TIMELINE_TEXT = TIMELINE_PROMPT.format()
+    TREND_TEXT = TREND_PROMPT.format()
+
     # Overall summary prompt
     OVERALL_SUMMARY_PROMPT = """Based on the analysis results of the following papers, generate an overall summary:
 
@@ -147,14 +201,66 @@ When discussing multiple papers, use clear identifiers (paper title or specific
 
 Output the summary directly, no JSON format needed."""
 
+    # Result schemas, sent out-of-band with llm.structured_output
+    COMPARISON_SCHEMA = object_schema({
+        "comparison": text_map_schema("Paper title -> value/description for this dimension"),
+        "similarities": text_list_schema("Similarities"),
+        "differences": text_list_schema("Differences"),
+        "analysis": text_schema("Overall analysis"),
+    })
+    TIMELINE_SCHEMA = object_schema({
+        "timeline": {
+            "type": "array",
+            "items": object_schema({
+                "paper_title": text_schema("Paper title"),
+                "date": text_schema("Date (can be inferred, format: YYYY or YYYY-MM)"),
+                "key_contribution": text_schema("Main contribution of this paper"),
+                "order": {"type": "integer", "description": "Position in the technology's development"},
+            }),
+        },
+    })
+    TREND_SCHEMA = object_schema({
+        "trends": {
+            "type": "array",
+            "items": object_schema({
+                "trend_name": text_schema("Trend name"),
+                "description": text_schema("Detailed description"),
+                "evidence": text_list_schema("Evidence (which paper demonstrates this)"),
+                "papers": text_list_schema("Related papers"),
+            }),
+        },
+        "common_themes": text_list_schema("Common themes"),
+        "key_differences": text_list_schema("Key differences"),
+        "future_directions": text_list_schema("Future directions"),
+    })
+
+    # Labels of the template-rendered overall summary (knowledge_aggregator.summary_mode)
+    SUMMARY_TEMPLATE_LABELS = {
+        "english": {
+            "overview": "This analysis covers {count} papers: {titles}.",
+            "comparison": "Comparison",
+            "common_themes": "Common themes",
+            "key_differences": "Key differences",
+            "trends": "Trends",
+        },
+        "chinese": {
+            "overview": "本次分析涵盖 {count} 篇论文：{titles}。",
+            "comparison": "对比",
+            "common_themes": "共同主题",
+            "key_differences": "主要差异",
+            "trends": "趋势",
+        },
+    }
+
+    # In "hybrid" summary mode, a template summary shorter than this has too
+    # little material and the LLM writes the summary instead
+    MIN_TEMPLATE_SUMMARY_CHARS = 800
+
     # Custom analysis prompt
-    CUSTOM_ANALYSIS_PROMPT = """Based on the following papers, please analyze according to the user's requirement:
+    CUSTOM_ANALYSIS_PROMPT = """Based on the papers above, please analyze according to the user's requirement:
 
 User Requirement: {custom_prompt}
 
-Papers Information:
-{papers_info}
-
 CRITICAL INSTRUCTIONS:
 1. **DO NOT merge or confuse different models** - even if they have similar names (e.g., Model-VL vs Model-LLM are DIFFERENT models)
 2. **Clearly distinguish model types** - LLM vs Multimodal vs Vision vs Audio, etc.
@@ -169,7 +275,9 @@ When discussing papers with similar names, explicitly state their differences (e
     def __init__(self, config: Optional[Config] = None):
         self.config = config or get_config()
         self.aggregator_config = self.config.knowledge_aggregator
-        self.llm_helper = LLMHelper(self.config)
+        # Re-aggregating the same papers (e.g. regenerating a report) replays LLM responses
+        self.llm_cache = AnalysisCache(self.config.cache, namespace="llm", memory_size=200)
+        self.llm_helper = LLMHelper(self.config, cache=self.llm_cache)
 
     def aggregate(self, papers: List[PaperAnalysis], custom_prompt: Optional[str] = None) -> AggregatedKnowledge:
         """Aggregate knowledge from multiple papers
@@ -200,7 +308,7 @@ When discussing papers with similar names, explicitly state their differences (e
 
     def _custom_analysis(self, papers: List[PaperAnalysis], papers_info: str, custom_prompt: str) -> AggregatedKnowledge:
         """Custom analysis mode based on user's requirement"""
-        print(f"Using custom analysis mode: {custom_prompt}")
+        logger.info(f"Using custom analysis mode: {custom_prompt}")
 
         # Determine language - force chinese or english only
         language = self.config.report_generator.language.lower()
@@ -211,13 +319,13 @@ When discussing papers with similar names, explicitly state their differences (e
         language_name = "Chinese" if language == "chinese" else "English"
 
         # Generate custom analysis
-        prompt = self.CUSTOM_ANALYSIS_PROMPT.format(
+        prefix = self._papers_prefix(papers_info)
+        prompt = prefix + self.CUSTOM_ANALYSIS_PROMPT.format(
             custom_prompt=custom_prompt,
-            papers_info=papers_info,
             language=language_name,
         )
 
-        custom_summary = self.llm_helper.ask(prompt)
+        custom_summary = self.llm_helper.ask(prompt, cache_prefix=prefix)
 
         return AggregatedKnowledge(
             papers=papers,
@@ -229,36 +337,46 @@ When discussing papers with similar names, explicitly state their differences (e
 
     def _default_analysis(self, papers: List[PaperAnalysis], papers_info: str) -> AggregatedKnowledge:
         """Default analysis mode with comparison matrix and trends"""
-
-        # Build comparison matrix
-        comparison_matrix = []
-        common_themes = []
-        key_differences = []
-
-        if self.aggregator_config.comparison_dimensions:
-            comparison_matrix, common_themes, key_differences = self._build_comparison_matrix(papers, papers_info)
-
-        # Build timeline
-        timeline = []
-        if self.aggregator_config.generate_timeline:
-            timeline = self._build_timeline(papers_info)
-
-        # Analyze trends
-        trends = []
-        if self.aggregator_config.analyze_trends:
-            trends_result = self._analyze_trends(papers_info)
-            trends = trends_result.get("trends", [])
-            if not common_themes:
-                common_themes = trends_result.get("common_themes", [])
-            if not key_differences:
-                key_differences = trends_result.get("key_differences", [])
-
-        # Generate overall summary
-        overall_summary = self._generate_overall_summary(
-            papers_info,
-            comparison_matrix,
-            trends
+        return _run_sync(self._adefault_analysis(papers, papers_info))
+
+    async def _adefault_analysis(self, papers: List[PaperAnalysis], papers_info: str) -> AggregatedKnowledge:
+        """Default analysis mode; comparison, timeline and trends run concurrently"""
+
+        async def skipped(default):
+            return default
+
+        # Independent of each other: only the overall summary needs their results
+        comparison, timeline, trends_result = await asyncio.gather(
+            self._abuild_comparison_matrix(papers, papers_info)
+            if self.aggregator_config.comparison_dimensions else skipped(([], [], [])),
+            self._abuild_timeline(papers_info)
+            if self.aggregator_config.generate_timeline else skipped([]),
+            self._aanalyze_trends(papers_info)
+            if self.aggregator_config.analyze_trends else skipped({}),
         )
+        comparison_matrix, common_themes, key_differences = comparison
+
+        trends = trends_result.get("trends", [])
+        if not common_themes:
+            common_themes = trends_result.get("common_themes", [])
+        if not key_differences:
+            key_differences = trends_result.get("key_differences", [])
+
+        # Generate overall summary: rendered from the results, or written by the LLM
+        summary_mode = self.aggregator_config.summary_mode
+        overall_summary = ""
+        if summary_mode in ("template", "hybrid"):
+            overall_summary = self._template_summary(
+                papers, comparison_matrix, trends, common_themes, key_differences
+            )
+        if summary_mode not in ("template", "hybrid") or (
+            summary_mode == "hybrid" and len(overall_summary) < self.MIN_TEMPLATE_SUMMARY_CHARS
+        ):
+            overall_summary = await self._agenerate_overall_summary(
+                papers_info,
+                comparison_matrix,
+                trends
+            )
 
         return AggregatedKnowledge(
             papers=papers,
@@ -270,82 +388,165 @@ When discussing papers with similar names, explicitly state their differences (e
             overall_summary=overall_summary,
         )
 
+    def _template_summary(
+        self,
+        papers: List[PaperAnalysis],
+        comparison_matrix: List[ComparisonItem],
+        trends: List[TrendItem],
+        common_themes: List[str],
+        key_differences: List[str],
+    ) -> str:
+        """Overall summary rendered from the aggregation results, without an LLM call"""
+        language = self.config.report_generator.language.lower()
+        labels = self.SUMMARY_TEMPLATE_LABELS.get(language, self.SUMMARY_TEMPLATE_LABELS["english"])
+
+        lines = [labels["overview"].format(count=len(papers), titles="; ".join(p.title for p in papers))]
+
+        if comparison_matrix:
+            lines.append(f"\n**{labels['comparison']}**\n")
+            for item in comparison_matrix:
+                values = "; ".join(f"{paper}: {value}" for paper, value in item.papers.items())
+                lines.append(f"- **{item.dimension}**: {values}")
+
+        for label, items in ((labels["common_themes"], common_themes), (labels["key_differences"], key_differences)):
+            if items:
+                lines.append(f"\n**{label}**\n")
+                lines.extend(f"- {entry}" for entry in items)
+
+        if trends:
+            lines.append(f"\n**{labels['trends']}**\n")
+            lines.extend(f"- **{trend.trend_name}**: {trend.description}" for trend in trends)
+
+        return "\n".join(lines)
+
     def _prepare_papers_info(self, papers: List[PaperAnalysis]) -> str:
         """Prepare paper information summary"""
-        info_parts = []
-
-        for i, paper in enumerate(papers, 1):
-            # Extract architecture info if available
-            arch_info = ""
-            if paper.technology:
-                if hasattr(paper.technology, 'architecture') and paper.technology.architecture:
-                    arch_info = f"\nArchitecture: {paper.technology.architecture}"
-                if hasattr(paper.technology, 'architecture_type') and paper.technology.architecture_type:
-                    arch_info += f"\nArchitecture Type: {paper.technology.architecture_type}"
-                if hasattr(paper.technology, 'model_scale') and paper.technology.model_scale:
-                    arch_info += f"\nModel Scale: {paper.technology.model_scale}"
-                if hasattr(paper.technology, 'model_type') and paper.technology.model_type:
-                    arch_info += f"\n**Model Type**: {paper.technology.model_type}"
-                if hasattr(paper.technology, 'application_scenarios') and paper.technology.application_scenarios:
-                    arch_info += f"\n**Application Scenarios**: {', '.join(paper.technology.application_scenarios)}"
-
-            info = f"""Paper {i}: {paper.title}
-Authors: {', '.join(paper.authors) if paper.authors else 'Unknown'}
+        return "\n---\n".join(self._paper_info(i, paper) for i, paper in enumerate(papers, 1))
+
+    @staticmethod
+    def _paper_info(index: int, paper: PaperAnalysis) -> str:
+        """Information block of one paper"""
+        technology = paper.technology
+
+        # Extract architecture info if available
+        arch_parts = []
+        if technology:
+            if technology.architecture:
+                arch_parts.append(f"\nArchitecture: {technology.architecture}")
+            if technology.architecture_type:
+                arch_parts.append(f"\nArchitecture Type: {technology.architecture_type}")
+            if technology.model_scale:
+                arch_parts.append(f"\nModel Scale: {technology.model_scale}")
+            if technology.model_type:
+                arch_parts.append(f"\n**Model Type**: {technology.model_type}")
+            if technology.application_scenarios:
+                arch_parts.append(f"\n**Application Scenarios**: {', '.join(technology.application_scenarios)}")
+        arch_info = "".join(arch_parts)
+
+        authors = paper.authors_text or "Unknown"
+        innovations = ", ".join(technology.innovations) if technology and technology.innovations else "N/A"
+        keywords = paper.keywords_text or "N/A"
+
+        return f"""Paper {index}: {paper.title}
+Authors: {authors}
 Abstract: {paper.paper.abstract[:500]}...
 
 Research Background: {paper.background.motivation if paper.background else 'N/A'}
-Core Method: {paper.technology.method_overview if paper.technology else 'N/A'}{arch_info}
-Innovations: {', '.join(paper.technology.innovations) if paper.technology and paper.technology.innovations else 'N/A'}
+Core Method: {technology.method_overview if technology else 'N/A'}{arch_info}
+Innovations: {innovations}
 Main Results: {paper.result.main_results if paper.result else 'N/A'}
-Keywords: {', '.join(paper.keywords) if paper.keywords else 'N/A'}
+Keywords: {keywords}
 """
-            info_parts.append(info)
-
-        return "\n---\n".join(info_parts)
 
     def _build_comparison_matrix(self, papers: List[PaperAnalysis], papers_info: str) -> tuple:
         """Build comparison matrix"""
+        return _run_sync(self._abuild_comparison_matrix(papers, papers_info))
+
+    async def _abuild_comparison_matrix(self, papers: List[PaperAnalysis], papers_info: str) -> tuple:
+        """Build comparison matrix, comparing all dimensions concurrently"""
+        dimensions = list(self.aggregator_config.comparison_dimensions)
+        prefix = self._papers_prefix(papers_info)
+
+        results: Dict[str, Any] = {}
+        if self.aggregator_config.batch_comparison and 1 < len(dimensions) <= self.MAX_BATCHED_DIMENSIONS:
+            results = await self._abatch_compare(dimensions, prefix)
+
+        # Dimensions the batched answer missed are compared one by one;
+        # every request is in flight before the first result is awaited
+        remaining = [dimension for dimension in dimensions if dimension not in results]
+        remaining_results = await asyncio.gather(
+            *(self.llm_helper.aextract_structured(
+                prefix + self._comparison_prompt(dimension), self.COMPARISON_SCHEMA, "comparison", cache_prefix=prefix
+            ) for dimension in remaining),
+            return_exceptions=True,
+        )
+        results.update(zip(remaining, remaining_results))
+
         comparison_matrix = []
         all_similarities = []
         all_differences = []
 
-        for dimension in self.aggregator_config.comparison_dimensions:
-            # Use architecture-specific prompt for architecture dimension
-            if dimension.lower() == "architecture":
-                prompt = self.ARCHITECTURE_COMPARISON_PROMPT.format(
-                    papers_info=papers_info,
-                )
-            else:
-                prompt = self.COMPARISON_PROMPT.format(
-                    papers_info=papers_info,
-                    dimension=dimension,
-                )
-
-            try:
-                result = self.llm_helper.extract_json(prompt)
-
-                # Build comparison item
-                comparison = result.get("comparison", {})
-                comparison_matrix.append(ComparisonItem(
-                    dimension=dimension,
-                    papers=comparison,
-                ))
+        for dimension in dimensions:
+            result = results[dimension]
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to compare dimension {dimension}: {result}")
+                continue
 
-                # Collect similarities and differences
-                all_similarities.extend(result.get("similarities", []))
-                all_differences.extend(result.get("differences", []))
+            # Build comparison item
+            comparison = result.get("comparison", {})
+            comparison_matrix.append(ComparisonItem(
+                dimension=dimension,
+                papers=comparison,
+            ))
 
-            except Exception as e:
-                print(f"Failed to compare dimension {dimension}: {e}")
+            # Collect similarities and differences
+            all_similarities.extend(result.get("similarities", []))
+            all_differences.extend(result.get("differences", []))
 
         return comparison_matrix, all_similarities, all_differences
 
+    async def _abatch_compare(self, dimensions: List[str], prefix: str) -> Dict[str, Any]:
+        """Compare several dimensions with one request
+
+        Returns:
+            Results of the dimensions completed in the answer
+        """
+        prompt = prefix + self.BATCH_COMPARISON_PROMPT.format(dimensions=json.dumps(dimensions, ensure_ascii=False))
+
+        # Streamed: dimensions completed before a failure or a truncated answer are kept
+        results: Dict[str, Any] = {}
+        try:
+            async for dimension, result in self.llm_helper.astream_extract_json(prompt, cache_prefix=prefix):
+                if dimension in dimensions and isinstance(result, dict):
+                    results[dimension] = result
+        except Exception as e:
+            logger.warning(f"Batched comparison incomplete, comparing remaining dimensions separately: {e}")
+
+        return results
+
+    def _comparison_prompt(self, dimension: str) -> str:
+        """Comparison instructions for one dimension (follows the papers prefix)"""
+        # Use architecture-specific prompt for architecture dimension
+        if dimension.lower() == "architecture":
+            return self.ARCHITECTURE_COMPARISON_TEXT
+        head, tail = self.COMPARISON_PARTS
+        return head + dimension + tail
+
+    def _papers_prefix(self, papers_info: str) -> str:
+        """Cacheable prompt head shared by the comparison, timeline, trend and custom prompts"""
+        return self.PAPERS_PREFIX.format(papers_info=papers_info)
+
     def _build_timeline(self, papers_info: str) -> List[TimelineItem]:
         """Build timeline"""
-        prompt = self.TIMELINE_PROMPT.format(papers_info=papers_info)
+        return _run_sync(self._abuild_timeline(papers_info))
+
+    async def _abuild_timeline(self, papers_info: str) -> List[TimelineItem]:
+        """Build timeline (async)"""
+        prefix = self._papers_prefix(papers_info)
+        prompt = prefix + self.TIMELINE_TEXT
 
         try:
-            result = self.llm_helper.extract_json(prompt)
+            result = await self.llm_helper.aextract_structured(prompt, self.TIMELINE_SCHEMA, "timeline", cache_prefix=prefix)
             timeline_data = result.get("timeline", [])
 
             timeline = []
@@ -362,15 +563,20 @@ Keywords: {', '.join(paper.keywords) if paper.keywords else 'N/A'}
             return timeline
 
         except Exception as e:
-            print(f"Failed to build timeline: {e}")
+            logger.warning(f"Failed to build timeline: {e}")
             return []
 
     def _analyze_trends(self, papers_info: str) -> Dict[str, Any]:
         """Analyze trends"""
-        prompt = self.TREND_PROMPT.format(papers_info=papers_info)
+        return _run_sync(self._aanalyze_trends(papers_info))
+
+    async def _aanalyze_trends(self, papers_info: str) -> Dict[str, Any]:
+        """Analyze trends (async)"""
+        prefix = self._papers_prefix(papers_info)
+        prompt = prefix + self.TREND_TEXT
 
         try:
-            result = self.llm_helper.extract_json(prompt)
+            result = await self.llm_helper.aextract_structured(prompt, self.TREND_SCHEMA, "trends", cache_prefix=prefix)
 
             # Convert trends to TrendItem objects
             trends_data = result.get("trends", [])
@@ -390,7 +596,7 @@ Keywords: {', '.join(paper.keywords) if paper.keywords else 'N/A'}
             }
 
         except Exception as e:
-            print(f"Failed to analyze trends: {e}")
+            logger.warning(f"Failed to analyze trends: {e}")
             return {"trends": [], "common_themes": [], "key_differences": []}
 
     def _generate_overall_summary(
@@ -400,17 +606,29 @@ Keywords: {', '.join(paper.keywords) if paper.keywords else 'N/A'}
         trends: List[TrendItem]
     ) -> str:
         """Generate overall summary"""
+        return self.llm_helper.ask(self._overall_summary_prompt(papers_info, comparison_matrix, trends))
+
+    async def _agenerate_overall_summary(
+        self,
+        papers_info: str,
+        comparison_matrix: List[ComparisonItem],
+        trends: List[TrendItem]
+    ) -> str:
+        """Generate overall summary (async)"""
+        return await self.llm_helper.aask(self._overall_summary_prompt(papers_info, comparison_matrix, trends))
+
+    def _overall_summary_prompt(
+        self,
+        papers_info: str,
+        comparison_matrix: List[ComparisonItem],
+        trends: List[TrendItem]
+    ) -> str:
+        """Overall summary prompt from the comparison and trend results"""
         # Prepare comparison summary
-        comparison_summary = ""
-        for item in comparison_matrix:
-            comparison_summary += f"\n{item.dimension}:\n"
-            for paper, value in item.papers.items():
-                comparison_summary += f"  - {paper}: {value}\n"
+        comparison_summary = _join_within((item.render() for item in comparison_matrix), 1500)
 
         # Prepare trends summary
-        trends_summary = ""
-        for trend in trends:
-            trends_summary += f"\n- {trend.trend_name}: {trend.description}\n"
+        trends_summary = _join_within((trend.render() for trend in trends), 1000)
 
         # Determine language - force chinese or english only
         language = self.config.report_generator.language.lower()
@@ -420,14 +638,18 @@ Keywords: {', '.join(paper.keywords) if paper.keywords else 'N/A'}
         # Map to natural language name
         language_name = "Chinese" if language == "chinese" else "English"
 
-        prompt = self.OVERALL_SUMMARY_PROMPT.format(
-            papers_info=papers_info[:3000],  # Limit length
-            comparison_summary=comparison_summary[:1500],
-            trends_summary=trends_summary[:1000],
+        return self.OVERALL_SUMMARY_PROMPT.format(
+            papers_info=self._truncate(papers_info, 3000),  # Limit length
+            comparison_summary=self._truncate(comparison_summary, 1500),
+            trends_summary=self._truncate(trends_summary, 1000),
             language=language_name,
         )
 
-        return self.llm_helper.ask(prompt)
+    def _truncate(self, text: str, max_chars: int) -> str:
+        """Cut text to a character budget (a token budget with knowledge_aggregator.truncate_by_tokens)"""
+        if self.aggregator_config.truncate_by_tokens:
+            return truncate_tokens(text, max_chars)
+        return text[:max_chars]
 
     def compare_two_papers(self, paper1: PaperAnalysis, paper2: PaperAnalysis) -> Dict[str, Any]:
         """Detailed comparison of two papers"""
@@ -457,7 +679,7 @@ Please return results in JSON format:
         try:
             return self.llm_helper.extract_json(prompt)
         except Exception as e:
-            print(f"Failed to compare papers: {e}")
+            logger.warning(f"Failed to compare papers: {e}")
             return {}
 
 
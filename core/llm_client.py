@@ -3,12 +3,136 @@ LLM Client Module
 Responsible for interacting with various LLM APIs
 """
 import os
+import re
 import json
 import time
-from typing import Optional, List, Dict, Any, Generator
+import logging
+import atexit
+import random
+import asyncio
+import weakref
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Generator, Tuple, TypeVar
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import json_repair
+except ImportError:
+    json_repair = None
+
 from .config import Config, get_config, LLMConfig
+from .cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# JSON wrapped in a Markdown code block
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
+# SDK clients shared process-wide, so every LLMHelper (extractor, aggregator, ...)
+# reuses one HTTP connection pool per endpoint; async clients are per event loop
+_shared_clients: Dict[Tuple[Any, ...], Any] = {}
+_shared_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], Any]]" = weakref.WeakKeyDictionary()
+_shared_clients_lock = threading.Lock()
+
+
+def _shared_client(key: Tuple[Any, ...], create: Callable[[], Any]) -> Any:
+    """Return the shared SDK client for key, creating it on first use"""
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = create()
+        return client
+
+
+def _shared_async_client(key: Tuple[Any, ...], create: Callable[[], Any]) -> Any:
+    """Return the shared async SDK client for key on the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _shared_clients_lock:
+        clients = _shared_async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = create()
+        return client
+
+
+def close_shared_clients() -> None:
+    """Close the shared SDK clients and their connection pools"""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_shared_clients)
+
+
+@functools.lru_cache(maxsize=None)
+def _retryable_errors() -> Tuple[type, ...]:
+    """Transient errors worth retrying (rate limits, timeouts, connection and server errors)"""
+    errors: List[type] = [TimeoutError, ConnectionError]
+    for module_name in ("openai", "anthropic"):
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        for name in ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError", "OverloadedError"):
+            if hasattr(module, name):
+                errors.append(getattr(module, name))
+    try:
+        import httpx  # Connection errors of clients that do not wrap them (ollama)
+        errors.append(httpx.TransportError)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+@functools.lru_cache(maxsize=None)
+def _ollama_module():
+    """The native ollama package, or None if it is not installed"""
+    try:
+        import ollama
+    except ImportError:
+        return None
+    return ollama
+
+
+def _backoff_delay(base_delay: float, attempt: int) -> float:
+    """Exponential backoff with jitter, so concurrent requests do not retry in lockstep
+
+    Args:
+        base_delay: Delay before the first retry (llm.retry_delay)
+        attempt: Number of attempts made so far (1 for the first retry)
+    """
+    delay = base_delay * (2 ** (attempt - 1))
+    return delay + random.uniform(0, 0.5 * delay)
+
+
+def _run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code
+
+    Inside a running event loop (e.g. a notebook) asyncio.run() is not
+    allowed, so the coroutine gets its own loop on a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 class LLMClient(ABC):
@@ -24,6 +148,26 @@ class LLMClient(ABC):
         """Streaming chat request"""
         pass
 
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Send chat request without blocking the event loop
+
+        Subclasses with a native async SDK override this; the default runs
+        the blocking chat() in a worker thread.
+        """
+        return await asyncio.to_thread(self.chat, messages, **kwargs)
+
+    async def achat_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Streaming chat request (async)
+
+        Subclasses with a native async SDK override this; the default yields
+        the whole achat() response as a single chunk.
+        """
+        yield await self.achat(messages, **kwargs)
+
+    def warm_up(self) -> None:
+        """Import the SDK and build its client ahead of the first request (best effort)"""
+        pass
+
 
 class OpenAICompatibleClient(LLMClient):
     """OpenAI-compatible client (supports OpenAI, DeepSeek, Zhipu, etc.)"""
@@ -44,12 +188,45 @@ class OpenAICompatibleClient(LLMClient):
             except ImportError:
                 raise ImportError("Please install openai: pip install openai")
 
-            self._client = OpenAI(
+            self._client = _shared_client(
+                ("openai", self.api_key, self.api_base, self.config.timeout),
+                lambda: OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.api_base,
+                    timeout=self.config.timeout,
+                ),
+            )
+        return self._client
+
+    @property
+    def async_client(self):
+        """AsyncOpenAI client for the running event loop"""
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise ImportError("Please install openai: pip install openai")
+
+        return _shared_async_client(
+            ("openai", self.api_key, self.api_base, self.config.timeout),
+            lambda: AsyncOpenAI(
                 api_key=self.api_key,
                 base_url=self.api_base,
                 timeout=self.config.timeout,
-            )
-        return self._client
+            ),
+        )
+
+    def warm_up(self) -> None:
+        try:
+            self.client
+        except Exception:
+            pass  # Reported by the first real request instead
+
+    @staticmethod
+    def _extra_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Optional request parameters (e.g. response_format for structured outputs)"""
+        if kwargs.get("response_format"):
+            return {"response_format": kwargs["response_format"]}
+        return {}
 
     def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Send chat request"""
@@ -63,14 +240,39 @@ class OpenAICompatibleClient(LLMClient):
                     messages=messages,
                     temperature=kwargs.get("temperature", self.config.temperature),
                     max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
+                    **self._extra_params(kwargs),
                 )
                 return response.choices[0].message.content or ""
 
-            except Exception as e:
+            except _retryable_errors() as e:
                 last_error = e
                 retries += 1
                 if retries < self.config.max_retries:
-                    time.sleep(self.config.retry_delay)
+                    time.sleep(_backoff_delay(self.config.retry_delay, retries))
+
+        raise RuntimeError(f"LLM request failed after {self.config.max_retries} retries: {last_error}")
+
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Send chat request asynchronously"""
+        retries = 0
+        last_error = None
+
+        while retries < self.config.max_retries:
+            try:
+                response = await self.async_client.chat.completions.create(
+                    model=kwargs.get("model", self.config.model),
+                    messages=messages,
+                    temperature=kwargs.get("temperature", self.config.temperature),
+                    max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
+                    **self._extra_params(kwargs),
+                )
+                return response.choices[0].message.content or ""
+
+            except _retryable_errors() as e:
+                last_error = e
+                retries += 1
+                if retries < self.config.max_retries:
+                    await asyncio.sleep(_backoff_delay(self.config.retry_delay, retries))
 
         raise RuntimeError(f"LLM request failed after {self.config.max_retries} retries: {last_error}")
 
@@ -92,6 +294,24 @@ class OpenAICompatibleClient(LLMClient):
         except Exception as e:
             raise RuntimeError(f"LLM streaming request failed: {e}")
 
+    async def achat_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Streaming chat request (async)"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=kwargs.get("model", self.config.model),
+                messages=messages,
+                temperature=kwargs.get("temperature", self.config.temperature),
+                max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
+                stream=True,
+            )
+
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise RuntimeError(f"LLM streaming request failed: {e}")
+
 
 class AnthropicClient(LLMClient):
     """Anthropic Claude Client"""
@@ -109,17 +329,38 @@ class AnthropicClient(LLMClient):
             except ImportError:
                 raise ImportError("Please install anthropic: pip install anthropic")
 
-            self._client = Anthropic(
-                api_key=self.api_key,
+            self._client = _shared_client(
+                ("anthropic", self.api_key),
+                lambda: Anthropic(
+                    api_key=self.api_key,
+                ),
             )
         return self._client
 
-    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Send chat request"""
-        retries = 0
-        last_error = None
+    @property
+    def async_client(self):
+        """AsyncAnthropic client for the running event loop"""
+        try:
+            from anthropic import AsyncAnthropic
+        except ImportError:
+            raise ImportError("Please install anthropic: pip install anthropic")
+
+        return _shared_async_client(
+            ("anthropic", self.api_key),
+            lambda: AsyncAnthropic(
+                api_key=self.api_key,
+            ),
+        )
 
-        # Convert message format (Anthropic uses different format)
+    def warm_up(self) -> None:
+        try:
+            self.client
+        except Exception:
+            pass  # Reported by the first real request instead
+
+    @staticmethod
+    def _split_system(messages: List[Dict[str, str]]):
+        """Convert message format (Anthropic takes the system prompt separately)"""
         system_message = ""
         chat_messages = []
 
@@ -129,6 +370,64 @@ class AnthropicClient(LLMClient):
             else:
                 chat_messages.append(msg)
 
+        return system_message, chat_messages
+
+    @staticmethod
+    def _tool_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map an OpenAI-style json_schema response_format onto a forced tool call,
+        Anthropic's way of returning schema-conforming JSON
+        """
+        response_format = kwargs.get("response_format") or {}
+        if response_format.get("type") != "json_schema":
+            return {}
+
+        json_schema = response_format["json_schema"]
+        tool = {
+            "name": json_schema["name"],
+            "description": json_schema.get("description", "Record the extracted information"),
+            "input_schema": json_schema["schema"],
+        }
+        return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+
+    @staticmethod
+    def _response_text(response) -> str:
+        """Text of a response; a forced tool call is returned as its JSON input"""
+        for block in response.content:
+            if getattr(block, "type", "") == "tool_use":
+                return json.dumps(block.input, ensure_ascii=False)
+        return response.content[0].text
+
+    @staticmethod
+    def _mark_cache_prefix(chat_messages: List[Dict[str, Any]], prefix: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Mark the static prefix of the last user message as cacheable
+
+        The prompt is split into two text blocks and the first one carries
+        cache_control, so later calls sharing the prefix reuse the
+        provider-side prompt cache.
+        """
+        if not prefix or not chat_messages:
+            return chat_messages
+
+        last = chat_messages[-1]
+        content = last.get("content")
+        if last.get("role") != "user" or not isinstance(content, str) or not content.startswith(prefix):
+            return chat_messages
+
+        blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if len(content) > len(prefix):
+            blocks.append({"type": "text", "text": content[len(prefix):]})
+        return chat_messages[:-1] + [{"role": "user", "content": blocks}]
+
+    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Send chat request"""
+        retries = 0
+        last_error = None
+
+        system_message, chat_messages = self._split_system(messages)
+        chat_messages = self._mark_cache_prefix(chat_messages, kwargs.get("cache_prefix"))
+
         while retries < self.config.max_retries:
             try:
                 response = self.client.messages.create(
@@ -136,27 +435,49 @@ class AnthropicClient(LLMClient):
                     max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
                     system=system_message if system_message else None,
                     messages=chat_messages,
+                    **self._tool_params(kwargs),
                 )
-                return response.content[0].text
+                return self._response_text(response)
 
-            except Exception as e:
+            except _retryable_errors() as e:
+                last_error = e
+                retries += 1
+                if retries < self.config.max_retries:
+                    time.sleep(_backoff_delay(self.config.retry_delay, retries))
+
+        raise RuntimeError(f"Anthropic request failed after {self.config.max_retries} retries: {last_error}")
+
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Send chat request asynchronously"""
+        retries = 0
+        last_error = None
+
+        system_message, chat_messages = self._split_system(messages)
+        chat_messages = self._mark_cache_prefix(chat_messages, kwargs.get("cache_prefix"))
+
+        while retries < self.config.max_retries:
+            try:
+                response = await self.async_client.messages.create(
+                    model=kwargs.get("model", self.config.model),
+                    max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
+                    system=system_message if system_message else None,
+                    messages=chat_messages,
+                    **self._tool_params(kwargs),
+                )
+                return self._response_text(response)
+
+            except _retryable_errors() as e:
                 last_error = e
                 retries += 1
                 if retries < self.config.max_retries:
-                    time.sleep(self.config.retry_delay)
+                    await asyncio.sleep(_backoff_delay(self.config.retry_delay, retries))
 
         raise RuntimeError(f"Anthropic request failed after {self.config.max_retries} retries: {last_error}")
 
     def chat_stream(self, messages: List[Dict[str, str]], **kwargs) -> Generator[str, None, None]:
         """Streaming chat request"""
-        system_message = ""
-        chat_messages = []
-
-        for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-            else:
-                chat_messages.append(msg)
+        system_message, chat_messages = self._split_system(messages)
+        chat_messages = self._mark_cache_prefix(chat_messages, kwargs.get("cache_prefix"))
 
         try:
             with self.client.messages.stream(
@@ -171,23 +492,154 @@ class AnthropicClient(LLMClient):
         except Exception as e:
             raise RuntimeError(f"Anthropic streaming request failed: {e}")
 
+    async def achat_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Streaming chat request (async)"""
+        system_message, chat_messages = self._split_system(messages)
+        chat_messages = self._mark_cache_prefix(chat_messages, kwargs.get("cache_prefix"))
+
+        try:
+            async with self.async_client.messages.stream(
+                model=kwargs.get("model", self.config.model),
+                max_tokens=kwargs.get("max_tokens", self.config.max_tokens),
+                system=system_message if system_message else None,
+                messages=chat_messages,
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+        except Exception as e:
+            raise RuntimeError(f"Anthropic streaming request failed: {e}")
+
 
 class OllamaClient(LLMClient):
-    """Ollama Local Model Client"""
+    """Ollama Local Model Client
+
+    Talks to the native Ollama API through the ollama package when it is
+    installed (server-side JSON/schema constraints, no OpenAI translation
+    layer); otherwise falls back to Ollama's OpenAI-compatible endpoint.
+    """
 
     def __init__(self, config: LLMConfig, api_base: str = ""):
         self.config = config
         self.api_base = api_base or config.api_base or "http://localhost:11434/v1"
+        # The native API lives at the server root, the compatible one under /v1
+        base = self.api_base.rstrip("/")
+        self.host = base[:-3] if base.endswith("/v1") else base
         # Ollama is compatible with OpenAI API, use OpenAI client
         self._openai_client = OpenAICompatibleClient(config, self.api_base)
         # Ollama doesn't need API key, set placeholder
         self._openai_client.api_key = "ollama"
 
+    @property
+    def client(self):
+        ollama = _ollama_module()
+        return _shared_client(
+            ("ollama", self.host, self.config.timeout),
+            lambda: ollama.Client(host=self.host, timeout=self.config.timeout),
+        )
+
+    @property
+    def async_client(self):
+        """ollama.AsyncClient for the running event loop"""
+        ollama = _ollama_module()
+        return _shared_async_client(
+            ("ollama", self.host, self.config.timeout),
+            lambda: ollama.AsyncClient(host=self.host, timeout=self.config.timeout),
+        )
+
+    def _request(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Native chat request parameters"""
+        request = {
+            "model": kwargs.get("model", self.config.model),
+            "messages": messages,
+            "options": {
+                "temperature": kwargs.get("temperature", self.config.temperature),
+                "num_predict": kwargs.get("max_tokens", self.config.max_tokens),
+            },
+        }
+        # Constrain decoding server-side: a JSON schema, or any JSON object
+        response_format = kwargs.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            request["format"] = response_format["json_schema"]["schema"]
+        elif response_format.get("type") == "json_object":
+            request["format"] = "json"
+        return request
+
     def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        return self._openai_client.chat(messages, **kwargs)
+        if _ollama_module() is None:
+            return self._openai_client.chat(messages, **kwargs)
+
+        retries = 0
+        last_error = None
+
+        while retries < self.config.max_retries:
+            try:
+                response = self.client.chat(**self._request(messages, kwargs))
+                return response["message"]["content"] or ""
+
+            except _retryable_errors() as e:
+                last_error = e
+                retries += 1
+                if retries < self.config.max_retries:
+                    time.sleep(_backoff_delay(self.config.retry_delay, retries))
+
+        raise RuntimeError(f"Ollama request failed after {self.config.max_retries} retries: {last_error}")
+
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        if _ollama_module() is None:
+            return await self._openai_client.achat(messages, **kwargs)
+
+        retries = 0
+        last_error = None
+
+        while retries < self.config.max_retries:
+            try:
+                response = await self.async_client.chat(**self._request(messages, kwargs))
+                return response["message"]["content"] or ""
+
+            except _retryable_errors() as e:
+                last_error = e
+                retries += 1
+                if retries < self.config.max_retries:
+                    await asyncio.sleep(_backoff_delay(self.config.retry_delay, retries))
+
+        raise RuntimeError(f"Ollama request failed after {self.config.max_retries} retries: {last_error}")
 
     def chat_stream(self, messages: List[Dict[str, str]], **kwargs) -> Generator[str, None, None]:
-        return self._openai_client.chat_stream(messages, **kwargs)
+        if _ollama_module() is None:
+            yield from self._openai_client.chat_stream(messages, **kwargs)
+            return
+
+        try:
+            for chunk in self.client.chat(stream=True, **self._request(messages, kwargs)):
+                if chunk["message"]["content"]:
+                    yield chunk["message"]["content"]
+
+        except Exception as e:
+            raise RuntimeError(f"Ollama streaming request failed: {e}")
+
+    async def achat_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        if _ollama_module() is None:
+            async for chunk in self._openai_client.achat_stream(messages, **kwargs):
+                yield chunk
+            return
+
+        try:
+            async for chunk in await self.async_client.chat(stream=True, **self._request(messages, kwargs)):
+                if chunk["message"]["content"]:
+                    yield chunk["message"]["content"]
+
+        except Exception as e:
+            raise RuntimeError(f"Ollama streaming request failed: {e}")
+
+    def warm_up(self) -> None:
+        if _ollama_module() is None:
+            self._openai_client.warm_up()
+            return
+        try:
+            self.client
+        except Exception:
+            pass  # Reported by the first real request instead
 
 
 class LLMClientFactory:
@@ -226,47 +678,270 @@ class LLMClientFactory:
 class LLMHelper:
     """LLM Helper Utility Class"""
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, cache: Optional[AnalysisCache] = None):
+        """
+        Initialize LLM helper
+
+        Args:
+            config: Configuration object
+            cache: Optional response cache; identical requests are answered from it
+        """
         self.config = config or get_config()
         self.client = LLMClientFactory.create(self.config)
+        self.cache = cache
+        # Requests in flight, keyed by cache key: concurrent identical aask() calls share one
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
+
+        # SDK import and client construction take about a second; do it in the
+        # background while the caller is still busy (e.g. parsing PDFs)
+        threading.Thread(target=self.client.warm_up, name="llm-warm-up", daemon=True).start()
 
-    def ask(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
-        """Simple Q&A"""
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-
-        return self.client.chat(messages, **kwargs)
+        return messages
+
+    def _cache_key(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> str:
+        """Cache key for a request: every parameter that shapes the response"""
+        llm_config = self.config.llm
+        key_data = {
+            "provider": llm_config.provider,
+            "model": kwargs.get("model", llm_config.model),
+            "temperature": kwargs.get("temperature", llm_config.temperature),
+            "max_tokens": kwargs.get("max_tokens", llm_config.max_tokens),
+            "messages": messages,
+            "response_format": kwargs.get("response_format"),
+        }
+        if orjson is not None:
+            return AnalysisCache.make_key(orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS))
+        return AnalysisCache.make_key(json.dumps(key_data, sort_keys=True, ensure_ascii=False))
+
+    def ask(self, prompt: str, system_prompt: Optional[str] = None, use_cache: bool = True, **kwargs) -> str:
+        """Simple Q&A; use_cache=False always queries the model"""
+        messages = self._build_messages(prompt, system_prompt)
+        if self.cache is None or not use_cache:
+            return self.client.chat(messages, **kwargs)
+
+        key = self._cache_key(messages, kwargs)
+        response = self.cache.get(key)
+        if response is None:
+            response = self.client.chat(messages, **kwargs)
+            self.cache.put(key, response)
+        return response
+
+    async def aask(self, prompt: str, system_prompt: Optional[str] = None, use_cache: bool = True, **kwargs) -> str:
+        """Simple Q&A (async); use_cache=False always queries the model"""
+        messages = self._build_messages(prompt, system_prompt)
+        if not use_cache:
+            return await self.client.achat(messages, **kwargs)
+
+        key = self._cache_key(messages, kwargs)
+        if self.cache is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+
+        # Join an identical request already in flight on this loop instead of sending another
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._achat_and_store(key, messages, kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        # Shielded: a cancelled caller must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _achat_and_store(self, key: str, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> str:
+        response = await self.client.achat(messages, **kwargs)
+        if self.cache is not None:
+            self.cache.put(key, response)
+        return response
 
     def analyze(self, content: str, instruction: str, **kwargs) -> str:
         """Analyze content"""
         prompt = f"{instruction}\n\nContent to analyze:\n\n{content}"
         return self.ask(prompt, **kwargs)
 
+    JSON_SYSTEM_PROMPT = "You are a professional information extraction assistant. Please return results in JSON format only, without any other content."
+
     def extract_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Extract JSON format response"""
-        system_prompt = "You are a professional information extraction assistant. Please return results in JSON format only, without any other content."
+        response = self.ask(prompt, system_prompt=self.JSON_SYSTEM_PROMPT, **kwargs)
+        return self.parse_json(response)
+
+    async def aextract_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Extract JSON format response (async)"""
+        response = await self.aask(prompt, system_prompt=self.JSON_SYSTEM_PROMPT, **kwargs)
+        return self.parse_json(response)
+
+    def extract_structured(self, prompt: str, schema: Dict[str, Any], name: str,
+                           fallback_prompt: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Extract JSON conforming to a schema passed out-of-band (structured outputs)
+
+        Without llm.structured_output, or if the provider rejects the request,
+        this falls back to extract_json() on fallback_prompt, which should
+        describe the schema in its text.
+
+        Args:
+            prompt: Instructions and content, without the schema
+            schema: JSON schema of the expected object
+            name: Schema name (letters, digits, underscores)
+            fallback_prompt: Prompt for the plain JSON path, defaults to prompt
+        """
+        if self.config.llm.structured_output:
+            try:
+                response = self.ask(prompt, system_prompt=self.JSON_SYSTEM_PROMPT,
+                                    response_format=self._response_format(schema, name), **kwargs)
+                return self.parse_json(response)
+            except Exception as e:
+                logger.warning(f"Structured output failed for {name}, falling back to JSON prompt: {e}")
+        return self.extract_json(fallback_prompt or prompt, **kwargs)
+
+    async def aextract_structured(self, prompt: str, schema: Dict[str, Any], name: str,
+                                  fallback_prompt: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Extract JSON conforming to a schema passed out-of-band (async)"""
+        if self.config.llm.structured_output:
+            try:
+                response = await self.aask(prompt, system_prompt=self.JSON_SYSTEM_PROMPT,
+                                           response_format=self._response_format(schema, name), **kwargs)
+                return self.parse_json(response)
+            except Exception as e:
+                logger.warning(f"Structured output failed for {name}, falling back to JSON prompt: {e}")
+        return await self.aextract_json(fallback_prompt or prompt, **kwargs)
 
-        response = self.ask(prompt, system_prompt=system_prompt, **kwargs)
+    @staticmethod
+    def _response_format(schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+        return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+
+    @staticmethod
+    def parse_json(response: str) -> Dict[str, Any]:
+        """Parse a JSON object out of an LLM response"""
+        loads = orjson.loads if orjson is not None else json.loads
 
         # Try to extract JSON
         try:
             # Try direct parsing
-            return json.loads(response)
-        except json.JSONDecodeError:
-            # Try to extract JSON from code blocks
-            import re
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response)
-            if json_match:
-                return json.loads(json_match.group(1))
+            return loads(response)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
+            pass
 
-            # Try to extract content within braces
-            json_match = re.search(r'\{[\s\S]*\}', response)
+        # Try to extract JSON from code blocks
+        if "```" in response:
+            json_match = _CODE_FENCE_RE.search(response)
             if json_match:
-                return json.loads(json_match.group(0))
+                try:
+                    return loads(json_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+
+        # Try to extract content within braces (first "{" to last "}")
+        start = response.find("{")
+        end = response.rfind("}")
+        if start != -1 and end > start:
+            try:
+                return loads(response[start:end + 1])
+            except json.JSONDecodeError:
+                pass
 
-            raise ValueError(f"Cannot extract JSON from response: {response[:200]}")
+        # Last resort: repair trailing commas, trailing prose and truncation
+        # locally instead of paying for another LLM call
+        if start != -1:
+            try:
+                if json_repair is not None:
+                    result = json_repair.loads(response[start:])
+                else:
+                    result = loads(repair_json(response[start:]))
+                if isinstance(result, dict):
+                    return result
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+        raise ValueError(f"Cannot extract JSON from response: {response[:200]}")
+
+    def stream_extract_json(self, prompt: str, use_cache: bool = True, **kwargs) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Extract JSON format response, yielding top-level members as they stream in
+
+        Args:
+            prompt: Prompt asking for a single JSON object
+
+        Yields:
+            (key, value) for each top-level member, as soon as it is complete
+        """
+        messages = self._build_messages(prompt, self.JSON_SYSTEM_PROMPT)
+        key = self._cache_key(messages, kwargs) if self.cache is not None and use_cache else None
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            yield from self.parse_json(cached).items()
+            return
+
+        chunks: List[str] = []
+
+        def record(stream):
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+
+        recorded = record(self.client.chat_stream(messages, **kwargs))
+        seen = set()
+        try:
+            for name, value in iter_json_members(recorded):
+                seen.add(name)
+                yield name, value
+        except ValueError:
+            # Not a plain JSON object; read the rest and parse the full text instead
+            for _ in recorded:
+                pass
+            for name, value in self.parse_json("".join(chunks)).items():
+                if name not in seen:
+                    yield name, value
+        except Exception as e:
+            if seen:
+                raise
+            # Streams are not retried; nothing was yielded yet, so fall back to the
+            # plain request, which backs off and retries on transient errors
+            logger.warning(f"Streaming request failed, retrying without streaming: {e}")
+            yield from self.extract_json(prompt, use_cache=use_cache, **kwargs).items()
+            return
+
+        if key is not None:
+            self.cache.put(key, "".join(chunks))
+
+    async def astream_extract_json(self, prompt: str, use_cache: bool = True, **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+        """Extract JSON format response, yielding top-level members as they stream in (async)"""
+        messages = self._build_messages(prompt, self.JSON_SYSTEM_PROMPT)
+        key = self._cache_key(messages, kwargs) if self.cache is not None and use_cache else None
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            for member in self.parse_json(cached).items():
+                yield member
+            return
+
+        chunks: List[str] = []
+        stream = self.client.achat_stream(messages, **kwargs)
+        parser = JSONMemberParser()
+        seen = set()
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                for name, value in parser.feed(chunk):
+                    seen.add(name)
+                    yield name, value
+            parser.close()
+        except ValueError:
+            # Not a plain JSON object; read the rest and parse the full text instead
+            async for chunk in stream:
+                chunks.append(chunk)
+            for name, value in self.parse_json("".join(chunks)).items():
+                if name not in seen:
+                    yield name, value
+
+        if key is not None:
+            self.cache.put(key, "".join(chunks))
 
     def summarize(self, content: str, max_length: int = 500, **kwargs) -> str:
         """Summarize content"""
@@ -274,6 +949,179 @@ class LLMHelper:
         return self.ask(prompt, **kwargs)
 
 
+class JSONMemberParser:
+    """
+    Push parser for a streamed JSON object
+
+    feed() text fragments as they arrive; each call returns the top-level
+    members completed by that fragment. Any text before the opening brace
+    is skipped.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = -1  # Index just past the last consumed token; -1 until "{" is seen
+        self.done = False  # Closing brace reached
+
+    def _skip_ws(self, i: int) -> int:
+        buffer = self._buffer
+        while i < len(buffer) and buffer[i] in " \t\r\n":
+            i += 1
+        return i
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a text fragment
+
+        Returns:
+            (key, value) for each top-level member completed by this fragment
+
+        Raises:
+            ValueError: If the stream is not a JSON object
+        """
+        if self.done:
+            return []
+        self._buffer += chunk
+        buffer = self._buffer
+
+        if self._pos < 0:
+            start = buffer.find("{")
+            if start < 0:
+                return []
+            self._pos = start + 1
+
+        members = []
+        while True:
+            i = self._skip_ws(self._pos)
+            if i < len(buffer) and buffer[i] == ",":
+                i = self._skip_ws(i + 1)
+            if i >= len(buffer):
+                break
+            if buffer[i] == "}":
+                self.done = True
+                break
+
+            try:
+                name, i = self._decoder.raw_decode(buffer, i)
+                i = self._skip_ws(i)
+                if i >= len(buffer):
+                    break
+                if buffer[i] != ":" or not isinstance(name, str):
+                    raise ValueError("Malformed JSON object")
+                value, end = self._decoder.raw_decode(buffer, self._skip_ws(i + 1))
+            except json.JSONDecodeError:
+                break  # Member still incomplete, wait for more text
+
+            # A number/literal is only complete once a delimiter follows it
+            after = self._skip_ws(end)
+            if after >= len(buffer):
+                break
+            if buffer[after] not in ",}":
+                if after == end and not buffer[end:].strip("0123456789+-.eE"):
+                    break  # Number cut off mid-token (e.g. "1.5e"), wait for more text
+                raise ValueError("Malformed JSON object")
+
+            self._pos = end
+            members.append((name, value))
+
+        return members
+
+    def close(self) -> None:
+        """
+        Signal the end of the stream
+
+        Raises:
+            ValueError: If the object was never closed
+        """
+        if not self.done:
+            raise ValueError("Incomplete JSON object")
+
+
+def iter_json_members(chunks) -> Generator[Tuple[str, Any], None, None]:
+    """
+    Incrementally parse a streamed JSON object
+
+    Args:
+        chunks: Iterable of text fragments forming one JSON object
+                (any text before the opening brace is skipped)
+
+    Yields:
+        (key, value) for each top-level member once it has fully arrived
+
+    Raises:
+        ValueError: If the stream is not a JSON object
+    """
+    parser = JSONMemberParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    parser.close()
+
+
+def repair_json(text: str) -> str:
+    """
+    Fix the JSON defects LLMs commonly produce
+
+    Drops trailing commas and anything after the top-level value, and
+    closes strings, arrays and objects left open by a truncated response.
+
+    Args:
+        text: JSON text starting at its opening bracket
+
+    Returns:
+        Repaired JSON text (still invalid if the damage is elsewhere)
+    """
+    out: List[str] = []
+    closers: List[str] = []
+    in_string = escaped = False
+
+    def drop_trailing_comma() -> None:
+        while out and out[-1] in " \t\r\n":
+            out.pop()
+        if out and out[-1] == ",":
+            out.pop()
+
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            drop_trailing_comma()
+            if closers:
+                closers.pop()
+            out.append(ch)
+            if not closers:
+                break  # Top-level value complete; ignore trailing prose
+            continue
+        out.append(ch)
+
+    # Truncated response: close whatever is still open
+    if in_string:
+        if escaped:
+            out.pop()
+        out.append('"')
+    if closers:
+        drop_trailing_comma()
+        if out and out[-1] == ":":
+            out.append("null")
+        out.extend(reversed(closers))
+
+    return "".join(out)
+
+
 # Convenience functions
 def create_llm_client(config: Optional[Config] = None) -> LLMClient:
     """Create LLM client"""
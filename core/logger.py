@@ -0,0 +1,92 @@
+"""
+Logging Module
+Responsible for configuring the package logger from LoggingConfig
+"""
+import sys
+import atexit
+import queue
+import logging
+import logging.handlers
+from typing import Optional
+
+from .config import LoggingConfig
+
+# Root logger of the package; module loggers (logging.getLogger(__name__)) propagate here
+ROOT_LOGGER_NAME = __name__.split(".")[0]
+
+CONSOLE_FORMAT = "%(message)s"
+FILE_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+def setup_logging(logging_config: LoggingConfig) -> logging.Logger:
+    """
+    Configure the package logger (idempotent)
+
+    Records are handed to a queue and written by a single background
+    listener thread, so worker threads never contend on stdout or the
+    log file.
+
+    Args:
+        logging_config: Logging configuration (level, file, console)
+
+    Returns:
+        Package root logger
+    """
+    global _listener, _queue_handler
+
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    logger.setLevel(getattr(logging, str(logging_config.level).upper(), logging.INFO))
+
+    if _listener is not None:
+        return logger
+
+    handlers = []
+    if logging_config.console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    if logging_config.file:
+        try:
+            file_handler = logging.FileHandler(logging_config.file, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"Failed to open log file {logging_config.file}: {e}", file=sys.stderr)
+
+    if not handlers:
+        if not logger.handlers:
+            logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        return logger
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    return logger
+
+
+def flush_logging() -> None:
+    """Block until all queued records have been written"""
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
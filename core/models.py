@@ -1,29 +1,134 @@
 """
 Data Model Definitions
 """
+import os
+import sys
+import gzip
+import hashlib
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from contextlib import nullcontext
 from datetime import datetime
+from functools import cached_property
 
+# Small records created many times per paper drop their per-instance __dict__
+# where supported (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Figure:
     """Figure information"""
     page: int
     caption: str = ""
     image_data: Optional[bytes] = None
+    # Where to decode the image from when it was extracted lazily
+    pdf_path: Optional[str] = None
+    xref: Optional[int] = None
 
-
-@dataclass
+    @property
+    def is_lazy(self) -> bool:
+        """Whether the image still has to be decoded from pdf_path"""
+        return self.image_data is None and self.xref is not None
+
+    def load_image(self, doc=None) -> Optional[bytes]:
+        """Image bytes, decoded from the source PDF on first use if extracted lazily
+
+        Args:
+            doc: The source PDF, if the caller already has it open
+        """
+        if self.is_lazy:
+            try:
+                import fitz
+                with nullcontext(doc) if doc is not None else fitz.open(self.pdf_path) as source:
+                    self.image_data = source.extract_image(self.xref)["image"]
+            except Exception:
+                pass
+            self.xref = None  # Decode (or fail) only once
+        return self.image_data
+
+
+# Resolution of table screenshots
+TABLE_SCREENSHOT_DPI = 200
+# Compact screenshots: lower resolution, and lower still for large regions (area in pt²)
+COMPACT_TABLE_DPI = 150
+COMPACT_LARGE_TABLE_DPI = 100
+COMPACT_LARGE_TABLE_AREA = 120_000
+COMPACT_TABLE_COLORS = 16
+
+
+def render_table_screenshot(page, clip, compact: bool = False) -> bytes:
+    """
+    Render a region of a PyMuPDF page as PNG
+
+    Compact screenshots are rendered in grayscale at an adaptive DPI and,
+    when Pillow is installed, quantized to a 16-color palette: tables are
+    black text on white, so this loses nothing legible.
+
+    Args:
+        page: PyMuPDF page object
+        clip: Region to render (fitz.Rect or 4-tuple)
+        compact: Render the small variant
+
+    Returns:
+        PNG image bytes
+    """
+    import fitz
+
+    rect = fitz.Rect(clip)
+    if not compact:
+        return page.get_pixmap(clip=rect, dpi=TABLE_SCREENSHOT_DPI).tobytes("png")
+
+    dpi = COMPACT_LARGE_TABLE_DPI if rect.width * rect.height > COMPACT_LARGE_TABLE_AREA else COMPACT_TABLE_DPI
+    pix = page.get_pixmap(clip=rect, dpi=dpi, colorspace=fitz.csGRAY)
+    try:
+        from PIL import Image
+    except ImportError:
+        return pix.tobytes("png")
+
+    import io
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    image = image.quantize(colors=COMPACT_TABLE_COLORS)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True, bits=4)
+    return buffer.getvalue()
+
+
+@dataclass(**_SLOTS)
 class Table:
     """Table information"""
     page: int
     caption: str = ""
     content: str = ""
     image_data: Optional[bytes] = None  # Screenshot of table when text extraction fails
+    # Where to render the screenshot from when it was taken lazily
+    pdf_path: Optional[str] = None
+    clip: Optional[Tuple[float, float, float, float]] = None
+    compact: bool = False
 
-
-@dataclass
+    @property
+    def is_lazy(self) -> bool:
+        """Whether the screenshot still has to be rendered from pdf_path"""
+        return self.image_data is None and self.clip is not None
+
+    def load_image(self, doc=None) -> Optional[bytes]:
+        """Screenshot PNG bytes, rendered from the source PDF on first use if taken lazily
+
+        Args:
+            doc: The source PDF, if the caller already has it open
+        """
+        if self.is_lazy:
+            try:
+                import fitz
+                with nullcontext(doc) if doc is not None else fitz.open(self.pdf_path) as source:
+                    self.image_data = render_table_screenshot(source[self.page - 1], self.clip, self.compact)
+            except Exception:
+                pass
+            self.clip = None  # Render (or fail) only once
+        return self.image_data
+
+
+@dataclass(**_SLOTS)
 class Equation:
     """Equation information"""
     page: int
@@ -32,7 +137,7 @@ class Equation:
     caption: str = ""  # Description of the equation
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Reference:
     """Reference information"""
     index: int
@@ -56,15 +161,38 @@ class PaperContent:
     equations: List[Equation] = field(default_factory=list)
     references: List[Reference] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Where full_text was moved by release_full_text()
+    full_text_path: Optional[str] = None
+
+    def release_full_text(self, spill_dir: str) -> None:
+        """Move full_text to a gzip file in spill_dir to free memory (see load_full_text)"""
+        if not self.full_text:
+            return
+        data = self.full_text.encode("utf-8", errors="surrogatepass")
+        path = os.path.join(spill_dir, f"{hashlib.sha256(data).hexdigest()}.txt.gz")
+        if not os.path.exists(path):
+            os.makedirs(spill_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        self.full_text_path = path
+        self.full_text = ""
+
+    def load_full_text(self) -> str:
+        """Full text, read back from disk (without keeping it) if it was released"""
+        if not self.full_text and self.full_text_path:
+            with gzip.open(self.full_text_path, "rb") as f:
+                return f.read().decode("utf-8", errors="surrogatepass")
+        return self.full_text
 
     @property
     def filename(self) -> str:
         """Get filename"""
-        import os
         return os.path.basename(self.file_path)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SectionAnalysis:
     """Section analysis result"""
     section_type: str
@@ -141,15 +269,35 @@ class PaperAnalysis:
     def authors(self) -> List[str]:
         return self.paper.authors
 
+    # Joined once per analysis: single, comparison and aggregation prompts all list them.
+    # Like the render cache, these assume authors and keywords are final once analysed.
+    @cached_property
+    def authors_text(self) -> str:
+        return ", ".join(self.paper.authors)
 
-@dataclass
+    @cached_property
+    def keywords_text(self) -> str:
+        return ", ".join(self.keywords)
+
+    @property
+    def has_key_resources(self) -> bool:
+        """Whether any key figure, table or equation was selected"""
+        return bool(self.key_figures or self.key_tables or self.key_equations)
+
+
+@dataclass(**_SLOTS)
 class ComparisonItem:
     """Comparison item"""
     dimension: str
     papers: Dict[str, str] = field(default_factory=dict)  # paper_title -> value
 
+    def render(self) -> str:
+        """Plain-text block used in LLM prompts"""
+        lines = "".join(f"  - {paper}: {value}\n" for paper, value in self.papers.items())
+        return f"\n{self.dimension}:\n{lines}"
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class TimelineItem:
     """Timeline item"""
     paper_title: str
@@ -158,7 +306,7 @@ class TimelineItem:
     order: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TrendItem:
     """Trend item"""
     trend_name: str
@@ -166,6 +314,10 @@ class TrendItem:
     evidence: List[str] = field(default_factory=list)
     papers: List[str] = field(default_factory=list)
 
+    def render(self) -> str:
+        """Plain-text line used in LLM prompts"""
+        return f"\n- {self.trend_name}: {self.description}\n"
+
 
 @dataclass
 class AggregatedKnowledge:
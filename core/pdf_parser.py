@@ -4,12 +4,129 @@ Responsible for extracting text content from PDF files
 """
 import os
 import re
+import logging
+from bisect import bisect_left
+from dataclasses import replace
+from functools import lru_cache
+from itertools import chain, islice, repeat
 from pathlib import Path
-from typing import List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, ProcessPoolExecutor, wait
+
+from .models import PaperContent, Figure, Table, Equation, Reference, render_table_screenshot
+from .cache import AnalysisCache
+from .config import CacheConfig, Config, PDFParserConfig, get_config
+
+logger = logging.getLogger(__name__)
+
+
+# Smallest page range worth handing to a worker process of its own
+MIN_PAGES_PER_WORKER = 16
+
+# Bytes hashed from each end of a PDF to fingerprint it for the parse cache
+FINGERPRINT_HEAD_BYTES = 1 << 20
+FINGERPRINT_TAIL_BYTES = 1 << 16
+
+# How far into the text the title and abstract are looked for first
+TITLE_SCAN_CHARS = 4000
+ABSTRACT_SCAN_CHARS = 8000
+
+# Lines at the top of the first page that are not part of the title
+_TITLE_SKIP_CI_RE = re.compile(r'^(arxiv|preprint|published|accepted|submitted|abstract|introduction)', re.IGNORECASE)
+_TITLE_SKIP_RE = re.compile(r'^(\d{4}|[a-z])')  # Year, or lowercase start
+
+_ABSTRACT_RES = [
+    re.compile(pattern, re.DOTALL | re.IGNORECASE)
+    for pattern in (
+        r'Abstract[:\s]*\n(.*?)(?=\n\s*(?:1\.?\s*)?Introduction|\n\s*Keywords|\n\s*\d+\s)',
+        r'ABSTRACT[:\s]*\n(.*?)(?=\n\s*(?:1\.?\s*)?INTRODUCTION|\n\s*KEYWORDS|\n\s*\d+\s)',
+    )
+]
+_REFERENCES_HEADING_RE = re.compile(r'^references?[ \t]*$', re.IGNORECASE | re.MULTILINE)
+_REFERENCES_RES = [
+    re.compile(pattern, re.DOTALL | re.IGNORECASE)
+    for pattern in (r'References?\s*\n(.*?)$', r'REFERENCES?\s*\n(.*?)$')
+]
+# Match [1], [2] or 1., 2. format
+_REFERENCE_SPLIT_RE = re.compile(r'\n\s*\[(\d+)\]|\n\s*(\d+)\.\s+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Words that mark a candidate equation as prose
+_COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
+    'could', 'may', 'might', 'must', 'can', 'of', 'in', 'on', 'at', 'to',
+    'for', 'with', 'by', 'from', 'as', 'and', 'or', 'but', 'if', 'when',
+    'where', 'why', 'how', 'which', 'that', 'this', 'these', 'those',
+    'demonstrating', 'introduced', 'tasks', 'exceptional', 'proficiency',
+    'achieving', 'performance', 'results', 'shows', 'across', 'compared',
+})
+
+# One alternation of all indicators: a single scan finds whether any is present
+_MATH_INDICATOR_RE = re.compile("|".join(
+    f"(?:{pattern})"
+    for pattern in (
+        r'[=+*/^](?!\w)',        # Operators not followed by word char (to exclude file names, etc.)
+        r'\\[a-zA-Z]+\{',        # LaTeX commands with braces like \sum{, \frac{
+        r'[α-ωΑ-Ω]',             # Greek letters
+        r'\b\d+\.\d+\b',         # Decimal numbers
+        r'\b[a-z]_\{[^}]+\}',    # Subscripts like x_{i}
+        r'\^\{[^}]+\}',          # Superscripts like x^{2}
+        r'\\frac|\\sum|\\int|\\prod|\\log|\\exp',  # Common math functions
+        r'∈|∉|⊂|⊆|∪|∩|≤|≥|≠',   # Mathematical symbols
+        r'\b[a-zA-Z]\s*[=]\s*',  # Variable assignment like "x = "
+    )
+))
+
+# LaTeX display equations ($$...$$) and environments (\begin{equation}...\end{equation}),
+# found in one scan and told apart by group name
+_LATEX_EQUATION_RE = re.compile(
+    r'\$\$(?P<display>.+?)\$\$'
+    r'|\\begin\{(?:equation|align|eqnarray)\*?\}(?P<env>.+?)\\end\{(?:equation|align|eqnarray)\*?\}',
+    re.DOTALL | re.IGNORECASE,
+)
+# Numbered equations in text like (1), (2), etc. with context before and after
+_NUMBERED_EQUATION_RE = re.compile(r'([A-Za-z\s=+\-*/0-9\(\)\[\]]+)\s*\((\d+)\)')
+_LABEL_RE = re.compile(r'\\label\{([^}]+)\}')
+
+
+def _search_first(patterns, text: str) -> Optional[re.Match]:
+    """Match of the first pattern that matches text, if any"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+@lru_cache(maxsize=64)
+def _figure_caption_res(number: int) -> List[re.Pattern]:
+    """Caption patterns for figure `number`, compiled once per number"""
+    return [
+        re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        for pattern in (
+            rf'Figure\s+{number}[:\.\s]+(.*?)(?=\n\n|\nTable|\nFigure\s+\d+|$)',
+            rf'Fig\.\s+{number}[:\.\s]+(.*?)(?=\n\n|\nTable|\nFig\.\s+\d+|$)',
+            rf'图\s+{number}[:\.\s]+(.*?)(?=\n\n|\n表|\n图\s+\d+|$)',
+        )
+    ]
+
+
+def _parse_in_worker(pdf_config: PDFParserConfig, cache_config: CacheConfig, pdf_path: str) -> Optional[PaperContent]:
+    """Parse a single PDF in a worker process (module-level so it can be pickled)"""
+    # Already one process per document: do not nest page workers
+    pdf_config = replace(pdf_config, page_workers=0)
+    return PDFParser.from_pdf_config(pdf_config, cache_config).parse_single(pdf_path)
+
 
-from .models import PaperContent, Figure, Table, Equation, Reference
-from .config import Config, get_config
+def _extract_pages_in_worker(
+    pdf_config: PDFParserConfig, pdf_path: str, start: int, stop: int
+) -> Tuple[str, List[Table], List[Figure]]:
+    """Extract a page range in a worker process, which opens its own copy of the document"""
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        return PDFParser.from_pdf_config(pdf_config)._extract_pages_pymupdf(doc, start, stop)
 
 
 class PDFParser:
@@ -18,45 +135,158 @@ class PDFParser:
     def __init__(self, config: Optional[Config] = None):
         self.config = config or get_config()
         self.pdf_config = self.config.pdf_parser
+        # Parsed papers are kept whole in memory, so hold only a few there
+        self.parse_cache = AnalysisCache(self.config.cache, namespace="parse", memory_size=16)
+
+    @classmethod
+    def from_pdf_config(cls, pdf_config: PDFParserConfig, cache_config: Optional[CacheConfig] = None) -> "PDFParser":
+        """Minimal parser for worker processes: parse_single only needs the PDF and cache settings"""
+        parser = cls.__new__(cls)
+        parser.config = None
+        parser.pdf_config = pdf_config
+        parser.parse_cache = AnalysisCache(cache_config or CacheConfig(enabled=False), namespace="parse", memory_size=16)
+        return parser
+
+    def parse_all(
+        self, pdf_paths: List[str], errors: Optional[Dict[str, Exception]] = None
+    ) -> List[PaperContent]:
+        """Parse all PDFs in parallel, keeping input order
+
+        parallel.mode "process" spreads the CPU-bound parsing over worker
+        processes; "thread" keeps everything in this process.
 
-    def parse_all(self, pdf_paths: List[str]) -> List[PaperContent]:
-        """Parse all PDFs in parallel"""
-        papers = []
+        Args:
+            pdf_paths: PDF file paths
+            errors: If given, filled with the exception of each path that failed
 
-        if self.config.parallel.enabled and len(pdf_paths) > 1:
-            with ThreadPoolExecutor(max_workers=self.config.parallel.max_workers) as executor:
-                futures = {executor.submit(self.parse_single, path): path for path in pdf_paths}
-                for future in as_completed(futures):
-                    path = futures[future]
-                    try:
-                        paper = future.result()
-                        if paper:
-                            papers.append(paper)
-                    except Exception as e:
-                        print(f"Failed to parse {path}: {e}")
-        else:
-            for path in pdf_paths:
+        Returns:
+            Papers that parsed, in input order
+        """
+        results: List[Optional[PaperContent]] = [None] * len(pdf_paths)
+        for i, paper in self._iter_parsed(pdf_paths, errors):
+            results[i] = paper
+        return [paper for paper in results if paper is not None]
+
+    def iter_parse(
+        self, pdf_paths: List[str], errors: Optional[Dict[str, Exception]] = None
+    ) -> Iterator[PaperContent]:
+        """Parse PDFs like parse_all, yielding each paper as soon as it is ready
+
+        Papers come in completion order. Only a bounded number of parses are
+        queued at a time, so memory stays flat on very large batches and
+        callers can start on the first papers while the rest are parsed.
+        Failures are logged and, if errors is given, recorded there by path.
+        """
+        for _, paper in self._iter_parsed(pdf_paths, errors):
+            yield paper
+
+    def _iter_parsed(
+        self, pdf_paths: List[str], errors: Optional[Dict[str, Exception]] = None
+    ) -> Iterator[Tuple[int, PaperContent]]:
+        """Yield (input index, paper) for every PDF that parses, in completion order"""
+        def fail(path: str, error: Exception) -> None:
+            logger.error(f"Failed to parse {path}: {error}")
+            if errors is not None:
+                errors[path] = error
+
+        if not (self.config.parallel.enabled and len(pdf_paths) > 1):
+            for i, path in enumerate(pdf_paths):
                 try:
                     paper = self.parse_single(path)
                     if paper:
-                        papers.append(paper)
+                        yield i, paper
                 except Exception as e:
-                    print(f"Failed to parse {path}: {e}")
+                    fail(path, e)
+            return
 
-        return papers
+        # Stat up front so missing or empty files never take a worker slot
+        sizes = {}
+        for i, path in enumerate(pdf_paths):
+            try:
+                sizes[i] = os.path.getsize(path)
+            except OSError as e:
+                fail(path, e)
+                continue
+            if sizes[i] == 0:
+                del sizes[i]
+                fail(path, ValueError("file is empty"))
+
+        max_workers = self.config.parallel.max_workers
+        if self.config.parallel.mode == "process":
+            # Only the PDF settings and path are sent to the workers
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            parse, parse_args = _parse_in_worker, (self.pdf_config, self.config.cache)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            parse, parse_args = self.parse_single, ()
+
+        # Largest first, so small files backfill instead of one big file finishing last
+        pending = iter(sorted(sizes, key=sizes.get, reverse=True))
+
+        with executor:
+            # Keep at most two parses per worker queued (backpressure on big batches)
+            futures = {executor.submit(parse, *parse_args, pdf_paths[i]): i for i in islice(pending, 2 * max_workers)}
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = futures.pop(future)
+                    for j in islice(pending, 1):
+                        futures[executor.submit(parse, *parse_args, pdf_paths[j])] = j
+                    try:
+                        paper = future.result()
+                    except Exception as e:
+                        fail(pdf_paths[i], e)
+                        continue
+                    if paper:
+                        yield i, paper
 
     def parse_single(self, pdf_path: str) -> Optional[PaperContent]:
         """Parse a single PDF file"""
-        if not os.path.exists(pdf_path):
+        # One stat both checks existence and sizes the file for the cache key
+        try:
+            size = os.stat(pdf_path).st_size
+        except FileNotFoundError:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-        if self.pdf_config.engine == "pymupdf":
-            return self._parse_with_pymupdf(pdf_path)
-        elif self.pdf_config.engine == "pdfplumber":
-            return self._parse_with_pdfplumber(pdf_path)
+        key = self._parse_cache_key(pdf_path, size) if self.parse_cache.enabled else None
+        if key:
+            paper = self.parse_cache.get(key)
+            if paper is not None:
+                return self._relocate(paper, pdf_path)
+
+        if self.pdf_config.engine == "pdfplumber":
+            paper = self._parse_with_pdfplumber(pdf_path)
         else:
             # Default to pymupdf
-            return self._parse_with_pymupdf(pdf_path)
+            paper = self._parse_with_pymupdf(pdf_path)
+
+        if key and paper:
+            self.parse_cache.put(key, paper)
+        return paper
+
+    def _parse_cache_key(self, pdf_path: str, size: int) -> str:
+        """Fingerprint of the file (size, first MiB, last 64 KiB) and parser settings"""
+        with open(pdf_path, 'rb') as f:
+            head = f.read(FINGERPRINT_HEAD_BYTES)
+            tail = b""
+            if size > FINGERPRINT_HEAD_BYTES:
+                # PDF edits are appended as incremental updates at the end
+                f.seek(max(FINGERPRINT_HEAD_BYTES, size - FINGERPRINT_TAIL_BYTES))
+                tail = f.read()
+        return AnalysisCache.make_key(size, head, tail, replace(self.pdf_config, page_workers=0))
+
+    @staticmethod
+    def _relocate(paper: PaperContent, pdf_path: str) -> PaperContent:
+        """Point a cached paper (possibly parsed from a copy elsewhere) at pdf_path"""
+        if paper.file_path == pdf_path:
+            return paper
+        # Copies, so the cached paper itself stays untouched
+        return replace(
+            paper,
+            file_path=pdf_path,
+            figures=[replace(f, pdf_path=pdf_path) if f.pdf_path else f for f in paper.figures],
+            tables=[replace(t, pdf_path=pdf_path) if t.pdf_path else t for t in paper.tables],
+        )
 
     def _parse_with_pymupdf(self, pdf_path: str) -> PaperContent:
         """Parse PDF using PyMuPDF"""
@@ -67,13 +297,31 @@ class PDFParser:
 
         doc = fitz.open(pdf_path)
 
-        # Extract text
-        full_text = ""
+        # Extract text, tables and figures in a single pass over the pages
         max_pages = self.pdf_config.max_pages or len(doc)
+        page_count = min(len(doc), max_pages)
+        workers = min(self.pdf_config.page_workers, page_count // MIN_PAGES_PER_WORKER)
+
+        if workers > 1:
+            # PyMuPDF is not thread-safe: split long documents into page ranges
+            # parsed by worker processes, each opening the file itself
+            bounds = [page_count * i // workers for i in range(workers + 1)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parts = list(executor.map(
+                    _extract_pages_in_worker,
+                    repeat(self.pdf_config), repeat(pdf_path), bounds[:-1], bounds[1:],
+                ))
+        else:
+            parts = [self._extract_pages_pymupdf(doc, 0, page_count)]
 
-        for page_num in range(min(len(doc), max_pages)):
-            page = doc[page_num]
-            full_text += page.get_text()
+        full_text = "".join(text for text, _, _ in parts)
+        tables = [table for _, page_tables, _ in parts for table in page_tables]
+        figures = [figure for _, _, page_figures in parts for figure in page_figures]
+
+        # Placeholders for figures that failed to extract are numbered document-wide
+        for i, figure in enumerate(figures):
+            if figure.image_data is None and figure.xref is None and not figure.caption:
+                figure.caption = f"Figure {i + 1} (page {figure.page})"
 
         # Extract metadata
         metadata = doc.metadata or {}
@@ -87,16 +335,6 @@ class PDFParser:
         # Extract abstract
         abstract = self._extract_abstract(full_text)
 
-        # Extract tables
-        tables = []
-        if self.pdf_config.extract_tables:
-            tables = self._extract_tables_pymupdf(doc, max_pages)
-
-        # Extract figures
-        figures = []
-        if self.pdf_config.extract_images:
-            figures = self._extract_figures_pymupdf(doc, max_pages)
-
         # Extract equations
         equations = self._extract_equations(full_text)
 
@@ -118,6 +356,31 @@ class PDFParser:
             metadata=metadata,
         )
 
+    def _extract_pages_pymupdf(self, doc, start: int, stop: int) -> Tuple[str, List[Table], List[Figure]]:
+        """Extract text, tables and figures from pages [start, stop) in one pass"""
+        import fitz
+
+        texts: List[str] = []
+        tables = []
+        figures = []
+
+        for page_num in range(start, stop):
+            # Load and lay out each page once for all three extractions: the
+            # text page is shared by the plain text and the word positions
+            # table screenshots need (both use the same default flags)
+            page = doc[page_num]
+            textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+            text = page.get_text(textpage=textpage)
+            texts.append(text)
+
+            if self.pdf_config.extract_tables:
+                tables.extend(self._extract_tables_pymupdf(page, page_num, textpage))
+
+            if self.pdf_config.extract_images:
+                figures.extend(self._extract_figures_pymupdf(doc, page, page_num, text))
+
+        return "".join(texts), tables, figures
+
     def _parse_with_pdfplumber(self, pdf_path: str) -> PaperContent:
         """Parse PDF using pdfplumber"""
         try:
@@ -126,14 +389,17 @@ class PDFParser:
             raise ImportError("Please install pdfplumber: pip install pdfplumber")
 
         with pdfplumber.open(pdf_path) as pdf:
-            full_text = ""
+            texts: List[str] = []
             max_pages = self.pdf_config.max_pages or len(pdf.pages)
 
             for page_num in range(min(len(pdf.pages), max_pages)):
                 page = pdf.pages[page_num]
                 text = page.extract_text()
                 if text:
-                    full_text += text + "\n"
+                    texts.append(text + "\n")
+
+            # Join once: repeated += copies the growing text on every page
+            full_text = "".join(texts)
 
             # Extract title
             title = self._extract_title(full_text, {})
@@ -168,40 +434,19 @@ class PDFParser:
         if metadata.get("title"):
             return metadata["title"]
 
-        # Extract from beginning of text
-        lines = text.strip().split('\n')
+        # Extract from beginning of text: only the first 10 lines are checked,
+        # so never split more than the head of the document
+        head = text[:TITLE_SCAN_CHARS].lstrip() or text.lstrip()
+        lines = head.split('\n', 10)[:10]
         title_lines = []
 
-        for line in lines[:10]:  # Only check first 10 lines
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
 
             # Skip common non-title content
-            # Check case-insensitive patterns
-            case_insensitive_patterns = [
-                r'^(arxiv|preprint|published|accepted|submitted)',
-                r'^(abstract|introduction)',
-            ]
-            # Check case-sensitive patterns
-            case_sensitive_patterns = [
-                r'^\d{4}',  # Year at beginning
-                r'^[a-z]',  # Lowercase letter at beginning usually not title
-            ]
-
-            should_skip = False
-            for pattern in case_insensitive_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-
-            if not should_skip:
-                for pattern in case_sensitive_patterns:
-                    if re.match(pattern, line):
-                        should_skip = True
-                        break
-
-            if should_skip:
+            if _TITLE_SKIP_CI_RE.match(line) or _TITLE_SKIP_RE.match(line):
                 continue
 
             title_lines.append(line)
@@ -227,19 +472,17 @@ class PDFParser:
 
     def _extract_abstract(self, text: str) -> str:
         """Extract abstract"""
-        # Find Abstract section
-        patterns = [
-            r'Abstract[:\s]*\n(.*?)(?=\n\s*(?:1\.?\s*)?Introduction|\n\s*Keywords|\n\s*\d+\s)',
-            r'ABSTRACT[:\s]*\n(.*?)(?=\n\s*(?:1\.?\s*)?INTRODUCTION|\n\s*KEYWORDS|\n\s*\d+\s)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                abstract = match.group(1).strip()
-                # Clean extra whitespace
-                abstract = re.sub(r'\s+', ' ', abstract)
-                return abstract
+        # Find Abstract section: it is on the first pages, so search the head
+        # of the document first and the full text only if that misses
+        match = _search_first(_ABSTRACT_RES, text[:ABSTRACT_SCAN_CHARS])
+        if match is None and len(text) > ABSTRACT_SCAN_CHARS:
+            match = _search_first(_ABSTRACT_RES, text)
+
+        if match:
+            abstract = match.group(1).strip()
+            # Clean extra whitespace
+            abstract = _WHITESPACE_RE.sub(' ', abstract)
+            return abstract
 
         return ""
 
@@ -247,28 +490,33 @@ class PDFParser:
         """Extract references"""
         references = []
 
-        # Find References section
-        ref_patterns = [
-            r'References?\s*\n(.*?)$',
-            r'REFERENCES?\s*\n(.*?)$',
-        ]
-
+        # Find References section: it sits near the end, so look for the last
+        # heading line first and only regex-scan the whole text without one
         ref_section = ""
-        for pattern in ref_patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                ref_section = match.group(1)
-                break
+        heading = None
+        for heading in _REFERENCES_HEADING_RE.finditer(text):
+            pass
+        if heading is not None:
+            ref_section = text[heading.end() + 1:]
+        else:
+            for pattern in _REFERENCES_RES:
+                match = pattern.search(text)
+                if match:
+                    ref_section = match.group(1)
+                    break
 
         if not ref_section:
             return references
 
-        # Parse reference entries
-        # Match [1], [2] or 1., 2. format
-        entries = re.split(r'\n\s*\[(\d+)\]|\n\s*(\d+)\.\s+', ref_section)
-
+        # Parse reference entries: the text between consecutive markers, sliced
+        # out as the markers are found rather than re.split into one big list
         idx = 1
-        for entry in entries:
+        start = 0
+        for match in chain(_REFERENCE_SPLIT_RE.finditer(ref_section), [None]):
+            end = match.start() if match else len(ref_section)
+            entry = ref_section[start:end]
+            if match:
+                start = match.end()
             if entry and not entry.isdigit():
                 entry = entry.strip()
                 if len(entry) > 10:  # Filter too short content
@@ -280,101 +528,113 @@ class PDFParser:
 
         return references
 
-    def _extract_tables_pymupdf(self, doc, max_pages: int) -> List[Table]:
-        """Extract tables using PyMuPDF"""
+    def _extract_tables_pymupdf(self, page, page_num: int, textpage=None) -> List[Table]:
+        """Extract tables from one page using PyMuPDF (textpage: the page's already built text page)"""
         tables = []
-        for page_num in range(min(len(doc), max_pages)):
-            page = doc[page_num]
-            # PyMuPDF table extraction
-            try:
-                page_tables = page.find_tables()
-                for table_obj in page_tables:
-                    table_data = table_obj.extract()
-                    content_str = str(table_data)
-
-                    # Check if table extraction is incomplete (only header, <= 1 row)
-                    is_incomplete = len(table_data) <= 1
-
-                    image_data = None
-                    if is_incomplete:
-                        # Extract table as screenshot
-                        image_data = self._screenshot_table(page, table_obj)
-
-                    tables.append(Table(
-                        page=page_num + 1,
-                        content=content_str,
-                        image_data=image_data,
-                    ))
-            except Exception:
-                pass
+        words = None  # Word positions by top edge, read once per page and only if a screenshot is needed
+        # PyMuPDF table extraction
+        try:
+            page_tables = page.find_tables()
+            for table_obj in page_tables:
+                table_data = table_obj.extract()
+                content_str = str(table_data)
+
+                # Check if table extraction is incomplete (only header, <= 1 row)
+                is_incomplete = len(table_data) <= 1
+
+                image_data = None
+                lazy = {}
+                if is_incomplete:
+                    # Extract table as screenshot
+                    if words is None:
+                        words = sorted(page.get_text("words", textpage=textpage), key=lambda w: w[1])
+                        word_tops = [w[1] for w in words]
+                    clip = self._table_clip(table_obj, words, word_tops)
+                    if self.pdf_config.lazy_images:
+                        # Render only when the table is saved (Table.load_image)
+                        lazy = {
+                            "pdf_path": page.parent.name,
+                            "clip": tuple(clip),
+                            "compact": self.pdf_config.compact_table_screenshots,
+                        }
+                    else:
+                        image_data = self._screenshot_table(page, clip)
+
+                tables.append(Table(
+                    page=page_num + 1,
+                    content=content_str,
+                    image_data=image_data,
+                    **lazy,
+                ))
+        except Exception:
+            pass
         return tables
 
-    def _screenshot_table(self, page, table_obj) -> Optional[bytes]:
+    def _table_clip(self, table_obj, words: list, word_tops: List[float]):
         """
-        Screenshot a table region as PNG image
+        Region of a table to screenshot: its bounding box, extended down to
+        where the table's text actually ends
 
         Args:
-            page: PyMuPDF page object
             table_obj: PyMuPDF table object
+            words: The page's page.get_text("words") output, sorted by top edge
+            word_tops: Top edge of each word in words, for bisecting
 
         Returns:
-            PNG image bytes, or None if failed
+            fitz.Rect of the region
         """
-        try:
-            import fitz
-
-            # Get table bounding box
-            table_rect = fitz.Rect(table_obj.bbox)
-
-            # Find actual table extent by analyzing text positions
-            text_instances = page.get_text("words")
-
-            # Find table start (header)
-            table_y0 = table_rect.y0
-            table_y1 = table_rect.y1
-
-            # Find text blocks in table region to determine actual height
-            table_words = []
-            for word_data in text_instances:
-                x0, y0, x1, y1, word = word_data[:5]
+        import fitz
 
-                # Check if word is in table's horizontal range
-                if (x0 >= table_rect.x0 - 20 and x0 <= table_rect.x1 + 20 and
-                    y0 >= table_y0 - 10):
-                    table_words.append((y0, y1, word))
+        # Get table bounding box
+        table_rect = fitz.Rect(table_obj.bbox)
 
-            # Sort by y position and find extent
-            if table_words:
-                table_words.sort(key=lambda w: w[0])
+        # Find table start (header)
+        table_y0 = table_rect.y0
+        table_y1 = table_rect.y1
 
-                # Find where table ends: look for large gap or next section
-                last_y = table_words[0][1]
-                for y0, y1, word in table_words[1:]:
-                    gap = y0 - last_y
+        # Find actual table extent by walking down the words in the table's
+        # horizontal range, starting at the header and stopping at the first
+        # large gap or next section: words above the table are never visited
+        last_y = None
+        for i in range(bisect_left(word_tops, table_y0 - 10), len(words)):
+            x0, y0, x1, y1, word = words[i][:5]
 
-                    # Stop at large gap or section markers
-                    if gap > 30 or word.lower() in ['table', 'figure', 'section']:
-                        break
+            # Check if word is in table's horizontal range
+            if not (table_rect.x0 - 20 <= x0 <= table_rect.x1 + 20):
+                continue
 
-                    table_y1 = y1
-                    last_y = y1
+            if last_y is not None:
+                # Stop at large gap or section markers
+                if y0 - last_y > 30 or word.lower() in ('table', 'figure', 'section'):
+                    break
+                table_y1 = y1
+            last_y = y1
+
+        # Create extended rectangle
+        return fitz.Rect(
+            table_rect.x0 - 5,
+            table_y0 - 5,
+            table_rect.x1 + 5,
+            table_y1 + 5
+        )
 
-            # Create extended rectangle
-            rect = fitz.Rect(
-                table_rect.x0 - 5,
-                table_y0 - 5,
-                table_rect.x1 + 5,
-                table_y1 + 5
-            )
+    def _screenshot_table(self, page, rect) -> Optional[bytes]:
+        """
+        Screenshot a table region as PNG image
 
-            # Render as image (DPI=200 for good quality)
-            pix = page.get_pixmap(clip=rect, dpi=200)
+        Args:
+            page: PyMuPDF page object
+            rect: Region from _table_clip
 
-            # Convert to PNG bytes
-            return pix.tobytes("png")
+        Returns:
+            PNG image bytes, or None if failed
+        """
+        try:
+            # Render as PNG (DPI=200 for good quality, or the compact variant)
+            return render_table_screenshot(page, rect, self.pdf_config.compact_table_screenshots)
 
         except Exception as e:
-            print(f"Failed to screenshot table: {e}")
+            logger.warning(f"Failed to screenshot table: {e}")
             return None
 
     def _extract_tables_pdfplumber(self, pdf, max_pages: int) -> List[Table]:
@@ -390,55 +650,44 @@ class PDFParser:
                 ))
         return tables
 
-    def _extract_figures_pymupdf(self, doc, max_pages: int) -> List[Figure]:
-        """Extract figures using PyMuPDF"""
-        import fitz
+    def _extract_figures_pymupdf(self, doc, page, page_num: int, text: str) -> List[Figure]:
+        """Extract figures from one page using PyMuPDF"""
         figures = []
 
-        for page_num in range(min(len(doc), max_pages)):
-            page = doc[page_num]
-            image_list = page.get_images()
+        for img_index, img in enumerate(page.get_images()):
+            try:
+                xref = img[0]  # Image reference number
 
-            for img_index, img in enumerate(image_list):
-                try:
-                    xref = img[0]  # Image reference number
-                    base_image = doc.extract_image(xref)
-                    image_data = base_image["image"]  # Binary image data
-                    image_ext = base_image["ext"]      # Image extension (png, jpg, etc.)
-
-                    # Try to extract caption from nearby text
-                    caption = self._extract_figure_caption(page, page_num, img_index)
-
-                    figures.append(Figure(
-                        page=page_num + 1,
-                        caption=caption,
-                        image_data=image_data,
-                    ))
-                except Exception as e:
-                    # If extraction fails, create placeholder
-                    figures.append(Figure(
-                        page=page_num + 1,
-                        caption=f"Figure {len(figures) + 1} (page {page_num + 1})",
-                    ))
+                # Try to extract caption from nearby text
+                caption = self._extract_figure_caption(text, page_num, img_index)
+
+                if self.pdf_config.lazy_images:
+                    # Decode only when the figure is used (Figure.load_image)
+                    figures.append(Figure(page=page_num + 1, caption=caption, pdf_path=doc.name, xref=xref))
+                    continue
+
+                base_image = doc.extract_image(xref)
+                image_data = base_image["image"]  # Binary image data
+
+                figures.append(Figure(
+                    page=page_num + 1,
+                    caption=caption,
+                    image_data=image_data,
+                ))
+            except Exception:
+                # If extraction fails, create placeholder (captioned by the caller)
+                figures.append(Figure(page=page_num + 1))
         return figures
 
-    def _extract_figure_caption(self, page, page_num: int, img_index: int) -> str:
+    def _extract_figure_caption(self, text: str, page_num: int, img_index: int) -> str:
         """Extract figure caption from page text"""
-        text = page.get_text()
-
         # Look for common figure caption patterns
-        patterns = [
-            rf'Figure\s+{img_index + 1}[:\.\s]+(.*?)(?=\n\n|\nTable|\nFigure\s+\d+|$)',
-            rf'Fig\.\s+{img_index + 1}[:\.\s]+(.*?)(?=\n\n|\nTable|\nFig\.\s+\d+|$)',
-            rf'图\s+{img_index + 1}[:\.\s]+(.*?)(?=\n\n|\n表|\n图\s+\d+|$)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _figure_caption_res(img_index + 1):
+            match = pattern.search(text)
             if match:
                 caption = match.group(1).strip()
                 # Clean up and limit length
-                caption = re.sub(r'\s+', ' ', caption)
+                caption = _WHITESPACE_RE.sub(' ', caption)
                 if len(caption) > 200:
                     caption = caption[:197] + "..."
                 return f"Figure {img_index + 1}: {caption}"
@@ -459,94 +708,60 @@ class PDFParser:
         words = text.split()
 
         # Check for common English words (prose indicator)
-        common_words = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-                       'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
-                       'could', 'may', 'might', 'must', 'can', 'of', 'in', 'on', 'at', 'to',
-                       'for', 'with', 'by', 'from', 'as', 'and', 'or', 'but', 'if', 'when',
-                       'where', 'why', 'how', 'which', 'that', 'this', 'these', 'those',
-                       'demonstrating', 'introduced', 'tasks', 'exceptional', 'proficiency',
-                       'achieving', 'performance', 'results', 'shows', 'across', 'compared'}
-
         if len(words) > 5:
-            common_word_count = sum(1 for word in words if word.lower() in common_words)
-            # If more than 50% are common English words, definitely not an equation
-            if common_word_count / len(words) > 0.5:
-                return False
-
-        # Check for mathematical indicators
-        math_indicators = [
-            r'[=+*/^](?!\w)',        # Operators not followed by word char (to exclude file names, etc.)
-            r'\\[a-zA-Z]+\{',        # LaTeX commands with braces like \sum{, \frac{
-            r'[α-ωΑ-Ω]',             # Greek letters
-            r'\b\d+\.\d+\b',         # Decimal numbers
-            r'\b[a-z]_\{[^}]+\}',    # Subscripts like x_{i}
-            r'\^\{[^}]+\}',          # Superscripts like x^{2}
-            r'\\frac|\\sum|\\int|\\prod|\\log|\\exp',  # Common math functions
-            r'∈|∉|⊂|⊆|∪|∩|≤|≥|≠',   # Mathematical symbols
-            r'\b[a-zA-Z]\s*[=]\s*',  # Variable assignment like "x = "
-        ]
-
-        # Count mathematical indicators
-        math_score = sum(1 for pattern in math_indicators if re.search(pattern, text))
-
-        # If no mathematical indicators, not an equation
-        if math_score == 0:
-            return False
-
-        # If has strong mathematical indicators, likely an equation
-        return True
+            # More than 50% common English words means definitely not an equation:
+            # stop counting as soon as that is certain
+            limit = len(words) / 2
+            common_word_count = 0
+            for word in words:
+                if word.lower() in _COMMON_WORDS:
+                    common_word_count += 1
+                    if common_word_count > limit:
+                        return False
+
+        # Any mathematical indicator makes it likely an equation
+        return _MATH_INDICATOR_RE.search(text) is not None
 
     def _extract_equations(self, text: str) -> List[Equation]:
         """Extract equations from text
 
         Looks for LaTeX-style equations and numbered equations
         """
-        equations = []
-
-        # Pattern 1: LaTeX inline equations: $...$
-        inline_pattern = r'\$([^\$]+)\$'
-
-        # Pattern 2: LaTeX display equations: $$...$$
-        display_pattern = r'\$\$(.+?)\$\$'
-
-        # Pattern 3: LaTeX environments: \begin{equation}...\end{equation}
-        env_pattern = r'\\begin\{(?:equation|align|eqnarray)\*?\}(.+?)\\end\{(?:equation|align|eqnarray)\*?\}'
-
-        # Pattern 4: Numbered equations in text like (1), (2), etc.
-        # with context before and after
-        numbered_pattern = r'([A-Za-z\s=+\-*/0-9\(\)\[\]]+)\s*\((\d+)\)'
-
         page_num = 1  # Simplified, in real usage would track pages
 
-        # Extract display equations (highest priority)
-        for match in re.finditer(display_pattern, text, re.DOTALL):
-            eq_text = match.group(1).strip()
-            if len(eq_text) > 3 and self._is_likely_equation(eq_text):  # Validate equation
-                equations.append(Equation(
-                    page=page_num,
-                    equation_text=eq_text,
-                    caption=f"Display equation"
-                ))
+        display_equations = []
+        env_equations = []
+        for match in _LATEX_EQUATION_RE.finditer(text):
+            eq_text = match.group(match.lastgroup).strip()
+            if len(eq_text) <= 3:
+                continue
 
-        # Extract LaTeX environment equations
-        for match in re.finditer(env_pattern, text, re.DOTALL | re.IGNORECASE):
-            eq_text = match.group(1).strip()
-            if len(eq_text) > 3:
+            if match.lastgroup == "display":
+                if self._is_likely_equation(eq_text):  # Validate equation
+                    display_equations.append(Equation(
+                        page=page_num,
+                        equation_text=eq_text,
+                        caption=f"Display equation"
+                    ))
+            else:
                 # Try to find equation number
-                eq_num_match = re.search(r'\\label\{([^}]+)\}', eq_text)
+                eq_num_match = _LABEL_RE.search(eq_text)
                 eq_num = eq_num_match.group(1) if eq_num_match else None
 
-                equations.append(Equation(
+                env_equations.append(Equation(
                     page=page_num,
                     equation_text=eq_text,
                     equation_number=eq_num,
                     caption=f"LaTeX equation"
                 ))
 
+        # Display equations (highest priority) first, then LaTeX environments
+        equations = display_equations + env_equations
+
         # If no LaTeX equations found, look for numbered expressions
         if not equations:
             # Look for patterns like "x = y + z  (1)"
-            for match in re.finditer(numbered_pattern, text):
+            for match in _NUMBERED_EQUATION_RE.finditer(text):
                 expr = match.group(1).strip()
                 eq_num = match.group(2)
 
@@ -2,26 +2,69 @@
 Report Generator Module
 Responsible for generating various types of reports
 """
+import io
 import os
+import ast
 import json
-from typing import Optional, List, Dict, Any
+import string
+import threading
+from typing import Optional, List, Dict, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 
 from .models import (
-    PaperAnalysis, AggregatedKnowledge, Report
+    PaperAnalysis, AggregatedKnowledge, Report, TechnologyAnalysis
 )
 from .config import Config, get_config
 from .llm_client import LLMHelper
 from .resource_manager import ResourceManager
 
+# Page wrapper for HTML reports; $title, $body and $generated_at are substituted
+_HTML_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>$title</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 900px; margin: 0 auto; padding: 20px; line-height: 1.6; }
+        h1 { color: #333; border-bottom: 2px solid #333; padding-bottom: 10px; }
+        h2 { color: #444; margin-top: 30px; }
+        h3 { color: #555; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+        th { background-color: #f5f5f5; }
+        code { background-color: #f4f4f4; padding: 2px 6px; border-radius: 3px; }
+        pre { background-color: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }
+        blockquote { border-left: 4px solid #ddd; margin: 0; padding-left: 20px; color: #666; }
+    </style>
+</head>
+<body>
+$body
+<footer>
+    <p><small>Generated at: $generated_at</small></p>
+</footer>
+</body>
+</html>""")
+
+# Stand-in for a missing knowledge object: every knowledge section renders as absent
+_NO_KNOWLEDGE = AggregatedKnowledge(papers=[])
+
+# Write buffer for saved reports, so a large report goes out in few syscalls
+REPORT_WRITE_BUFFER = 1 << 20
+
 
 class ReportGenerator:
     """Report Generator"""
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def _format_table_to_markdown(table_content: str) -> str:
         """
-        Convert table content string (Python list representation) to Markdown table
+        Convert table content string (Python list representation) to Markdown table.
+        Results are cached, since reports over overlapping papers format the same tables.
 
         Args:
             table_content: String representation of table data, e.g., "[['h1', 'h2'], ['r1c1', 'r1c2']]"
@@ -29,35 +72,32 @@ class ReportGenerator:
         Returns:
             Markdown formatted table string
         """
+        # Only a list literal can become a table: skip the parser for anything else
+        if table_content.lstrip()[:1] != '[':
+            return f"```\n{table_content}\n```"
+
         try:
             # Try to parse as Python literal
-            import ast
             table_data = ast.literal_eval(table_content)
 
-            if not isinstance(table_data, list) or not table_data:
+            if not isinstance(table_data, list) or not table_data or not isinstance(table_data[0], list):
                 return f"```\n{table_content}\n```"
 
-            # Convert to markdown table
-            markdown_lines = []
-
-            # Header row
-            if len(table_data) > 0 and isinstance(table_data[0], list):
-                header = table_data[0]
-                # Clean and format header cells
-                header_cells = [str(cell).replace('\n', ' ').strip() for cell in header]
-                markdown_lines.append('| ' + ' | '.join(header_cells) + ' |')
-                markdown_lines.append('| ' + ' | '.join(['---'] * len(header_cells)) + ' |')
+            # Header row, with cells flattened onto one line
+            header_cells = [str(cell).replace('\n', ' ').strip() for cell in table_data[0]]
+            width = len(header_cells)
+            blanks = [''] * width
 
-                # Data rows
-                for row in table_data[1:]:
-                    if isinstance(row, list):
-                        row_cells = [str(cell).replace('\n', ' ').strip() for cell in row]
-                        # Pad row to match header length
-                        while len(row_cells) < len(header_cells):
-                            row_cells.append('')
-                        markdown_lines.append('| ' + ' | '.join(row_cells[:len(header_cells)]) + ' |')
+            def row_line(cells: List[str]) -> str:
+                return '| ' + ' | '.join(cells) + ' |'
 
-            return '\n'.join(markdown_lines) if markdown_lines else f"```\n{table_content}\n```"
+            # Data rows are cut or padded to the header width, in one pass per row
+            data_lines = (
+                row_line([str(cell).replace('\n', ' ').strip() for cell in row[:width]] + blanks[len(row):])
+                for row in table_data[1:]
+                if isinstance(row, list)
+            )
+            return '\n'.join(chain((row_line(header_cells), row_line(['---'] * width)), data_lines))
 
         except (ValueError, SyntaxError):
             # If parsing fails, return as code block
@@ -143,16 +183,32 @@ class ReportGenerator:
         }
     }
 
+    # Rendered report bodies kept for regenerating a report from the same analyses
+    RENDER_CACHE_SIZE = 8
+
     def __init__(self, config: Optional[Config] = None):
         self.config = config or get_config()
         self.report_config = self.config.report_generator
-        self.llm_helper = LLMHelper(self.config)
+        self._llm_helper: Optional[LLMHelper] = None
 
         # Determine language and get corresponding templates
         self.language = self.report_config.language.lower()
         if self.language not in ["chinese", "english"]:
             self.language = "english"
         self.t = self.TEMPLATES[self.language]
+        # Section headings and field labels are fixed per language, so build them once
+        self._headings = {key: f"## {text}\n\n" for key, text in self.t.items()}
+        self._labels = {key: f"**{text}:**" for key, text in self.t.items()}
+        self._markdown = None  # markdown.Markdown converter, built on first HTML report
+        # Rendered report bodies, keyed by (report_type, paper ids, knowledge id)
+        self._render_cache: "OrderedDict[Tuple[str, Tuple[int, ...], int], Tuple]" = OrderedDict()
+
+    @property
+    def llm_helper(self) -> LLMHelper:
+        """LLM helper, created on first use: rendering and saving reports make no LLM calls"""
+        if self._llm_helper is None:
+            self._llm_helper = LLMHelper(self.config)
+        return self._llm_helper
 
     def generate(
         self,
@@ -183,7 +239,7 @@ class ReportGenerator:
     def _generate_single_report(self, paper: PaperAnalysis, title: Optional[str] = None) -> Report:
         """Generate single paper reading notes"""
         report_title = title or f"Reading Notes: {paper.title}"
-        content = self._render_single_template(paper)
+        content = self._render_cached("single", [paper], None)
 
         return Report(
             report_type="single",
@@ -200,7 +256,7 @@ class ReportGenerator:
     ) -> Report:
         """Generate comparison report for multiple papers"""
         report_title = title or f"Paper Comparison Analysis ({len(papers)} papers)"
-        content = self._render_comparison_template(papers, knowledge)
+        content = self._render_cached("comparison", papers, knowledge)
 
         return Report(
             report_type="comparison",
@@ -217,7 +273,7 @@ class ReportGenerator:
     ) -> Report:
         """Generate technology trend analysis report"""
         report_title = title or f"Technology Trend Analysis ({len(papers)} papers)"
-        content = self._render_trend_template(papers, knowledge)
+        content = self._render_cached("trend", papers, knowledge)
 
         return Report(
             report_type="trend",
@@ -226,102 +282,151 @@ class ReportGenerator:
             papers=[p.title for p in papers],
         )
 
+    def _render_cached(
+        self,
+        report_type: str,
+        papers: List[PaperAnalysis],
+        knowledge: Optional[AggregatedKnowledge]
+    ) -> str:
+        """Render a report body, reusing the last renders of the same analysis objects
+
+        Entries are keyed by object identity, so analyses must not be modified
+        in place after they have been rendered.
+        """
+        key = (report_type, tuple(map(id, papers)), id(knowledge))
+        cached = self._render_cache.get(key)
+        if cached is not None:
+            self._render_cache.move_to_end(key)
+            return cached[-1]
+
+        if report_type == "single":
+            content = self._render_single_template(papers[0])
+        elif report_type == "comparison":
+            content = self._render_comparison_template(papers, knowledge)
+        else:
+            content = self._render_trend_template(papers, knowledge)
+
+        # Hold the rendered objects so their ids cannot be reused by new ones
+        self._render_cache[key] = (tuple(papers), knowledge, content)
+        while len(self._render_cache) > self.RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return content
+
+    @staticmethod
+    def _write_bullets(write, heading: str, items: List[str]) -> None:
+        """Write a section of bullet points, or nothing if there are no items"""
+        if items:
+            write(heading)
+            for item in items:
+                write(f"- {item}\n")
+            write("\n")
+
+    @staticmethod
+    def _write_model_info(write, tech: TechnologyAnalysis, line_end: str) -> None:
+        """Write the model type and application scenario lines, then a blank line, if either is set"""
+        model_type, scenarios = tech.model_type, tech.application_scenarios
+        if not (model_type or scenarios):
+            return
+        if model_type:
+            write(f"**Model Type:** {model_type}{line_end}")
+        if scenarios:
+            write(f"**Application Scenarios:** {', '.join(scenarios)}{line_end}")
+        write("\n")
+
     def _render_single_template(self, paper: PaperAnalysis) -> str:
         """Render single paper template"""
-        sections = []
-        t = self.t  # Template text
+        buf = io.StringIO()
+        write = buf.write
+        heading, label = self._headings, self._labels
 
         # Title and basic info
-        sections.append(f"# {paper.title}\n")
+        write(f"# {paper.title}\n\n")
 
         if paper.authors:
-            sections.append(f"**{t['authors']}:** {', '.join(paper.authors)}\n")
+            write(label['authors'] + " " + paper.authors_text + "\n\n")
 
         if paper.keywords:
-            sections.append(f"**{t['keywords']}:** {', '.join(paper.keywords)}\n")
+            write(label['keywords'] + " " + paper.keywords_text + "\n\n")
 
-        sections.append("")
+        write("\n")
 
         # Summary
-        sections.append(f"## {t['summary']}\n")
-        sections.append(paper.summary or paper.paper.abstract)
-        sections.append("")
+        write(heading['summary'])
+        write(paper.summary or paper.paper.abstract)
+        write("\n\n")
 
         # Research Background
         if paper.background:
-            sections.append(f"## {t['research_background']}\n")
+            write(heading['research_background'])
             if paper.background.research_field:
-                sections.append(f"**{t['research_field']}:** {paper.background.research_field}\n")
+                write(label['research_field'] + " " + paper.background.research_field + "\n\n")
             if paper.background.problem_definition:
-                sections.append(f"**{t['problem']}:** {paper.background.problem_definition}\n")
+                write(label['problem'] + " " + paper.background.problem_definition + "\n\n")
             if paper.background.motivation:
-                sections.append(f"**{t['motivation']}:** {paper.background.motivation}\n")
+                write(label['motivation'] + " " + paper.background.motivation + "\n\n")
             if paper.background.existing_limitations:
-                sections.append(f"**{t['existing_limitations']}:** {paper.background.existing_limitations}\n")
-            sections.append("")
+                write(label['existing_limitations'] + " " + paper.background.existing_limitations + "\n\n")
+            write("\n")
 
         # Technical Method
-        if paper.technology:
-            sections.append(f"## {t['technical_method']}\n")
+        tech = paper.technology
+        if tech:
+            write(heading['technical_method'])
 
             # Model type and application scenarios (prominent display)
-            if hasattr(paper.technology, 'model_type') and paper.technology.model_type:
-                sections.append(f"**Model Type:** {paper.technology.model_type}\n")
-            if hasattr(paper.technology, 'application_scenarios') and paper.technology.application_scenarios:
-                sections.append(f"**Application Scenarios:** {', '.join(paper.technology.application_scenarios)}\n")
-            if paper.technology.model_type or (hasattr(paper.technology, 'application_scenarios') and paper.technology.application_scenarios):
-                sections.append("")
-
-            if paper.technology.method_overview:
-                sections.append(f"**{t['method_overview']}:** {paper.technology.method_overview}\n")
-            if paper.technology.innovations:
-                sections.append(f"**{t['innovations']}:**")
-                for i, inn in enumerate(paper.technology.innovations, 1):
-                    sections.append(f"  {i}. {inn}")
-                sections.append("")
-            if paper.technology.key_designs:
-                sections.append(f"**{t['key_designs']}:**")
-                for i, design in enumerate(paper.technology.key_designs, 1):
-                    sections.append(f"  {i}. {design}")
-                sections.append("")
-            if paper.technology.architecture:
-                sections.append(f"**{t['architecture']}:** {paper.technology.architecture}\n")
-            sections.append("")
+            self._write_model_info(write, tech, "\n\n")
+
+            if tech.method_overview:
+                write(label['method_overview'] + " " + tech.method_overview + "\n\n")
+            if tech.innovations:
+                write(label['innovations'] + "\n")
+                for i, inn in enumerate(tech.innovations, 1):
+                    write(f"  {i}. {inn}\n")
+                write("\n")
+            if tech.key_designs:
+                write(label['key_designs'] + "\n")
+                for i, design in enumerate(tech.key_designs, 1):
+                    write(f"  {i}. {design}\n")
+                write("\n")
+            if tech.architecture:
+                write(label['architecture'] + " " + tech.architecture + "\n\n")
+            write("\n")
 
         # Experimental Analysis
         if paper.experiment:
-            sections.append(f"## {t['experiments']}\n")
+            write(heading['experiments'])
             if paper.experiment.datasets:
-                sections.append(f"**{t['datasets']}:** {', '.join(paper.experiment.datasets)}\n")
+                write(label['datasets'] + " " + ', '.join(paper.experiment.datasets) + "\n\n")
             if paper.experiment.metrics:
-                sections.append(f"**{t['metrics']}:** {', '.join(paper.experiment.metrics)}\n")
+                write(label['metrics'] + " " + ', '.join(paper.experiment.metrics) + "\n\n")
             if paper.experiment.baselines:
-                sections.append(f"**{t['baselines']}:** {', '.join(paper.experiment.baselines)}\n")
+                write(label['baselines'] + " " + ', '.join(paper.experiment.baselines) + "\n\n")
             if paper.experiment.setup:
-                sections.append(f"**{t['setup']}:** {paper.experiment.setup}\n")
+                write(label['setup'] + " " + paper.experiment.setup + "\n\n")
             if paper.experiment.ablation_studies:
-                sections.append(f"**{t['ablation_studies']}:** {paper.experiment.ablation_studies}\n")
-            sections.append("")
+                write(label['ablation_studies'] + " " + paper.experiment.ablation_studies + "\n\n")
+            write("\n")
 
         # Results
         if paper.result:
-            sections.append(f"## {t['results']}\n")
+            write(heading['results'])
             if paper.result.main_results:
-                sections.append(f"**{t['main_results']}:** {paper.result.main_results}\n")
+                write(label['main_results'] + " " + paper.result.main_results + "\n\n")
             if paper.result.performance_improvements:
-                sections.append(f"**{t['performance_improvements']}:** {paper.result.performance_improvements}\n")
+                write(label['performance_improvements'] + " " + paper.result.performance_improvements + "\n\n")
             if paper.result.key_findings:
-                sections.append(f"**{t['key_findings']}:**")
+                write(label['key_findings'] + "\n")
                 for i, finding in enumerate(paper.result.key_findings, 1):
-                    sections.append(f"  {i}. {finding}")
-                sections.append("")
+                    write(f"  {i}. {finding}\n")
+                write("\n")
             if paper.result.limitations:
-                sections.append(f"**{t['limitations']}:** {paper.result.limitations}\n")
+                write(label['limitations'] + " " + paper.result.limitations + "\n\n")
             if paper.result.future_work:
-                sections.append(f"**{t['future_work']}:** {paper.result.future_work}\n")
-            sections.append("")
+                write(label['future_work'] + " " + paper.result.future_work + "\n\n")
+            write("\n")
 
-        return "\n".join(sections)
+        # Drop the newline after the last line, as the old "\n".join() did
+        return buf.getvalue()[:-1]
 
     def _render_comparison_template(
         self,
@@ -329,71 +434,60 @@ class ReportGenerator:
         knowledge: Optional[AggregatedKnowledge]
     ) -> str:
         """Render comparison template"""
-        sections = []
-        t = self.t  # Template text
+        buf = io.StringIO()
+        write = buf.write
+        heading = self._headings
+        if knowledge is None:
+            knowledge = _NO_KNOWLEDGE
 
         # Title
         title_text = "论文对比分析" if self.language == "chinese" else "Paper Comparison Analysis"
-        sections.append(f"# {title_text}\n")
+        write(f"# {title_text}\n\n")
 
         # Paper list
-        sections.append(f"## {t['papers_analyzed']}\n")
+        write(heading['papers_analyzed'])
+        author_label = "作者" if self.language == "chinese" else "Authors"
         for i, paper in enumerate(papers, 1):
-            sections.append(f"{i}. **{paper.title}**")
+            write(f"{i}. **{paper.title}**\n")
             if paper.authors:
-                author_label = "作者" if self.language == "chinese" else "Authors"
-                sections.append(f"   - {author_label}: {', '.join(paper.authors)}")
-        sections.append("")
+                write(f"   - {author_label}: {paper.authors_text}\n")
+        write("\n")
 
         # Overall summary
-        if knowledge and knowledge.overall_summary:
-            sections.append(f"## {t['overall_summary']}\n")
-            sections.append(knowledge.overall_summary)
-            sections.append("")
+        if knowledge.overall_summary:
+            write(heading['overall_summary'])
+            write(knowledge.overall_summary)
+            write("\n\n")
 
         # Comparison matrix
-        if knowledge and knowledge.comparison_matrix:
-            sections.append(f"## {t['comparison_matrix']}\n")
+        if knowledge.comparison_matrix:
+            write(heading['comparison_matrix'])
+            table_header = f"| {self.t['paper']} | {self.t['description']} |\n|-------|-------------|\n"
             for item in knowledge.comparison_matrix:
-                sections.append(f"### {item.dimension}\n")
-                sections.append(f"| {t['paper']} | {t['description']} |")
-                sections.append("|-------|-------------|")
+                write(f"### {item.dimension}\n\n")
+                write(table_header)
                 for paper_title, value in item.papers.items():
-                    sections.append(f"| {paper_title} | {value} |")
-                sections.append("")
+                    write(f"| {paper_title} | {value} |\n")
+                write("\n")
 
         # Common themes and differences
-        if knowledge:
-            if knowledge.common_themes:
-                sections.append(f"## {t['common_themes']}\n")
-                for theme in knowledge.common_themes:
-                    sections.append(f"- {theme}")
-                sections.append("")
-
-            if knowledge.key_differences:
-                sections.append(f"## {t['key_differences']}\n")
-                for diff in knowledge.key_differences:
-                    sections.append(f"- {diff}")
-                sections.append("")
+        self._write_bullets(write, heading['common_themes'], knowledge.common_themes)
+        self._write_bullets(write, heading['key_differences'], knowledge.key_differences)
 
         # Individual paper summaries
-        sections.append(f"## {t['individual_paper_summaries']}\n")
+        write(heading['individual_paper_summaries'])
         for paper in papers:
-            sections.append(f"### {paper.title}\n")
+            write(f"### {paper.title}\n\n")
 
             # Display model type and application scenarios prominently
             if paper.technology:
-                if hasattr(paper.technology, 'model_type') and paper.technology.model_type:
-                    sections.append(f"**Model Type:** {paper.technology.model_type}  ")
-                if hasattr(paper.technology, 'application_scenarios') and paper.technology.application_scenarios:
-                    sections.append(f"**Application Scenarios:** {', '.join(paper.technology.application_scenarios)}  ")
-                if paper.technology.model_type or (hasattr(paper.technology, 'application_scenarios') and paper.technology.application_scenarios):
-                    sections.append("")
+                self._write_model_info(write, paper.technology, "  \n")
 
-            sections.append(paper.summary or paper.paper.abstract[:500] + "...")
-            sections.append("")
+            write(paper.summary or paper.paper.abstract[:500] + "...")
+            write("\n\n")
 
-        return "\n".join(sections)
+        # Drop the newline after the last line, as the old "\n".join() did
+        return buf.getvalue()[:-1]
 
     def _render_trend_template(
         self,
@@ -401,61 +495,55 @@ class ReportGenerator:
         knowledge: Optional[AggregatedKnowledge]
     ) -> str:
         """Render trend analysis template"""
-        sections = []
-        t = self.t  # Template text
+        buf = io.StringIO()
+        write = buf.write
+        heading, label = self._headings, self._labels
+        if knowledge is None:
+            knowledge = _NO_KNOWLEDGE
 
         # Title
         title_text = "技术趋势分析" if self.language == "chinese" else "Technology Trend Analysis"
-        sections.append(f"# {title_text}\n")
+        write(f"# {title_text}\n\n")
 
         # Paper list
-        sections.append(f"## {t['papers_analyzed']}\n")
+        write(heading['papers_analyzed'])
         for i, paper in enumerate(papers, 1):
-            sections.append(f"{i}. {paper.title}")
-        sections.append("")
+            write(f"{i}. {paper.title}\n")
+        write("\n")
 
         # Overall summary
-        if knowledge and knowledge.overall_summary:
-            sections.append(f"## {t['overall_summary']}\n")
-            sections.append(knowledge.overall_summary)
-            sections.append("")
+        if knowledge.overall_summary:
+            write(heading['overall_summary'])
+            write(knowledge.overall_summary)
+            write("\n\n")
 
         # Timeline
-        if knowledge and knowledge.timeline:
-            sections.append(f"## {t['technology_timeline']}\n")
+        if knowledge.timeline:
+            write(heading['technology_timeline'])
             for item in knowledge.timeline:
                 date_str = f"({item.date})" if item.date else ""
-                sections.append(f"**{item.order}. {item.paper_title}** {date_str}")
-                sections.append(f"   - {item.key_contribution}")
-                sections.append("")
+                write(f"**{item.order}. {item.paper_title}** {date_str}\n")
+                write(f"   - {item.key_contribution}\n")
+                write("\n")
 
         # Trends
-        if knowledge and knowledge.trends:
-            sections.append(f"## {t['identified_trends']}\n")
+        if knowledge.trends:
+            write(heading['identified_trends'])
             for trend in knowledge.trends:
-                sections.append(f"### {trend.trend_name}\n")
-                sections.append(f"{trend.description}\n")
+                write(f"### {trend.trend_name}\n\n")
+                write(f"{trend.description}\n\n")
                 if trend.evidence:
-                    sections.append(f"**{t['evidence']}:**")
+                    write(label['evidence'] + "\n")
                     for ev in trend.evidence:
-                        sections.append(f"- {ev}")
-                sections.append("")
+                        write(f"- {ev}\n")
+                write("\n")
 
-        # Common themes
-        if knowledge and knowledge.common_themes:
-            sections.append(f"## {t['common_themes']}\n")
-            for theme in knowledge.common_themes:
-                sections.append(f"- {theme}")
-            sections.append("")
+        # Common themes and key differences
+        self._write_bullets(write, heading['common_themes'], knowledge.common_themes)
+        self._write_bullets(write, heading['key_differences'], knowledge.key_differences)
 
-        # Key differences
-        if knowledge and knowledge.key_differences:
-            sections.append(f"## {t['key_differences']}\n")
-            for diff in knowledge.key_differences:
-                sections.append(f"- {diff}")
-            sections.append("")
-
-        return "\n".join(sections)
+        # Drop the newline after the last line, as the old "\n".join() did
+        return buf.getvalue()[:-1]
 
     def save_report(self, report: Report, output_path: str, papers: Optional[List[PaperAnalysis]] = None) -> str:
         """Save report to file and extract resources
@@ -476,7 +564,8 @@ class ReportGenerator:
 
         # Save resources if papers provided and format is markdown
         if papers and output_format == "markdown":
-            resource_mgr = ResourceManager(output_path)
+            parallel = self.config.parallel
+            resource_mgr = ResourceManager(output_path, max_workers=parallel.max_workers if parallel.enabled else 1)
             # Extract PaperContent from PaperAnalysis
             paper_contents = [p.paper for p in papers]
             resources = resource_mgr.save_resources(paper_contents)
@@ -500,7 +589,7 @@ class ReportGenerator:
         else:  # markdown
             content = report.content
 
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with open(output_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
             f.write(content)
 
         return output_path
@@ -508,39 +597,26 @@ class ReportGenerator:
     def _convert_to_html(self, report: Report) -> str:
         """Convert report to HTML format"""
         try:
-            import markdown
-            html_content = markdown.markdown(report.content, extensions=['tables', 'fenced_code'])
+            if self._markdown is None:
+                import markdown
+                # Building the converter registers extensions and compiles their patterns,
+                # so keep one per generator and reset it between reports
+                self._markdown = markdown.Markdown(extensions=['tables', 'fenced_code'])
+            html_content = self._markdown.reset().convert(report.content)
         except ImportError:
             # Simple fallback conversion
             html_content = f"<pre>{report.content}</pre>"
 
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{report.title}</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 900px; margin: 0 auto; padding: 20px; line-height: 1.6; }}
-        h1 {{ color: #333; border-bottom: 2px solid #333; padding-bottom: 10px; }}
-        h2 {{ color: #444; margin-top: 30px; }}
-        h3 {{ color: #555; }}
-        table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-        th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-        th {{ background-color: #f5f5f5; }}
-        code {{ background-color: #f4f4f4; padding: 2px 6px; border-radius: 3px; }}
-        pre {{ background-color: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }}
-        blockquote {{ border-left: 4px solid #ddd; margin: 0; padding-left: 20px; color: #666; }}
-    </style>
-</head>
-<body>
-{html_content}
-<footer>
-    <p><small>Generated at: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}</small></p>
-</footer>
-</body>
-</html>"""
+        return _HTML_TEMPLATE.substitute(
+            title=report.title,
+            body=html_content,
+            generated_at=report.generated_at.isoformat(sep=' ', timespec='seconds'),
+        )
 
-        return html
+    @staticmethod
+    def _index_resources(items: List[Dict]) -> Dict[int, Dict]:
+        """Map saved resource dicts by their 'index', keeping the first of any duplicates"""
+        return {item['index']: item for item in reversed(items)}
 
     def _add_resource_references(self, content: str, papers: List[PaperAnalysis],
                                    resources: Dict[str, Dict], resource_mgr: ResourceManager) -> str:
@@ -556,69 +632,62 @@ class ReportGenerator:
         Returns:
             Modified report content with resource references
         """
-        # First check if any paper has resources
-        has_any_resources = False
-        for paper in papers:
-            if paper.key_figures or paper.key_tables or paper.key_equations:
-                has_any_resources = True
-                break
+        # Only papers with key resources get a subsection
+        papers = [paper for paper in papers if paper.has_key_resources]
 
         # If no resources at all, don't add the section
-        if not has_any_resources:
+        if not papers:
             return content
 
         # Add a resources section at the end
-        resources_section = "\n\n---\n\n## Key Resources\n\n"
+        parts = [content, "\n\n---\n\n## Key Resources\n\n"]
 
         for paper in papers:
             paper_res = resources.get(paper.title, {})
-
-            if not (paper.key_figures or paper.key_tables or paper.key_equations):
-                continue
-
-            resources_section += f"### {paper.title}\n\n"
+            parts.append(f"### {paper.title}\n\n")
 
             # Add key figures
             if paper.key_figures and paper_res.get('figures'):
-                resources_section += "#### Key Figures\n\n"
+                parts.append("#### Key Figures\n\n")
+                figures_by_index = self._index_resources(paper_res['figures'])
                 for fig_idx in paper.key_figures:
                     # Find the corresponding saved figure
-                    for fig_info in paper_res['figures']:
-                        if fig_info['index'] == fig_idx:
-                            resources_section += f"**{fig_info['caption']}**\n\n"
-                            resources_section += f"![{fig_info['caption']}]({fig_info['path']})\n\n"
-                            break
+                    fig_info = figures_by_index.get(fig_idx)
+                    if fig_info:
+                        caption = fig_info['caption']
+                        parts.append(f"**{caption}**\n\n![{caption}]({fig_info['path']})\n\n")
 
             # Add key tables
             if paper.key_tables and paper_res.get('tables'):
-                resources_section += "#### Key Tables\n\n"
+                parts.append("#### Key Tables\n\n")
+                tables_by_index = self._index_resources(paper_res['tables'])
                 for table_idx in paper.key_tables:
-                    for table_info in paper_res['tables']:
-                        if table_info['index'] == table_idx:
-                            caption = table_info.get('caption', f"Table {table_idx}")
-                            resources_section += f"**{caption}**\n\n"
-
-                            # Check if table is saved as image
-                            if table_info.get('is_image', False):
-                                # Display as image
-                                resources_section += f"![{caption}]({table_info['path']})\n\n"
-                            else:
-                                # Format table as Markdown
-                                table_content = table_info['content']
-                                formatted_table = self._format_table_to_markdown(table_content)
-                                resources_section += f"{formatted_table}\n\n"
-                            break
+                    table_info = tables_by_index.get(table_idx)
+                    if table_info:
+                        caption = table_info.get('caption', f"Table {table_idx}")
+                        parts.append(f"**{caption}**\n\n")
+
+                        # Check if table is saved as image
+                        if table_info.get('is_image', False):
+                            # Display as image
+                            parts.append(f"![{caption}]({table_info['path']})\n\n")
+                        else:
+                            # Format table as Markdown
+                            table_content = table_info['content']
+                            formatted_table = self._format_table_to_markdown(table_content)
+                            parts.append(f"{formatted_table}\n\n")
 
             # Add key equations
             if paper.key_equations and paper_res.get('equations'):
-                resources_section += "#### Key Equations\n\n"
+                parts.append("#### Key Equations\n\n")
+                equations_by_index = self._index_resources(paper_res['equations'])
                 for eq_idx in paper.key_equations:
-                    for eq_info in paper_res['equations']:
-                        if eq_info['index'] == eq_idx:
-                            resources_section += f"{eq_info['latex']}\n\n"
-                            break
+                    eq_info = equations_by_index.get(eq_idx)
+                    if eq_info:
+                        parts.append(f"{eq_info['latex']}\n\n")
 
-        return content + resources_section
+        # Join once rather than growing one string per line
+        return "".join(parts)
 
 
 def generate_report(
@@ -642,3 +711,38 @@ def save_report(
     """Convenience function: Save report to file"""
     generator = ReportGenerator(config)
     return generator.save_report(report, output_path, papers)
+
+
+def save_reports(
+    reports: List[Tuple[Report, str, Optional[List[PaperAnalysis]]]],
+    config: Optional[Config] = None
+) -> List[str]:
+    """
+    Convenience function: Save a batch of reports to file
+
+    Reports are written concurrently (at most parallel.max_workers at a time,
+    or one at a time when parallel is disabled), so their file writes and
+    resource extraction overlap. Each worker thread uses its own generator,
+    since the Markdown converter is not thread-safe.
+
+    Args:
+        reports: (report, output_path, papers) tuples, as for save_report
+
+    Returns:
+        Paths to the saved reports, in input order
+    """
+    config = config or get_config()
+    max_workers = config.parallel.max_workers if config.parallel.enabled else 1
+    local = threading.local()
+
+    def save(item: Tuple[Report, str, Optional[List[PaperAnalysis]]]) -> str:
+        if not hasattr(local, "generator"):
+            local.generator = ReportGenerator(config)
+        report, output_path, papers = item
+        return local.generator.save_report(report, output_path, papers)
+
+    if max_workers <= 1 or len(reports) <= 1:
+        return [save(item) for item in reports]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(reports))) as executor:
+        return list(executor.map(save, reports))
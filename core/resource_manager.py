@@ -2,23 +2,90 @@
 Resource Manager Module
 Responsible for saving figures, tables, and equations as assets
 """
+import io
 import os
+import logging
+import re
 import base64
+import hashlib
 from pathlib import Path
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 
 from .models import PaperContent, Figure, Table, Equation
 
+logger = logging.getLogger(__name__)
+
+# Characters dropped from filenames: anything but letters, digits, '_' and '-'
+# (\w matches exactly the str.isalnum() characters plus '_')
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w-]')
+# The same unsafe characters as bytes, for deleting them from ASCII names in one C pass
+_UNSAFE_ASCII_BYTES = bytes(
+    c for c in range(128) if not (chr(c).isalnum() or chr(c) in '_-')
+)
+
+# Equation text that is already LaTeX: starts with '$' or contains a backslash
+_LATEX_RE = re.compile(r'^\s*\$|\\')
+
+
+# Flags for asset files: created or truncated, binary on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _remove_existing(filepath: str) -> None:
+    """Remove a file if it exists (an asset may be a hard link that must not be written through)"""
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+
+def _write_bytes(filepath: str, data: bytes) -> None:
+    """Write data to a file through a raw descriptor, with no file object or buffer in between"""
+    # Replace rather than truncate, so other names linked to the old file keep their bytes
+    _remove_existing(filepath)
+    fd = os.open(filepath, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]  # os.write may write less than asked
+    finally:
+        os.close(fd)
+
+
+def _link_or_write(filepath: str, data: bytes, source: str) -> None:
+    """Hard-link filepath to source, an asset with the same bytes, or write data if linking fails"""
+    if filepath == source:
+        return
+    try:
+        _remove_existing(filepath)
+        os.link(source, filepath)
+    except OSError:
+        # No hard links on this filesystem, or the source is gone
+        _write_bytes(filepath, data)
+
+
+@lru_cache(maxsize=256)
+def _sanitize_filename(name: str) -> str:
+    """Filename-safe form of name, cached since every asset of a paper uses its title"""
+    name = name.lower().replace(' ', '_')
+    if name.isascii():
+        return name.encode('ascii').translate(None, _UNSAFE_ASCII_BYTES).decode('ascii')[:50]
+    return _UNSAFE_FILENAME_RE.sub('', name)[:50]
+
 
 class ResourceManager:
     """Manage resources (figures, tables, equations) for reports"""
 
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, max_workers: int = 1):
         """
         Initialize resource manager
 
         Args:
             output_path: Path to the output report file
+            max_workers: Threads writing asset files in save_resources (1 writes them in turn)
         """
         self.output_path = output_path
         self.output_dir = os.path.dirname(output_path) or "."
@@ -27,12 +94,23 @@ class ResourceManager:
         # Create assets directory
         self.assets_dir = os.path.join(self.output_dir, f"{self.report_name}_assets")
         os.makedirs(self.assets_dir, exist_ok=True)
+        # Path prefixes for asset files (absolute, and relative to the report), joined once
+        self._assets_dir_prefix = os.path.join(self.assets_dir, "")
+        self._assets_rel_prefix = os.path.join(f"{self.report_name}_assets", "")
 
         # Track saved resources
         self.saved_figures: Dict[str, str] = {}  # figure_id -> relative_path
         self.saved_tables: Dict[str, str] = {}   # table_id -> relative_path
         self.saved_equations: Dict[str, str] = {}  # equation_id -> latex_text
 
+        self.max_workers = max_workers
+        # While save_resources() runs, asset files are queued here and written together
+        self._pending_writes: Optional[List[Tuple[str, bytes]]] = None
+        # Written asset file by SHA-256 of its bytes; repeated content (a logo on every
+        # page, the same chart twice) is hard-linked to it instead of written again
+        self._paths_by_digest: Dict[bytes, str] = {}
+        self._digests_by_path: Dict[str, bytes] = {}
+
     def save_figure(self, figure: Figure, paper_title: str, fig_index: int) -> Optional[str]:
         """
         Save figure image to assets directory
@@ -45,21 +123,21 @@ class ResourceManager:
         Returns:
             Relative path to saved image, or None if no image data
         """
-        if not figure.image_data:
+        image_data = figure.load_image()
+        if not image_data:
             return None
 
         # Generate safe filename
         safe_title = self._sanitize_filename(paper_title)
         filename = f"fig_{safe_title}_{fig_index}.png"
-        filepath = os.path.join(self.assets_dir, filename)
+        filepath = self._assets_dir_prefix + filename
 
         # Save image
         try:
-            with open(filepath, 'wb') as f:
-                f.write(figure.image_data)
+            self._write_file(filepath, image_data)
 
             # Generate relative path for markdown
-            relative_path = os.path.join(f"{self.report_name}_assets", filename)
+            relative_path = self._assets_rel_prefix + filename
 
             # Store mapping
             figure_id = f"{safe_title}_fig_{fig_index}"
@@ -68,7 +146,7 @@ class ResourceManager:
             return relative_path
 
         except Exception as e:
-            print(f"Failed to save figure {filename}: {e}")
+            logger.warning(f"Failed to save figure {filename}: {e}")
             return None
 
     def save_table(self, table: Table, paper_title: str, table_index: int) -> str:
@@ -87,49 +165,146 @@ class ResourceManager:
         safe_title = self._sanitize_filename(paper_title)
 
         # If table has image data (screenshot), save as PNG
-        if table.image_data:
+        image_data = table.load_image()
+        if image_data:
             filename = f"table_{safe_title}_{table_index}.png"
-            filepath = os.path.join(self.assets_dir, filename)
+            filepath = self._assets_dir_prefix + filename
 
             try:
-                with open(filepath, 'wb') as f:
-                    f.write(table.image_data)
+                self._write_file(filepath, image_data)
 
-                relative_path = os.path.join(f"{self.report_name}_assets", filename)
+                relative_path = self._assets_rel_prefix + filename
                 table_id = f"{safe_title}_table_{table_index}"
                 self.saved_tables[table_id] = relative_path
 
                 return relative_path
 
             except Exception as e:
-                print(f"Failed to save table image {filename}: {e}")
+                logger.warning(f"Failed to save table image {filename}: {e}")
                 return ""
 
         # Otherwise save as markdown
         filename = f"table_{safe_title}_{table_index}.md"
-        filepath = os.path.join(self.assets_dir, filename)
+        filepath = self._assets_dir_prefix + filename
 
         # Format table content
-        table_content = f"## Table {table_index}\n\n"
-        if table.caption:
-            table_content += f"**Caption:** {table.caption}\n\n"
-        table_content += f"```\n{table.content}\n```\n"
+        caption = f"**Caption:** {table.caption}\n\n" if table.caption else ""
+        table_content = f"## Table {table_index}\n\n{caption}```\n{table.content}\n```\n"
 
         # Save to file
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(table_content)
+            self._write_file(filepath, table_content.encode('utf-8'))
 
-            relative_path = os.path.join(f"{self.report_name}_assets", filename)
+            relative_path = self._assets_rel_prefix + filename
             table_id = f"{safe_title}_table_{table_index}"
             self.saved_tables[table_id] = relative_path
 
             return relative_path
 
         except Exception as e:
-            print(f"Failed to save table {filename}: {e}")
+            logger.warning(f"Failed to save table {filename}: {e}")
             return ""
 
+    def _write_file(self, filepath: str, data: bytes) -> None:
+        """Write an asset file now, or queue it while save_resources() is batching writes"""
+        if self._pending_writes is not None:
+            self._pending_writes.append((filepath, data))
+            return
+        digest = hashlib.sha256(data).digest()
+        source = self._paths_by_digest.get(digest)
+        try:
+            if source is None:
+                _write_bytes(filepath, data)
+            else:
+                _link_or_write(filepath, data, source)
+        except Exception:
+            self._forget_asset(filepath)
+            raise
+        self._remember_asset(filepath, digest)
+
+    def _remember_asset(self, filepath: str, digest: bytes) -> None:
+        """Record the digest of the bytes now at filepath, forgetting what was there before"""
+        previous = self._digests_by_path.get(filepath)
+        if previous is not None and self._paths_by_digest.get(previous) == filepath:
+            del self._paths_by_digest[previous]
+        self._digests_by_path[filepath] = digest
+        self._paths_by_digest.setdefault(digest, filepath)
+
+    def _forget_asset(self, filepath: str) -> None:
+        """Drop filepath from the written assets, after a failed write"""
+        digest = self._digests_by_path.pop(filepath, None)
+        if digest is not None and self._paths_by_digest.get(digest) == filepath:
+            del self._paths_by_digest[digest]
+
+    def flush_writes(self) -> List[str]:
+        """
+        Write the queued asset files, several at a time when max_workers > 1
+
+        Files with the same bytes as one written earlier are hard-linked to it
+        once the distinct files are on disk.
+
+        Returns:
+            Paths of the files that could not be written
+        """
+        pending, self._pending_writes = self._pending_writes or [], None
+
+        # Only the last write queued for a path is kept; earlier ones would race it on the pool
+        final = {}
+        for filepath, data in pending:
+            final[filepath] = (data, hashlib.sha256(data).digest())
+
+        # Plan the batch before touching the bookkeeping: a digest is linked to a file
+        # from an earlier batch only if this batch leaves that file alone, otherwise
+        # the first path in the batch with that digest is written and the rest linked
+        sources, unique, duplicates = {}, [], []
+        for filepath, (data, digest) in final.items():
+            source = sources.get(digest)
+            if source is None:
+                existing = self._paths_by_digest.get(digest)
+                source = existing if existing is not None and existing not in final else filepath
+                sources[digest] = source
+            if source == filepath:
+                unique.append((filepath, data))
+            else:
+                duplicates.append((filepath, data, source))
+
+        for filepath, (_, digest) in final.items():
+            self._remember_asset(filepath, digest)
+        # Remembering a path drops the mapping of the digest it held before, which
+        # another path in this batch may now hold
+        for digest, source in sources.items():
+            self._paths_by_digest.setdefault(digest, source)
+
+        def write(item: Tuple[str, bytes]) -> Optional[str]:
+            filepath, data = item
+            try:
+                _write_bytes(filepath, data)
+                return None
+            except Exception as e:
+                logger.warning(f"Failed to save {os.path.basename(filepath)}: {e}")
+                return filepath
+
+        if self.max_workers > 1 and len(unique) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as executor:
+                results = list(executor.map(write, unique))
+        else:
+            results = [write(item) for item in unique]
+        failed = {filepath for filepath in results if filepath}
+
+        for filepath, data, source in duplicates:
+            try:
+                if source in failed:
+                    _write_bytes(filepath, data)
+                else:
+                    _link_or_write(filepath, data, source)
+            except Exception as e:
+                logger.warning(f"Failed to save {os.path.basename(filepath)}: {e}")
+                failed.add(filepath)
+
+        for filepath in failed:
+            self._forget_asset(filepath)
+        return [filepath for filepath in final if filepath in failed]
+
     def format_equation(self, equation: Equation) -> str:
         """
         Format equation for markdown display
@@ -140,12 +315,13 @@ class ResourceManager:
         Returns:
             Formatted LaTeX equation string for markdown
         """
-        # Check if it's already in LaTeX format
-        if '\\' in equation.equation_text or equation.equation_text.strip().startswith('$'):
-            latex = equation.equation_text.strip()
+        # Already LaTeX if it starts with '$' or contains a backslash command
+        text = equation.equation_text
+        if _LATEX_RE.search(text):
+            latex = text.strip()
         else:
             # Wrap in LaTeX delimiters
-            latex = f"$${equation.equation_text}$$"
+            latex = f"$${text}$$"
 
         # Add equation number if present
         if equation.equation_number:
@@ -165,7 +341,32 @@ class ResourceManager:
         """
         resources = {}
 
+        # Images are decoded here one by one (PyMuPDF is not thread-safe), while the
+        # file writes are queued and issued together by flush_writes()
+        self._pending_writes = []
+        try:
+            self._collect_resources(papers, resources)
+        finally:
+            failed = {os.path.basename(filepath) for filepath in self.flush_writes()}
+
+        if failed:
+            # Drop assets whose file could not be written, as a failed save_* call would
+            def written(rel_path: str) -> bool:
+                return os.path.basename(rel_path) not in failed
+
+            for paper_resources in resources.values():
+                for kind in ('figures', 'tables'):
+                    paper_resources[kind] = [item for item in paper_resources[kind] if written(item['path'])]
+            self.saved_figures = {key: path for key, path in self.saved_figures.items() if written(path)}
+            self.saved_tables = {key: path for key, path in self.saved_tables.items() if written(path)}
+
+        return resources
+
+    def _collect_resources(self, papers: List[PaperContent], resources: Dict[str, Dict]) -> None:
+        """Fill resources with each paper's saved figures, tables and formatted equations"""
         for paper in papers:
+            self._decode_lazy_images(paper)
+
             paper_resources = {
                 'figures': [],
                 'tables': [],
@@ -208,7 +409,25 @@ class ResourceManager:
 
             resources[paper.title] = paper_resources
 
-        return resources
+    @staticmethod
+    def _decode_lazy_images(paper: PaperContent) -> None:
+        """Decode a paper's lazily extracted figures and tables, opening each source PDF once"""
+        by_source: Dict[str, List] = {}
+        for resource in chain(paper.figures, paper.tables):
+            if resource.is_lazy:
+                by_source.setdefault(resource.pdf_path, []).append(resource)
+        if not by_source:
+            return
+
+        import fitz
+        for pdf_path, lazy_resources in by_source.items():
+            try:
+                doc = fitz.open(pdf_path)
+            except Exception:
+                continue  # save_figure/save_table will try (and fail) one by one
+            with doc:
+                for resource in lazy_resources:
+                    resource.load_image(doc)
 
     def _sanitize_filename(self, name: str) -> str:
         """
@@ -220,12 +439,8 @@ class ResourceManager:
         Returns:
             Sanitized filename-safe string
         """
-        # Remove or replace unsafe characters
-        safe = name.lower()
-        safe = safe.replace(' ', '_')
-        safe = ''.join(c for c in safe if c.isalnum() or c in ('_', '-'))
-        # Limit length
-        return safe[:50]
+        # Spaces become underscores, other unsafe characters are removed, length is capped at 50
+        return _sanitize_filename(name)
 
     def generate_resource_summary(self, resources: Dict[str, Dict]) -> str:
         """
@@ -237,21 +452,23 @@ class ResourceManager:
         Returns:
             Markdown formatted summary
         """
-        summary = "## Extracted Resources\n\n"
+        buf = io.StringIO()
+        write = buf.write
+        write("## Extracted Resources\n\n")
 
         for paper_title, paper_res in resources.items():
-            summary += f"### {paper_title}\n\n"
+            write(f"### {paper_title}\n\n")
 
             if paper_res['figures']:
-                summary += f"**Figures:** {len(paper_res['figures'])} extracted\n"
+                write(f"**Figures:** {len(paper_res['figures'])} extracted\n")
             if paper_res['tables']:
-                summary += f"**Tables:** {len(paper_res['tables'])} extracted\n"
+                write(f"**Tables:** {len(paper_res['tables'])} extracted\n")
             if paper_res['equations']:
-                summary += f"**Equations:** {len(paper_res['equations'])} extracted\n"
+                write(f"**Equations:** {len(paper_res['equations'])} extracted\n")
 
-            summary += "\n"
+            write("\n")
 
-        return summary
+        return buf.getvalue()
 
 
 def create_resource_manager(output_path: str) -> ResourceManager:
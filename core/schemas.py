@@ -0,0 +1,28 @@
+"""
+JSON Schema Helpers
+Building blocks for the schemas sent with structured-output requests
+"""
+from typing import Any, Dict
+
+
+def object_schema(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON schema of an object with the given properties, all required"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def text_schema(description: str) -> Dict[str, Any]:
+    return {"type": "string", "description": description}
+
+
+def text_list_schema(description: str) -> Dict[str, Any]:
+    return {"type": "array", "items": {"type": "string"}, "description": description}
+
+
+def text_map_schema(description: str) -> Dict[str, Any]:
+    """Object with free-form keys (e.g. paper titles) and string values"""
+    return {"type": "object", "additionalProperties": {"type": "string"}, "description": description}
@@ -3,12 +3,35 @@ Structure Analyzer Module
 Responsible for identifying paper section structure
 """
 import re
-from typing import Dict, List, Optional, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
 from .models import PaperContent
 from .config import Config, get_config
 
+# Leading section numbering such as "3." or "2.1"
+_NUMBERING_RE = re.compile(r'^[\d.]+\s*')
+# Section numbering such as "2" or "2.1.3"; its depth is the section level
+_LEVEL_RE = re.compile(r'^(\d+(?:\.\d+)*)\s+')
+# Deepest numbering recognised as a level; deeper numbering counts as level 1
+_MAX_LEVEL = 3
+
+
+
+@lru_cache(maxsize=None)
+def _re2_module():
+    """The google-re2 package (linear-time DFA matching), or None if it is not installed"""
+    try:
+        import re2
+    except ImportError:
+        return None
+    return re2
+
 
 @dataclass
 class Section:
@@ -73,9 +96,38 @@ class StructureAnalyzer:
         ],
     }
 
+    # Every default pattern requires one of these words, so a line containing none of
+    # them is not a title; only used while no patterns are added from config
+    DEFAULT_TITLE_KEYWORDS = (
+        "abstract", "introduction", "related", "background", "preliminar", "method",
+        "approach", "model", "proposed", "framework", "architecture", "experiment",
+        "evaluation", "result", "finding", "discussion", "analysis", "conclu", "summary",
+        "reference", "bibliography", "appendi",
+    )
+
+    # Classifications kept for short lines, which repeat across papers (headings, table
+    # cells); longer lines are body text that rarely repeats and would only churn the cache
+    TITLE_CACHE_SIZE = 4096
+    TITLE_CACHE_MAX_LENGTH = 64
+
+    # Papers whose section split is kept for repeated analyze() calls; small, since
+    # each entry holds about a full text (a few papers are extracted at a time)
+    ANALYZE_CACHE_SIZE = 8
+
     def __init__(self, config: Optional[Config] = None):
         self.config = config or get_config()
         self.section_patterns = self._load_patterns()
+        self._section_re, self._section_types = self._compile_patterns(self.section_patterns)
+        # Cheap keyword search run before the full alternation (None with configured patterns)
+        self._title_prefilter = (
+            re.compile("|".join(self.DEFAULT_TITLE_KEYWORDS))
+            if self.section_patterns is self.DEFAULT_SECTION_PATTERNS else None
+        )
+        self._classify_short_line = lru_cache(maxsize=self.TITLE_CACHE_SIZE)(self._classify_line)
+        # Merged sections by id(paper); each entry keeps a weak reference to the paper and
+        # the hash of the text it was split from, so a reused id or a changed full_text is a miss
+        self._sections_cache: "OrderedDict[int, Tuple[weakref.ref, int, Dict[str, str]]]" = OrderedDict()
+        self._sections_lock = threading.Lock()
 
     def _load_patterns(self) -> Dict[str, List[str]]:
         """Load section patterns"""
@@ -83,7 +135,8 @@ class StructureAnalyzer:
         config_patterns = self.config.structure_analyzer.section_patterns
         if config_patterns:
             # Merge config and default patterns
-            patterns = self.DEFAULT_SECTION_PATTERNS.copy()
+            patterns = {section_type: list(pattern_list)
+                        for section_type, pattern_list in self.DEFAULT_SECTION_PATTERNS.items()}
             for section_type, pattern_list in config_patterns.items():
                 if section_type in patterns:
                     patterns[section_type].extend(pattern_list)
@@ -92,19 +145,41 @@ class StructureAnalyzer:
             return patterns
         return self.DEFAULT_SECTION_PATTERNS
 
+    @staticmethod
+    def _compile_patterns(section_patterns: Dict[str, List[str]]) -> Tuple[Optional[Any], List[str]]:
+        """
+        Join all section patterns into one alternation, so each line is matched once
+
+        Every pattern becomes a named group _<i>, numbered in priority order
+        (section type order, then pattern order); the returned list maps i to
+        the section type. With google-re2 installed the alternation runs on
+        RE2's DFA, unless a configured pattern needs features RE2 lacks
+        (backreferences, lookaround), in which case it stays on re.
+
+        Lines are lower-cased before matching, so case-insensitive matching
+        is only requested when some pattern has upper-case characters (this
+        includes escapes like \\S, whose meaning must not change).
+        """
+        section_types = [section_type for section_type, patterns in section_patterns.items() for _ in patterns]
+        if not section_types:
+            return None, section_types
+        alternation = "|".join(
+            f"(?P<_{i}>{pattern})" for i, pattern in enumerate(chain.from_iterable(section_patterns.values()))
+        )
+        if alternation != alternation.lower():
+            alternation = "(?i)" + alternation
+
+        re2 = _re2_module()
+        if re2 is not None:
+            try:
+                return re2.compile(alternation), section_types
+            except re2.error:
+                pass
+        return re.compile(alternation), section_types
+
     def analyze(self, paper: PaperContent) -> Dict[str, str]:
         """Analyze paper structure and extract section content"""
-        text = paper.full_text
-        sections = self._find_sections(text)
-
-        # Extract section content
-        result = {}
-        for section in sections:
-            if section.section_type not in result:
-                result[section.section_type] = section.content
-            else:
-                # Merge same type sections
-                result[section.section_type] += "\n\n" + section.content
+        result = dict(self._merged_sections(paper))
 
         # Ensure abstract exists
         if "abstract" not in result and paper.abstract:
@@ -112,77 +187,124 @@ class StructureAnalyzer:
 
         return result
 
-    def _find_sections(self, text: str) -> List[Section]:
-        """Find all sections in text"""
-        sections = []
-        lines = text.split('\n')
+    def _merged_sections(self, paper: PaperContent) -> Dict[str, str]:
+        """Section contents by type, split once per paper text and shared by later calls"""
+        text = paper.full_text
+        key, text_hash = id(paper), hash(text)
+        with self._sections_lock:
+            cached = self._sections_cache.get(key)
+            if cached is not None and cached[0]() is paper and cached[1] == text_hash:
+                self._sections_cache.move_to_end(key)
+                return cached[2]
+
+        merged = {}
+        for section in self._find_sections(text):
+            if section.section_type not in merged:
+                merged[section.section_type] = section.content
+            else:
+                # Merge same type sections
+                merged[section.section_type] += "\n\n" + section.content
+
+        with self._sections_lock:
+            self._sections_cache[key] = (weakref.ref(paper), text_hash, merged)
+            while len(self._sections_cache) > self.ANALYZE_CACHE_SIZE:
+                self._sections_cache.popitem(last=False)
+        return merged
+
+    def iter_sections(self, paper: PaperContent, wanted: Optional[Set[str]] = None) -> Iterator[Section]:
+        """
+        Yield the paper's sections in text order, each as soon as its end is found
 
-        # Record all found section title positions
-        section_positions = []
+        Args:
+            paper: Paper to split
+            wanted: Section types to yield (all when None); others are skipped unsliced
+
+        Unlike analyze(), sections of the same type are not merged, so a caller
+        looking for one section can stop at the first match.
+        """
+        return self._find_sections(paper.full_text, wanted)
+
+    def _find_sections(self, text: str, wanted: Optional[Set[str]] = None) -> Iterator[Section]:
+        """Find all sections in text, yielding each once the next title (or the end) is reached"""
+        # Title found last, whose content runs up to the next title
+        pending = None
 
         current_pos = 0
-        for line_num, line in enumerate(lines):
+        for line in text.split('\n'):
             line_stripped = line.strip()
-            if not line_stripped:
-                current_pos += len(line) + 1
-                continue
-
             # Check if line is a section title
-            section_type = self._identify_section(line_stripped)
+            section_type = self._identify_section(line_stripped) if line_stripped else None
             if section_type:
-                section_positions.append({
-                    "type": section_type,
-                    "title": line_stripped,
-                    "line_num": line_num,
-                    "pos": current_pos,
-                    "level": self._get_section_level(line_stripped),
-                })
+                if pending is not None:
+                    yield from self._make_section(text, pending, current_pos, wanted)
+                pending = (
+                    section_type,
+                    line_stripped,
+                    current_pos,
+                    current_pos + len(line) + 1,  # Start of the line after the title
+                )
 
             current_pos += len(line) + 1
 
-        # Extract section content
-        for i, sec_info in enumerate(section_positions):
-            start_line = sec_info["line_num"] + 1  # Skip title line
-            end_line = section_positions[i + 1]["line_num"] if i + 1 < len(section_positions) else len(lines)
+        if pending is not None:
+            yield from self._make_section(text, pending, len(text), wanted)
+
+    def _make_section(self, text: str, title_info: Tuple[str, str, int, int], end_pos: int,
+                      wanted: Optional[Set[str]]) -> Iterator[Section]:
+        """Section for a title, its content sliced from the text up to end_pos (none if not wanted)"""
+        section_type, title, pos, body_pos = title_info
+        if wanted is not None and section_type not in wanted:
+            return
+        content = text[body_pos:end_pos].strip()
+        yield Section(
+            section_type=section_type,
+            title=title,
+            content=content,
+            start_pos=pos,
+            end_pos=pos + len(content),
+            level=self._get_section_level(title),
+        )
 
-            content = '\n'.join(lines[start_line:end_line]).strip()
+    def _identify_section(self, line: str) -> Optional[str]:
+        """Identify if line (already stripped) is a section title"""
+        if len(line) <= self.TITLE_CACHE_MAX_LENGTH:
+            return self._classify_short_line(line)
+        return self._classify_line(line)
 
-            sections.append(Section(
-                section_type=sec_info["type"],
-                title=sec_info["title"],
-                content=content,
-                start_pos=sec_info["pos"],
-                end_pos=sec_info["pos"] + len(content),
-                level=sec_info["level"],
-            ))
+    def _classify_line(self, line: str) -> Optional[str]:
+        """Section type of a title line, or None (uncached, see _identify_section)"""
+        if self._section_re is None:
+            return None
 
-        return sections
+        line_lower = line.lower()
+        if self._title_prefilter is not None and not self._title_prefilter.search(line_lower):
+            return None
 
-    def _identify_section(self, line: str) -> Optional[str]:
-        """Identify if line is a section title"""
-        line_lower = line.lower().strip()
+        # Remove common numbering formats (only a line starting with a digit or '.' can have any)
+        first = line_lower[:1]
+        line_clean = _NUMBERING_RE.sub('', line_lower) if first.isdecimal() or first == '.' else line_lower
 
-        # Remove common numbering formats
-        line_clean = re.sub(r'^[\d.]+\s*', '', line_lower)
+        match = self._section_re.match(line_clean)
+        if line_clean != line_lower:
+            match_lower = self._section_re.match(line_lower)
+            # The earliest pattern wins, whichever form of the line it matched
+            if match_lower and (not match or self._group_index(match_lower) < self._group_index(match)):
+                match = match_lower
 
-        for section_type, patterns in self.section_patterns.items():
-            for pattern in patterns:
-                if re.match(pattern, line_clean, re.IGNORECASE):
-                    return section_type
-                if re.match(pattern, line_lower, re.IGNORECASE):
-                    return section_type
+        return self._section_types[self._group_index(match)] if match else None
 
-        return None
+    @staticmethod
+    def _group_index(match) -> int:
+        return int(match.lastgroup[1:])
 
     def _get_section_level(self, line: str) -> int:
         """Determine section level"""
         # Simple logic: first-level numbering = level 1, second-level = level 2
-        if re.match(r'^\d+\s+', line):
-            return 1
-        if re.match(r'^\d+\.\d+\s+', line):
-            return 2
-        if re.match(r'^\d+\.\d+\.\d+\s+', line):
-            return 3
+        match = _LEVEL_RE.match(line)
+        if match:
+            level = match.group(1).count('.') + 1
+            if level <= _MAX_LEVEL:
+                return level
         return 1
 
     def get_section_summary(self, paper: PaperContent) -> Dict[str, Dict]:
@@ -218,16 +340,13 @@ class SectionExtractor:
 
     def get_main_content(self, paper: PaperContent) -> str:
         """Get main content (excluding references and appendix)"""
+        # analyze() serves the merged split cached for this paper, so no sections are re-split
         sections = self.analyzer.analyze(paper)
 
         exclude_types = {"references", "appendix"}
-        main_content_parts = []
-
-        for section_type, content in sections.items():
-            if section_type not in exclude_types:
-                main_content_parts.append(content)
-
-        return "\n\n".join(main_content_parts)
+        return "\n\n".join(
+            content for section_type, content in sections.items() if section_type not in exclude_types
+        )
 
 
 def analyze_structure(paper: PaperContent, config: Optional[Config] = None) -> Dict[str, str]:
@@ -0,0 +1,45 @@
+"""
+Token Budget Module
+Length limits measured in tokens (tiktoken) instead of characters
+"""
+import functools
+
+# Conventional characters-per-token ratio for English BPE vocabularies
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer():
+    """Shared tiktoken encoding, or None if tiktoken is not installed"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_tokens(text: str, max_chars: int) -> str:
+    """
+    Cut text to a character budget converted to tokens
+
+    The budget becomes max_chars / CHARS_PER_TOKEN tokens and the text is
+    cut on token boundaries, which tracks the real prompt cost for CJK
+    text and code. Without tiktoken this is a plain character slice.
+
+    Args:
+        text: Text to cut
+        max_chars: Length budget in characters
+
+    Returns:
+        Truncated text
+    """
+    max_tokens = max(1, max_chars // CHARS_PER_TOKEN)
+    if len(text) <= max_tokens:
+        return text  # Every token is at least one character
+
+    encoding = get_tokenizer()
+    if encoding is None:
+        return text[:max_chars]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
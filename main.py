@@ -6,6 +6,7 @@ import sys
 import os
 
 from .agent import PaperAgent
+from .core.logger import flush_logging
 
 
 def main():
@@ -114,6 +115,9 @@ def run_analyze(args):
             custom_prompt=args.prompt,  # Pass custom prompt
         )
 
+        # Let queued progress messages reach the console first
+        flush_logging()
+
         print(f"\nAnalysis complete!")
         print(f"Report saved to: {output_path}")
 
@@ -261,8 +265,18 @@ logging:
             print("Cancelled")
             return
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(config_template)
+    # Write beside the target and rename, so an interrupted init never leaves a truncated config
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(config_template)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
     print(f"Configuration file created: {output_path}")
     print("\nNext steps:")
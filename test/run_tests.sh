@@ -16,13 +16,14 @@ cd "$SCRIPT_DIR/../.."
 echo "Working directory: $(pwd)"
 echo ""
 
-# Parse arguments
+# Parse arguments (anything after the test type is passed to pytest, e.g. -n auto)
 TEST_TYPE="${1:-all}"
+shift || true
 
 case "$TEST_TYPE" in
     unit)
         echo "Running unit tests only..."
-        pytest paper_agent/test/unit/ -v
+        pytest paper_agent/test/unit/ -v "$@"
         ;;
     integration)
         echo "Running integration tests only..."
@@ -32,13 +33,13 @@ case "$TEST_TYPE" in
         echo "Running all tests..."
         echo ""
         echo "=== Unit Tests ==="
-        pytest paper_agent/test/unit/ -v || true
+        pytest paper_agent/test/unit/ -v "$@" || true
         echo ""
         echo "=== Integration Tests ==="
         ./paper_agent/test/integration/test_scenarios.sh
         ;;
     *)
-        echo "Usage: $0 [unit|integration|all]"
+        echo "Usage: $0 [unit|integration|all] [pytest options]"
         echo ""
         echo "  unit         - Run unit tests only"
         echo "  integration  - Run integration tests only"
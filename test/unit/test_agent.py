@@ -3,11 +3,6 @@ Unit Tests for Paper Agent
 """
 import pytest
 import os
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from paper_agent.agent import PaperAgent
 from paper_agent.core.config import Config
@@ -21,15 +16,27 @@ from paper_agent.test.test_config import (
     TEST_OUTPUT_DIR
 )
 
+# Checked once at collection (it lists the test data directory)
+requires_test_data = pytest.mark.skipif(
+    not check_test_data_available(), reason=f"Test data not available at {SAMPLE_PDF_DIR}"
+)
+
+
+@pytest.fixture(scope="module")
+def shared_agent():
+    """Create agent instance once per module (config parsing and component setup)"""
+    config_path = "config.yaml"
+    return PaperAgent(config_path=config_path)
+
 
 class TestPaperAgent:
     """Test Paper Agent main functionality"""
 
     @pytest.fixture
-    def agent(self):
-        """Create agent instance"""
-        config_path = "config.yaml"
-        return PaperAgent(config_path=config_path)
+    def agent(self, shared_agent):
+        """Shared agent, with loaded papers and results cleared after each test"""
+        yield shared_agent
+        shared_agent.clear()
 
     @pytest.fixture
     def sample_pdf(self):
@@ -45,28 +52,22 @@ class TestPaperAgent:
         assert agent.knowledge_aggregator is not None
         assert agent.report_generator is not None
 
+    @requires_test_data
     def test_load_single_paper(self, agent, sample_pdf):
         """Test loading single paper"""
-        if not check_test_data_available():
-            pytest.skip(f"Test data not available at {SAMPLE_PDF_DIR}")
-
         papers = agent.load_papers(sample_pdf)
         assert len(papers) == 1
         assert papers[0].title is not None
 
+    @requires_test_data
     def test_load_multiple_papers(self, agent):
         """Test loading multiple papers"""
-        if not check_test_data_available():
-            pytest.skip(f"Test data not available at {SAMPLE_PDF_DIR}")
-
         papers = agent.load_papers(str(SAMPLE_PDF_DIR))
         assert len(papers) > 0
 
+    @requires_test_data
     def test_analyze_papers(self, agent, sample_pdf):
         """Test analyzing papers"""
-        if not check_test_data_available():
-            pytest.skip(f"Test data not available at {SAMPLE_PDF_DIR}")
-
         agent.load_papers(sample_pdf)
         analyses = agent.analyze()
 
@@ -74,9 +75,8 @@ class TestPaperAgent:
         assert analyses[0].summary is not None
         assert len(analyses[0].keywords) > 0
 
-    def test_custom_prompt_aggregation(self, agent):
+    def test_custom_prompt_aggregation(self, agent, monkeypatch):
         """Test custom prompt aggregation"""
-        # Mock some paper analyses
         from paper_agent.core.models import PaperAnalysis, PaperContent
 
         paper1 = PaperContent(
@@ -95,19 +95,69 @@ class TestPaperAgent:
 
         agent._analyses = [analysis1, analysis2]
 
-        # This would call LLM, so we just test the structure
-        # In real tests, you'd mock the LLM response
-        # knowledge = agent.aggregate(custom_prompt="Test prompt")
-        # assert knowledge.custom_analysis == "Test prompt"
+        # Answer the LLM call locally, and keep the result out of the on-disk cache
+        prompts = []
+        monkeypatch.setattr(
+            agent.knowledge_aggregator.llm_helper, "ask",
+            lambda prompt, **kwargs: prompts.append(prompt) or "Custom summary",
+        )
+        monkeypatch.setattr(agent.aggregate_cache, "enabled", False)
+
+        knowledge = agent.aggregate(custom_prompt="Test prompt")
+
+        assert knowledge.custom_analysis == "Test prompt"
+        assert knowledge.overall_summary == "Custom summary"
+        assert knowledge.papers == [analysis1, analysis2]
+        assert agent._knowledge is knowledge
+        assert len(prompts) == 1
+        assert "Test prompt" in prompts[0] and "Test Paper 2" in prompts[0]
+
+    @staticmethod
+    def use_extract_cache(agent, monkeypatch, tmp_path, motivation):
+        """Point the agent at an empty extract cache and count the extractions it runs"""
+        from paper_agent.core.cache import AnalysisCache
+        from paper_agent.core.config import CacheConfig
+        from paper_agent.core.models import BackgroundAnalysis, PaperAnalysis
 
-        # For now, just verify the method exists
-        assert hasattr(agent, 'aggregate')
+        calls = []
 
+        def extract(paper):
+            calls.append(paper.file_path)
+            return PaperAnalysis(paper=paper, background=BackgroundAnalysis(motivation=motivation))
+
+        monkeypatch.setattr(agent.content_extractor, "extract", extract)
+        monkeypatch.setattr(agent.content_extractor.extractor_config, "dimensions", ["background"])
+        monkeypatch.setattr(agent, "extract_cache", AnalysisCache(CacheConfig(enabled=True, cache_dir=str(tmp_path))))
+        return calls
+
+    def test_cache_hits_do_not_share_the_cached_analysis(self, agent, monkeypatch, tmp_path):
+        """Test two papers with identical content each get their own analysis"""
+        from paper_agent.core.models import PaperContent
+
+        papers = [PaperContent(file_path=name, title="Same Paper", full_text="Same text") for name in ("a.pdf", "b.pdf")]
+        calls = self.use_extract_cache(agent, monkeypatch, tmp_path, motivation="Motivation")
+
+        analyses = [agent._extract_cached(paper) for paper in papers + papers[:1]]
+
+        assert calls == ["a.pdf"]
+        assert [analysis.paper.file_path for analysis in analyses] == ["a.pdf", "b.pdf", "a.pdf"]
+        assert analyses[1] is not analyses[2]
+
+    def test_analysis_with_empty_dimension_is_not_cached(self, agent, monkeypatch, tmp_path):
+        """Test an analysis whose dimension request failed is extracted again next time"""
+        from paper_agent.core.models import PaperContent
+
+        paper = PaperContent(file_path="a.pdf", title="Paper", full_text="Text")
+        calls = self.use_extract_cache(agent, monkeypatch, tmp_path, motivation="")
+
+        agent._extract_cached(paper)
+        agent._extract_cached(paper)
+
+        assert calls == ["a.pdf", "a.pdf"]
+
+    @requires_test_data
     def test_resolve_paths(self, agent):
         """Test path resolution"""
-        if not check_test_data_available():
-            pytest.skip(f"Test data not available at {SAMPLE_PDF_DIR}")
-
         # Test single file
         result = agent._resolve_single_path(str(SAMPLE_PDF_SINGLE))
         assert len(result) == 1
@@ -0,0 +1,89 @@
+"""
+Test Analysis Cache
+"""
+import pytest
+
+from paper_agent.core.cache import AnalysisCache
+from paper_agent.core.config import CacheConfig, Config
+from paper_agent.core.llm_client import LLMHelper
+from paper_agent.core.models import PaperContent, PaperAnalysis
+import os
+
+
+class TestAnalysisCache:
+    """Test content-addressed analysis cache"""
+
+    def test_make_key_is_stable_and_separated(self):
+        """Test key generation"""
+        assert AnalysisCache.make_key("a", 1) == AnalysisCache.make_key("a", 1)
+        assert AnalysisCache.make_key("ab", "c") != AnalysisCache.make_key("a", "bc")
+
+    def test_put_and_get_roundtrip_from_disk(self, tmp_path):
+        """Test values survive a fresh cache instance"""
+        tmpdir = str(tmp_path)
+        cfg = CacheConfig(enabled=True, cache_dir=tmpdir, expire_hours=1)
+        analysis = PaperAnalysis(paper=PaperContent(file_path="a.pdf", title="A"), summary="S")
+        key = AnalysisCache.make_key("content")
+
+        AnalysisCache(cfg).put(key, analysis)
+        assert os.path.exists(os.path.join(tmpdir, "extract", f"{key}.pkl"))
+
+        loaded = AnalysisCache(cfg).get(key)
+        assert loaded is not None
+        assert loaded.summary == "S"
+        assert loaded.title == "A"
+
+    def test_expired_entry_is_ignored(self, tmp_path):
+        """Test expire_hours is honored"""
+        tmpdir = str(tmp_path)
+        cfg = CacheConfig(enabled=True, cache_dir=tmpdir, expire_hours=1)
+        key = AnalysisCache.make_key("content")
+        AnalysisCache(cfg).put(key, {"value": 1})
+
+        path = os.path.join(tmpdir, "extract", f"{key}.pkl")
+        old = os.path.getmtime(path) - 2 * 3600
+        os.utime(path, (old, old))
+
+        assert AnalysisCache(cfg).get(key) is None
+
+    def test_disabled_cache_stores_nothing(self, tmp_path):
+        """Test disabled cache is a no-op"""
+        tmpdir = str(tmp_path)
+        cfg = CacheConfig(enabled=False, cache_dir=tmpdir)
+        cache = AnalysisCache(cfg)
+        cache.put("key", {"value": 1})
+
+        assert cache.get("key") is None
+        assert not os.path.exists(os.path.join(tmpdir, "extract"))
+
+
+class TestLLMResponseCache:
+    """Test LLM responses are replayed from the cache"""
+
+    def test_identical_requests_hit_the_cache(self, tmp_path):
+        """Test only the first identical request reaches the client"""
+        class CountingClient:
+            calls = 0
+
+            def chat(self, messages, **kwargs):
+                CountingClient.calls += 1
+                return f"answer {CountingClient.calls}"
+
+        tmpdir = str(tmp_path)
+        config = Config()
+        cache = AnalysisCache(CacheConfig(enabled=True, cache_dir=tmpdir), namespace="llm")
+        helper = LLMHelper(config, cache=cache)
+        helper.client = CountingClient()
+
+        assert helper.ask("question") == "answer 1"
+        assert helper.ask("question") == "answer 1"
+        assert helper.ask("question", temperature=0.9) == "answer 2"
+        assert CountingClient.calls == 2
+
+        # use_cache=False always reaches the client
+        assert helper.ask("question", use_cache=False) == "answer 3"
+        assert CountingClient.calls == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+"""
+Test Content Extractor
+"""
+import pytest
+import json
+import asyncio
+from concurrent.futures import Future
+
+from paper_agent.core.config import Config
+from paper_agent.core.content_extractor import ContentExtractor
+from paper_agent.core.models import PaperContent
+
+
+class FakeClient:
+    """LLM client returning canned responses and recording prompts"""
+
+    def __init__(self):
+        self.prompts = []
+        self.response_formats = []
+
+    def chat(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        if kwargs.get("response_format"):
+            self.response_formats.append(kwargs["response_format"])
+            return json.dumps({"motivation": "Structured"})
+        if "several dimensions" in prompt:
+            return json.dumps({
+                "background": {"motivation": "Motivation"},
+                "technology": {"method_overview": "Overview"},
+                "experiment": {"datasets": ["Dataset"]},
+                "result": {"main_results": "Results"},
+            })
+        if "each of the papers below" in prompt:
+            # Answer every paper but the last, which must then be retried alone
+            count = int(prompt.split("Number of papers: ")[1].split("\n")[0])
+            return json.dumps({"summaries": [
+                {"index": i, "summary": f"Batch summary {i}"} for i in range(1, count)
+            ]})
+        if messages[0]["role"] == "system":
+            return "{}"
+        return "Summary"
+
+    async def achat(self, messages, **kwargs):
+        return self.chat(messages, **kwargs)
+
+    def chat_stream(self, messages, **kwargs):
+        response = self.chat(messages, **kwargs)
+        for i in range(0, len(response), 7):
+            yield response[i:i + 7]
+
+
+def make_extractor(fused_call: bool) -> ContentExtractor:
+    config = Config()
+    config.cache.enabled = False
+    config.content_extractor.fused_call = fused_call
+    extractor = ContentExtractor(config)
+    extractor.llm_helper.client = FakeClient()
+    return extractor
+
+
+def make_paper() -> PaperContent:
+    return PaperContent(
+        file_path="paper.pdf",
+        title="Paper",
+        abstract="Abstract",
+        full_text="Introduction\nSome text\nMethod\nA mixture-of-experts model",
+    )
+
+
+class QueuedExecutor:
+    """Executor that only queues work, so every future stays pending"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+class TestContentExtractor:
+    """Test content extraction against a fake LLM client"""
+
+    def test_fused_call_fills_every_dimension_with_one_request(self):
+        """Test fused extraction issues a single dimension request"""
+        extractor = make_extractor(fused_call=True)
+        analysis = extractor.extract(make_paper())
+
+        assert analysis.background.motivation == "Motivation"
+        assert analysis.technology.method_overview == "Overview"
+        assert analysis.experiment.datasets == ["Dataset"]
+        assert analysis.result.main_results == "Results"
+        assert analysis.summary == "Summary"
+
+        prompts = extractor.llm_helper.client.prompts
+        assert sum("several dimensions" in p for p in prompts) == 1
+        assert not any(p.startswith("Analyze the research background") for p in prompts)
+
+    def test_dimensions_with_identical_content_share_one_request(self):
+        """Test duplicate dimension contents are deduplicated"""
+        extractor = make_extractor(fused_call=False)
+        # No recognizable sections: background, technology and result all fall back to the abstract
+        paper = PaperContent(file_path="paper.pdf", title="Paper", abstract="Abstract", full_text="Plain text")
+        analysis = extractor.extract(paper)
+
+        assert analysis.background.motivation == "Motivation"
+        assert analysis.result.main_results == "Results"
+
+        prompts = extractor.llm_helper.client.prompts
+        fused = [p for p in prompts if "several dimensions" in p]
+        assert len(fused) == 1
+        assert "### background, technology, result\nAbstract" in fused[0]
+        assert not any(p.startswith("Analyze the research background") for p in prompts)
+
+    def test_quick_batch_summarizes_several_papers_per_request(self):
+        """Test batched quick extraction keeps order and retries missing papers"""
+        extractor = make_extractor(fused_call=False)
+        papers = [
+            PaperContent(file_path=f"{i}.pdf", title=f"Paper {i}", abstract="Abstract")
+            for i in range(5)
+        ]
+        analyses = extractor.extract_quick_batch(papers, batch_size=3)
+
+        assert [a.title for a in analyses] == [p.title for p in papers]
+        assert [a.summary for a in analyses] == [
+            "Batch summary 1", "Batch summary 2", "Summary", "Batch summary 1", "Summary",
+        ]
+
+        prompts = extractor.llm_helper.client.prompts
+        assert sum("each of the papers below" in p for p in prompts) == 2
+
+    def test_quick_batch_runs_inside_an_event_loop(self):
+        """Test the sync batch entry point also works when called from a running loop"""
+        extractor = make_extractor(fused_call=False)
+        papers = [PaperContent(file_path=f"{i}.pdf", title=f"Paper {i}", abstract="Abstract") for i in range(2)]
+
+        async def from_loop():
+            return extractor.extract_quick_batch(papers, batch_size=2)
+
+        analyses = asyncio.run(from_loop())
+
+        assert [a.title for a in analyses] == ["Paper 0", "Paper 1"]
+
+    def test_structured_output_sends_schema_out_of_band(self):
+        """Test structured outputs drop the inline JSON description from dimension prompts"""
+        extractor = make_extractor(fused_call=False)
+        extractor.config.llm.structured_output = True
+        analysis = extractor.extract(make_paper())
+
+        assert analysis.background.motivation == "Structured"
+
+        client = extractor.llm_helper.client
+        schemas = {f["json_schema"]["name"]: f["json_schema"]["schema"] for f in client.response_formats}
+        assert set(schemas) == {"background", "technology", "experiment", "result"}
+        assert "architecture_type" in schemas["technology"]["properties"]
+
+        dimension_prompts = [p for p in client.prompts if p.startswith("Analyze the research background")]
+        assert dimension_prompts
+        assert all("JSON format" not in p for p in dimension_prompts)
+
+    def test_failed_extraction_cancels_pending_futures(self):
+        """Test an error after submitting keywords and sections cancels them"""
+        extractor = make_extractor(fused_call=True)
+        extractor._executor = QueuedExecutor()
+
+        def fail(paper, analysis):
+            raise RuntimeError("summary failed")
+
+        extractor._generate_summary = fail
+        with pytest.raises(RuntimeError):
+            extractor.extract(make_paper())
+
+        futures = extractor._executor.futures
+        assert futures and all(future.cancelled() for future in futures)
+        extractor._executor = None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
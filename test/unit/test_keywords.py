@@ -0,0 +1,33 @@
+"""
+Test Keyword Drafting
+"""
+import pytest
+
+from paper_agent.core.keywords import draft_keywords
+
+
+class TestDraftKeywords:
+    """Test local RAKE keyword candidates"""
+
+    def test_repeated_phrases_rank_first_and_stopwords_are_dropped(self):
+        """Test candidate ranking"""
+        text = (
+            "We propose a mixture-of-experts transformer with sparse expert routing. "
+            "The mixture-of-experts transformer improves language modeling. "
+            "Sparse expert routing uses a load balancing loss."
+        )
+        candidates = draft_keywords(text, top=5)
+
+        assert "sparse expert routing" in candidates[:2]
+        assert "mixture-of-experts transformer" in candidates
+        assert all(word not in ("the", "with", "we") for c in candidates for word in c.split())
+
+    def test_top_limits_candidates(self):
+        """Test the top argument"""
+        text = ", ".join(f"keyword{i} phrase" for i in range(50))
+        assert len(draft_keywords(text, top=7)) == 7
+        assert draft_keywords("", top=7) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
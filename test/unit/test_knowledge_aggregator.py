@@ -0,0 +1,163 @@
+"""
+Test Knowledge Aggregator
+"""
+import pytest
+import json
+import asyncio
+
+from paper_agent.core.config import Config
+from paper_agent.core.knowledge_aggregator import KnowledgeAggregator
+from paper_agent.core.models import PaperAnalysis, PaperContent
+
+
+class ConcurrentClient:
+    """Async LLM client that records how many requests overlap"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+        self.schema_names = []
+
+    async def achat(self, messages, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        if kwargs.get("response_format"):
+            self.schema_names.append(kwargs["response_format"]["json_schema"]["name"])
+        if "each of these dimensions" in prompt:
+            # Answer every dimension but the last, which must then be compared alone
+            dimensions = json.loads(prompt.split("each of these dimensions: ")[1].split("\n")[0])
+            return json.dumps({
+                dimension: {"comparison": {"Paper A": "batched"}, "similarities": ["Similarity"]}
+                for dimension in dimensions[:-1]
+            })
+        if "dimension" in prompt or "ARCHITECTURES" in prompt:
+            return json.dumps({
+                "comparison": {"Paper A": "value"},
+                "similarities": ["Similarity"],
+                "differences": ["Difference"],
+            })
+        if "timeline" in prompt:
+            return json.dumps({"timeline": [{"paper_title": "Paper A", "key_contribution": "Contribution", "order": 1}]})
+        if "trends" in prompt:
+            return json.dumps({"trends": [{"trend_name": "Trend", "description": "Description"}]})
+        return "Overall summary"
+
+    async def achat_stream(self, messages, **kwargs):
+        response = await self.achat(messages, **kwargs)
+        if "each of these dimensions" in messages[-1]["content"]:
+            # Cut off mid-way through the last dimension, as when max_tokens is reached
+            response = response[:-1] + ', "performance": {"comparison": {"Pap'
+        for i in range(0, len(response), 7):
+            yield response[i:i + 7]
+
+
+def make_papers():
+    return [
+        PaperAnalysis(paper=PaperContent(file_path=f"{name}.pdf", title=f"Paper {name}", abstract="Abstract"))
+        for name in "AB"
+    ]
+
+
+class TestKnowledgeAggregator:
+    """Test knowledge aggregation against a fake LLM client"""
+
+    def test_comparison_dimensions_run_concurrently(self):
+        """Test all comparison dimensions are in flight at once and keep their order"""
+        config = Config()
+        config.cache.enabled = False
+        config.knowledge_aggregator.comparison_dimensions = ["architecture", "training_method", "performance"]
+        aggregator = KnowledgeAggregator(config)
+        client = ConcurrentClient()
+        aggregator.llm_helper.client = client
+
+        papers = make_papers()
+        matrix, similarities, differences = aggregator._build_comparison_matrix(
+            papers, aggregator._prepare_papers_info(papers)
+        )
+
+        assert [item.dimension for item in matrix] == ["architecture", "training_method", "performance"]
+        assert similarities == ["Similarity"] * 3
+        assert differences == ["Difference"] * 3
+        assert client.max_in_flight == 3
+
+    def test_default_analysis_overlaps_independent_steps(self):
+        """Test comparison, timeline and trends are requested together before the summary"""
+        config = Config()
+        config.cache.enabled = False
+        config.knowledge_aggregator.comparison_dimensions = ["architecture", "performance"]
+        config.knowledge_aggregator.generate_timeline = True
+        config.knowledge_aggregator.analyze_trends = True
+        aggregator = KnowledgeAggregator(config)
+        client = ConcurrentClient()
+        aggregator.llm_helper.client = client
+
+        knowledge = aggregator.aggregate(make_papers())
+
+        assert [item.dimension for item in knowledge.comparison_matrix] == ["architecture", "performance"]
+        assert [item.paper_title for item in knowledge.timeline] == ["Paper A"]
+        assert [trend.trend_name for trend in knowledge.trends] == ["Trend"]
+        assert knowledge.common_themes == ["Similarity"] * 2
+        assert knowledge.overall_summary == "Overall summary"
+        assert client.max_in_flight == 4
+
+    def test_batch_comparison_falls_back_for_missing_dimensions(self):
+        """Test batched comparison sends one request and compares missing dimensions separately"""
+        config = Config()
+        config.cache.enabled = False
+        config.knowledge_aggregator.comparison_dimensions = ["architecture", "training_method", "performance"]
+        config.knowledge_aggregator.batch_comparison = True
+        aggregator = KnowledgeAggregator(config)
+        client = ConcurrentClient()
+        aggregator.llm_helper.client = client
+
+        papers = make_papers()
+        matrix, similarities, _ = aggregator._build_comparison_matrix(papers, aggregator._prepare_papers_info(papers))
+
+        assert [item.dimension for item in matrix] == ["architecture", "training_method", "performance"]
+        assert [item.papers["Paper A"] for item in matrix] == ["batched", "batched", "value"]
+        assert similarities == ["Similarity"] * 3
+        assert sum("each of these dimensions" in p for p in client.prompts) == 1
+        assert len(client.prompts) == 2
+
+    def test_template_summary_skips_the_summary_call(self):
+        """Test template summary mode renders the summary from the results"""
+        config = Config()
+        config.cache.enabled = False
+        config.knowledge_aggregator.comparison_dimensions = ["performance"]
+        config.knowledge_aggregator.summary_mode = "template"
+        config.report_generator.language = "english"
+        aggregator = KnowledgeAggregator(config)
+        client = ConcurrentClient()
+        aggregator.llm_helper.client = client
+
+        knowledge = aggregator.aggregate(make_papers())
+
+        assert knowledge.overall_summary.startswith("This analysis covers 2 papers: Paper A; Paper B.")
+        assert "- **performance**: Paper A: value" in knowledge.overall_summary
+        assert "- **Trend**: Description" in knowledge.overall_summary
+        assert len(client.prompts) == 3
+
+    def test_structured_output_sends_result_schemas(self):
+        """Test comparison, timeline and trend requests carry their schemas"""
+        config = Config()
+        config.cache.enabled = False
+        config.llm.structured_output = True
+        config.knowledge_aggregator.comparison_dimensions = ["performance"]
+        aggregator = KnowledgeAggregator(config)
+        client = ConcurrentClient()
+        aggregator.llm_helper.client = client
+
+        knowledge = aggregator.aggregate(make_papers())
+
+        assert sorted(client.schema_names) == ["comparison", "timeline", "trends"]
+        assert [item.paper_title for item in knowledge.timeline] == ["Paper A"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+"""
+Test LLM Client
+"""
+import pytest
+import asyncio
+
+from paper_agent.core.config import Config, LLMConfig
+from paper_agent.core.llm_client import AnthropicClient, LLMHelper, _backoff_delay, repair_json
+
+
+class TestLLMClient:
+    """Test LLM client construction and retry policy"""
+
+    def test_helpers_share_one_sdk_client(self):
+        """Test helpers for the same endpoint reuse one SDK client (and connection pool)"""
+        pytest.importorskip("openai")
+        config = Config()
+        config.llm.provider = "openai"
+        config.llm.api_key = "test-key"
+
+        first = LLMHelper(config).client
+        second = LLMHelper(config).client
+
+        assert first is not second
+        assert first.client is second.client
+
+    def test_backoff_delay_grows_exponentially(self):
+        """Test retry delays double per attempt with bounded jitter"""
+        for attempt in range(1, 5):
+            delay = _backoff_delay(2, attempt)
+            assert 2 * 2 ** (attempt - 1) <= delay <= 1.5 * 2 * 2 ** (attempt - 1)
+
+    def test_concurrent_identical_requests_are_coalesced(self):
+        """Test identical aask() calls in flight together reach the client once"""
+        class SlowClient:
+            calls = 0
+
+            async def achat(self, messages, **kwargs):
+                SlowClient.calls += 1
+                await asyncio.sleep(0.01)
+                return messages[-1]["content"].upper()
+
+        helper = LLMHelper(Config())
+        helper.client = SlowClient()
+
+        async def run():
+            return await asyncio.gather(helper.aask("a"), helper.aask("a"), helper.aask("b"))
+
+        assert asyncio.run(run()) == ["A", "A", "B"]
+        assert SlowClient.calls == 2
+        assert not helper._inflight
+
+    def test_stream_extract_json_falls_back_when_stream_fails(self):
+        """Test a stream failing before its first member is retried as a plain request"""
+        class FlakyStreamClient:
+            def chat_stream(self, messages, **kwargs):
+                raise RuntimeError("rate limited")
+                yield
+
+            def chat(self, messages, **kwargs):
+                return '{"a": 1, "b": 2}'
+
+        config = Config()
+        config.cache.enabled = False
+        helper = LLMHelper(config)
+        helper.client = FlakyStreamClient()
+
+        assert list(helper.stream_extract_json("prompt")) == [("a", 1), ("b", 2)]
+
+    def test_anthropic_stream_marks_cache_prefix(self):
+        """Test streaming requests mark the shared prompt prefix as cacheable"""
+        class FakeStream:
+            text_stream = ["ok"]
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        class FakeMessages:
+            def stream(self, **kwargs):
+                self.kwargs = kwargs
+                return FakeStream()
+
+        client = AnthropicClient(LLMConfig())
+        client._client = type("FakeSDK", (), {"messages": FakeMessages()})()
+
+        chunks = client.chat_stream([{"role": "user", "content": "Prefix. Question"}], cache_prefix="Prefix. ")
+
+        assert list(chunks) == ["ok"]
+        blocks = client._client.messages.kwargs["messages"][-1]["content"]
+        assert blocks[0] == {"type": "text", "text": "Prefix. ", "cache_control": {"type": "ephemeral"}}
+        assert blocks[1]["text"] == "Question"
+
+    def test_parse_json_repairs_common_defects(self):
+        """Test trailing commas, trailing prose and truncation are repaired locally"""
+        assert LLMHelper.parse_json('{"a": [1, 2,], "b": "x",}') == {"a": [1, 2], "b": "x"}
+        assert LLMHelper.parse_json('Here: {"a": "}"} and a stray } later') == {"a": "}"}
+        assert LLMHelper.parse_json('{"a": {"b": "cut off') == {"a": {"b": "cut off"}}
+        assert repair_json('{"a": 1, "b":') == '{"a": 1, "b":null}'
+
+        with pytest.raises(ValueError):
+            LLMHelper.parse_json("no json here")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
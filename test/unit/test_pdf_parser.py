@@ -0,0 +1,126 @@
+"""
+Test PDF Parser
+"""
+import pytest
+from pathlib import Path
+
+from paper_agent.core.config import Config
+from paper_agent.core.models import Table, render_table_screenshot
+from paper_agent.core.pdf_parser import PDFParser
+
+
+def make_pdf(path: Path, title: str, pages: int = 1) -> str:
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), f"{title}\n\nAbstract\nA short test paper.")
+    for i in range(1, pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class TestPDFParser:
+    """Test parallel PDF parsing"""
+
+    @pytest.mark.parametrize("mode", ["process", "thread"])
+    def test_parse_all_keeps_input_order(self, tmp_path, mode):
+        """Test both worker modes return papers in input order and report failures"""
+        config = Config()
+        config.cache.enabled = False
+        config.parallel.mode = mode
+        config.parallel.max_workers = 2
+        paths = [make_pdf(tmp_path / f"paper{i}.pdf", f"Paper Number {i}") for i in range(3)]
+        paths.insert(1, str(tmp_path / "missing.pdf"))
+        (tmp_path / "empty.pdf").touch()
+        paths.append(str(tmp_path / "empty.pdf"))
+
+        errors = {}
+        papers = PDFParser(config).parse_all(paths, errors)
+
+        assert [paper.file_path for paper in papers] == [paths[0], paths[2], paths[3]]
+        assert sorted(errors) == sorted([paths[1], paths[4]])
+
+    def test_iter_parse_streams_large_batches(self, tmp_path):
+        """Test iter_parse yields every paper of a batch larger than its submission window"""
+        config = Config()
+        config.cache.enabled = False
+        config.parallel.mode = "thread"
+        config.parallel.max_workers = 2
+        paths = [make_pdf(tmp_path / f"paper{i}.pdf", f"Paper Number {i}") for i in range(9)]
+
+        papers = list(PDFParser(config).iter_parse(paths))
+
+        assert sorted(paper.file_path for paper in papers) == sorted(paths)
+
+    def test_page_workers_match_sequential_parse(self, tmp_path):
+        """Test splitting one long PDF across page workers gives the same content"""
+        config = Config()
+        config.cache.enabled = False
+        path = make_pdf(tmp_path / "long.pdf", "A Long Paper", pages=40)
+
+        sequential = PDFParser(config).parse_single(path)
+        config.pdf_parser.page_workers = 2
+        split = PDFParser(config).parse_single(path)
+
+        assert split.full_text == sequential.full_text
+        assert "Page 40" in split.full_text
+        assert split.title == sequential.title
+
+    def test_lazy_images_decode_on_first_use(self, tmp_path):
+        """Test lazy figures decode to the eager bytes and lazy tables render on first use"""
+        fitz = pytest.importorskip("fitz")
+        path = str(tmp_path / "figure.pdf")
+        doc = fitz.open()
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+        pixmap.clear_with(128)
+        doc.new_page().insert_image(fitz.Rect(72, 72, 144, 144), stream=pixmap.tobytes("png"))
+        doc.save(path)
+        doc.close()
+
+        config = Config()
+        config.cache.enabled = False
+        config.pdf_parser.extract_images = True
+        eager = PDFParser(config).parse_single(path).figures
+        config.pdf_parser.lazy_images = True
+        lazy = PDFParser(config).parse_single(path).figures
+
+        assert len(lazy) == len(eager) == 1
+        assert lazy[0].image_data is None
+        assert lazy[0].load_image() == eager[0].image_data
+
+        table = Table(page=1, pdf_path=path, clip=(60, 60, 160, 160))
+        assert table.load_image().startswith(b"\x89PNG")
+
+    def test_compact_table_screenshots_are_smaller(self):
+        """Test compact table screenshots are valid PNGs several times smaller"""
+        fitz = pytest.importorskip("fitz")
+        doc = fitz.open()
+        page = doc.new_page()
+        for i in range(10):
+            page.insert_text((72, 80 + 14 * i), f"row {i} | value {i * 3.14:.2f} | more text")
+
+        full = render_table_screenshot(page, (60, 60, 400, 240))
+        compact = render_table_screenshot(page, (60, 60, 400, 240), compact=True)
+
+        assert compact.startswith(b"\x89PNG")
+        assert len(compact) * 3 < len(full)
+
+    def test_parse_cache_reuses_identical_files(self, tmp_path):
+        """Test a re-parse, or a copy at another path, is served from the parse cache"""
+        config = Config()
+        config.cache.cache_dir = str(tmp_path / "cache")
+        path = make_pdf(tmp_path / "paper.pdf", "Cached Paper")
+        copy = tmp_path / "copy.pdf"
+        copy.write_bytes(Path(path).read_bytes())
+
+        first = PDFParser(config).parse_single(path)
+        parser = PDFParser(config)
+        parser._parse_with_pymupdf = None  # Any parse now would fail
+
+        assert parser.parse_single(path).full_text == first.full_text
+        assert parser.parse_single(str(copy)).file_path == str(copy)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+Test Report Generator
+"""
+import pytest
+from pathlib import Path
+
+from paper_agent.core.config import Config
+from paper_agent.core.models import PaperAnalysis, PaperContent
+from paper_agent.core.report_generator import ReportGenerator, save_reports
+
+
+def make_papers():
+    return [
+        PaperAnalysis(paper=PaperContent(file_path=f"{name}.pdf", title=f"Paper {name}", abstract="Abstract"))
+        for name in "AB"
+    ]
+
+
+class TestReportGenerator:
+    """Test report rendering"""
+
+    def test_repeated_reports_reuse_the_rendered_body(self):
+        """Test regenerating a report from the same analyses skips rendering"""
+        generator = ReportGenerator(Config())
+        papers = make_papers()
+
+        first = generator.generate("comparison", papers)
+        generator._render_comparison_template = None  # Any render now would fail
+        second = generator.generate("comparison", papers, title="Again")
+
+        assert second.content == first.content
+        assert second.title == "Again"
+        with pytest.raises(TypeError):
+            generator.generate("comparison", make_papers())
+
+    def test_format_table_to_markdown(self):
+        """Test list-literal tables become Markdown and anything else a code block"""
+        table = ReportGenerator._format_table_to_markdown("[['h1', 'h2'], ['a'], ['b', 'c', 'd']]")
+
+        assert table == "| h1 | h2 |\n| --- | --- |\n| a |  |\n| b | c |"
+        assert ReportGenerator._format_table_to_markdown("not a table") == "```\nnot a table\n```"
+
+    def test_save_reports_writes_a_batch_in_order(self, tmp_path):
+        """Test a batch of reports is saved concurrently and paths come back in input order"""
+        config = Config()
+        config.parallel.max_workers = 3
+        generator = ReportGenerator(config)
+        papers = make_papers()
+        items = [
+            (generator.generate("single", [paper]), str(tmp_path / f"report{i}.md"), None)
+            for i, paper in enumerate(papers * 3)
+        ]
+
+        paths = save_reports(items, config)
+
+        assert paths == [path for _, path, _ in items]
+        assert [Path(path).read_text(encoding="utf-8") for path in paths] == [report.content for report, _, _ in items]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,18 +2,32 @@
 Test Resource Extraction Features
 """
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from paper_agent.core.models import PaperContent, Figure, Table, Equation, PaperAnalysis
 from paper_agent.core.resource_manager import ResourceManager
-import tempfile
+from paper_agent.core.pdf_parser import PDFParser
+from paper_agent.core.config import get_config
 import os
 
 
+@pytest.fixture(scope="module")
+def png_payload():
+    """Random image bytes the size of a small real figure, generated once for the module"""
+    return os.urandom(64 * 1024)
+
+
+@pytest.fixture(scope="module")
+def shared_manager(tmp_path_factory):
+    """ResourceManager for tests that save no files, so one instance serves the module"""
+    return ResourceManager(str(tmp_path_factory.mktemp("shared") / "report.md"))
+
+
+@pytest.fixture(scope="module")
+def sanitized_name(shared_manager):
+    """A title with unsafe characters, sanitized once for the module"""
+    return shared_manager._sanitize_filename("Test Paper: A Study of AI/ML (2024) #1")
+
+
 class TestResourceExtraction:
     """Test resource extraction and management"""
 
@@ -56,6 +70,17 @@ class TestResourceExtraction:
         assert paper.equations[0].equation_text == "E = mc^2"
         assert paper.equations[1].equation_text == "F = ma"
 
+    def test_paper_content_release_full_text(self, tmp_path):
+        """Test released full text moves to disk and reads back unchanged"""
+        tmpdir = str(tmp_path)
+        paper = PaperContent(file_path="test.pdf", full_text="Full text ✓ " * 100)
+
+        paper.release_full_text(tmpdir)
+
+        assert paper.full_text == ""
+        assert paper.load_full_text() == "Full text ✓ " * 100
+        assert paper.full_text == ""
+
     def test_paper_analysis_key_resources(self):
         """Test PaperAnalysis with key resource indices"""
         paper = PaperContent(file_path="test.pdf", title="Test")
@@ -70,166 +95,254 @@ class TestResourceExtraction:
         assert analysis.key_tables == [1]
         assert analysis.key_equations == [1, 2, 3]
 
-    def test_resource_manager_initialization(self):
+    def test_resource_manager_initialization(self, tmp_path):
         """Test ResourceManager initialization"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, "report.md")
-            manager = ResourceManager(output_path)
+        tmpdir = str(tmp_path)
+        output_path = os.path.join(tmpdir, "report.md")
+        manager = ResourceManager(output_path)
 
-            assert manager.output_path == output_path
-            assert os.path.exists(manager.assets_dir)
-            assert manager.report_name == "report"
+        assert manager.output_path == output_path
+        assert os.path.exists(manager.assets_dir)
+        assert manager.report_name == "report"
 
-    def test_resource_manager_save_figure(self):
+    def test_resource_manager_save_figure(self, tmp_path, png_payload):
         """Test saving figure with ResourceManager"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, "test_report.md")
-            manager = ResourceManager(output_path)
-
-            # Create a figure with fake image data
-            fig = Figure(
-                page=1,
-                caption="Test Figure 1",
-                image_data=b"fake_png_data"
-            )
-
-            # Save the figure
-            rel_path = manager.save_figure(fig, "Test Paper", 1)
-
-            assert rel_path is not None
-            assert "test_report_assets" in rel_path
-            assert "fig_test_paper_1.png" in rel_path
-
-            # Check file was created
-            full_path = os.path.join(tmpdir, rel_path)
-            assert os.path.exists(full_path)
-
-            # Verify content
-            with open(full_path, 'rb') as f:
-                content = f.read()
-                assert content == b"fake_png_data"
-
-    def test_resource_manager_format_equation(self):
+        tmpdir = str(tmp_path)
+        output_path = os.path.join(tmpdir, "test_report.md")
+        manager = ResourceManager(output_path)
+
+        # Create a figure with fake image data
+        fig = Figure(
+            page=1,
+            caption="Test Figure 1",
+            image_data=png_payload
+        )
+
+        # Save the figure
+        rel_path = manager.save_figure(fig, "Test Paper", 1)
+
+        assert rel_path is not None
+        assert "test_report_assets" in rel_path
+        assert "fig_test_paper_1.png" in rel_path
+
+        # Check file was created
+        full_path = os.path.join(tmpdir, rel_path)
+        assert os.path.exists(full_path)
+
+        # Verify content
+        with open(full_path, 'rb') as f:
+            content = f.read()
+            assert content == png_payload
+
+    def test_resource_manager_format_equation(self, shared_manager):
         """Test equation formatting"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, "report.md")
-            manager = ResourceManager(output_path)
-
-            # Test LaTeX equation
-            eq1 = Equation(
-                page=1,
-                equation_text="E = mc^2",
-                equation_number="(1)"
-            )
-            formatted = manager.format_equation(eq1)
-            assert "$$E = mc^2$$" in formatted
-            assert "(1)" in formatted
-
-            # Test equation with LaTeX markers already
-            eq2 = Equation(
-                page=1,
-                equation_text="$$F = ma$$",
-                equation_number="(2)"
-            )
-            formatted = manager.format_equation(eq2)
-            assert "$$F = ma$$" in formatted
-
-    def test_resource_manager_sanitize_filename(self):
-        """Test filename sanitization"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, "report.md")
-            manager = ResourceManager(output_path)
-
-            # Test various unsafe characters
-            unsafe_name = "Test Paper: A Study of AI/ML (2024) #1"
-            safe_name = manager._sanitize_filename(unsafe_name)
-
-            assert " " not in safe_name
-            assert ":" not in safe_name
-            assert "/" not in safe_name
-            assert "(" not in safe_name
-            assert "#" not in safe_name
-            assert safe_name.islower()
-
-    def test_resource_manager_save_resources(self):
-        """Test saving all resources from papers"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, "report.md")
-            manager = ResourceManager(output_path)
+        manager = shared_manager
 
-            # Create test papers with resources
-            fig1 = Figure(page=1, caption="Figure 1", image_data=b"img1")
-            table1 = Table(page=1, caption="Table 1", content="A | B\n1 | 2")
-            eq1 = Equation(page=1, equation_text="x = y", equation_number="(1)")
+        # Test LaTeX equation
+        eq1 = Equation(
+            page=1,
+            equation_text="E = mc^2",
+            equation_number="(1)"
+        )
+        formatted = manager.format_equation(eq1)
+        assert "$$E = mc^2$$" in formatted
+        assert "(1)" in formatted
 
-            paper = PaperContent(
-                file_path="test.pdf",
-                title="Test Paper",
-                figures=[fig1],
-                tables=[table1],
-                equations=[eq1]
-            )
+        # Test equation with LaTeX markers already
+        eq2 = Equation(
+            page=1,
+            equation_text="$$F = ma$$",
+            equation_number="(2)"
+        )
+        formatted = manager.format_equation(eq2)
+        assert "$$F = ma$$" in formatted
 
-            resources = manager.save_resources([paper])
+    @pytest.mark.parametrize("char", [" ", ":", "/", "(", "#"])
+    def test_resource_manager_sanitize_filename(self, sanitized_name, char):
+        """Test filename sanitization drops each unsafe character and lower-cases"""
+        assert char not in sanitized_name
+        assert sanitized_name.islower()
 
-            assert "Test Paper" in resources
-            assert len(resources["Test Paper"]["figures"]) == 1
-            assert len(resources["Test Paper"]["tables"]) == 1
-            assert len(resources["Test Paper"]["equations"]) == 1
+    def test_resource_manager_save_resources(self, tmp_path, png_payload):
+        """Test saving all resources from papers"""
+        tmpdir = str(tmp_path)
+        output_path = os.path.join(tmpdir, "report.md")
+        manager = ResourceManager(output_path)
 
-            # Verify figure was saved
-            fig_info = resources["Test Paper"]["figures"][0]
-            assert fig_info["index"] == 1
-            assert fig_info["caption"] == "Figure 1"
-            assert os.path.exists(os.path.join(tmpdir, fig_info["path"]))
+        # Create test papers with resources
+        fig1 = Figure(page=1, caption="Figure 1", image_data=png_payload)
+        table1 = Table(page=1, caption="Table 1", content="A | B\n1 | 2")
+        eq1 = Equation(page=1, equation_text="x = y", equation_number="(1)")
 
+        paper = PaperContent(
+            file_path="test.pdf",
+            title="Test Paper",
+            figures=[fig1],
+            tables=[table1],
+            equations=[eq1]
+        )
 
-class TestEquationExtraction:
-    """Test equation extraction from text"""
+        resources = manager.save_resources([paper])
+
+        assert "Test Paper" in resources
+        assert len(resources["Test Paper"]["figures"]) == 1
+        assert len(resources["Test Paper"]["tables"]) == 1
+        assert len(resources["Test Paper"]["equations"]) == 1
+
+        # Verify figure was saved
+        fig_info = resources["Test Paper"]["figures"][0]
+        assert fig_info["index"] == 1
+        assert fig_info["caption"] == "Figure 1"
+        assert os.path.exists(os.path.join(tmpdir, fig_info["path"]))
+
+    def test_resource_manager_batched_writes(self, tmp_path):
+        """Test save_resources writes assets in parallel and drops those that fail"""
+        tmpdir = str(tmp_path)
+        output_path = os.path.join(tmpdir, "report.md")
+        manager = ResourceManager(output_path, max_workers=4)
+        figures = [Figure(page=1, caption=f"Figure {i}", image_data=f"img{i}".encode()) for i in range(6)]
+        paper = PaperContent(file_path="test.pdf", title="Test Paper", figures=figures)
+        # A directory in place of the third figure's file makes its write fail
+        os.makedirs(os.path.join(manager.assets_dir, "fig_test_paper_3.png"))
+
+        resources = manager.save_resources([paper])
+
+        saved = resources["Test Paper"]["figures"]
+        assert [fig["index"] for fig in saved] == [1, 2, 4, 5, 6]
+        assert len(manager.saved_figures) == 5
+        for fig in saved:
+            with open(os.path.join(tmpdir, fig["path"]), "rb") as f:
+                assert f.read() == figures[fig["index"] - 1].image_data
+
+    def test_resource_manager_links_repeated_images(self, tmp_path):
+        """Test figures with identical bytes share one file, and rewriting one leaves the others"""
+        tmpdir = str(tmp_path)
+        manager = ResourceManager(os.path.join(tmpdir, "report.md"), max_workers=2)
+        figures = [Figure(page=1, image_data=data) for data in (b"logo", b"chart", b"logo", b"logo")]
+        paper = PaperContent(file_path="test.pdf", title="Test Paper", figures=figures)
+
+        saved = manager.save_resources([paper])["Test Paper"]["figures"]
+        paths = [os.path.join(tmpdir, fig["path"]) for fig in saved]
+        inodes = [os.stat(path).st_ino for path in paths]
+
+        assert inodes[0] == inodes[2] == inodes[3] != inodes[1]
+        manager.save_figure(Figure(page=1, image_data=b"new"), "Test Paper", 1)
+        with open(paths[0], "rb") as f:
+            assert f.read() == b"new"
+        with open(paths[2], "rb") as f:
+            assert f.read() == b"logo"
+
+    def test_resource_manager_repeat_save_moves_content_between_paths(self, tmp_path):
+        """Test saving again with figures shifted between files keeps every file correct"""
+        tmpdir = str(tmp_path)
+        manager = ResourceManager(os.path.join(tmpdir, "report.md"), max_workers=2)
+
+        for contents in ((b"X", b"Y"), (b"Y", b"Z"), (b"Z", b"Z")):
+            figures = [Figure(page=1, image_data=data) for data in contents]
+            paper = PaperContent(file_path="test.pdf", title="Test Paper", figures=figures)
+            saved = manager.save_resources([paper])["Test Paper"]["figures"]
+
+            assert len(saved) == 2
+            for fig, data in zip(saved, contents):
+                with open(os.path.join(tmpdir, fig["path"]), "rb") as f:
+                    assert f.read() == data
+
+    def test_resource_manager_batch_writes_each_path_once(self, tmp_path, monkeypatch):
+        """Test a path queued twice in one batch is written once, with its last bytes"""
+        from paper_agent.core import resource_manager
+
+        written = []
+        write_bytes = resource_manager._write_bytes
+
+        def record(path, data):
+            written.append(path)
+            write_bytes(path, data)
+
+        monkeypatch.setattr(resource_manager, "_write_bytes", record)
+        manager = ResourceManager(os.path.join(str(tmp_path), "report.md"), max_workers=4)
+        first, second = (os.path.join(manager.assets_dir, name) for name in ("a.png", "b.png"))
+
+        manager._pending_writes = []
+        for filepath, data in ((first, b"old"), (second, b"other"), (first, b"new")):
+            manager._write_file(filepath, data)
+
+        assert manager.flush_writes() == []
+        assert sorted(written) == [first, second]
+        for filepath, data in ((first, b"new"), (second, b"other")):
+            with open(filepath, "rb") as f:
+                assert f.read() == data
+
+    def test_resource_manager_decodes_lazy_images_with_one_open(self, tmp_path, monkeypatch):
+        """Test save_resources opens a paper's PDF once for all its lazy figures and tables"""
+        fitz = pytest.importorskip("fitz")
+        pdf_path = str(tmp_path / "paper.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        for i in range(3):
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+            pixmap.clear_with(40 * (i + 1))
+            page.insert_image(fitz.Rect(72, 72 + 90 * i, 144, 144 + 90 * i), stream=pixmap.tobytes("png"))
+        xrefs = [image[0] for image in page.get_images()]
+        doc.save(pdf_path)
+        doc.close()
 
-    def test_extract_latex_display_equations(self):
-        """Test extracting LaTeX display equations"""
-        from paper_agent.core.pdf_parser import PDFParser
-        from paper_agent.core.config import get_config
+        paper = PaperContent(
+            file_path=pdf_path,
+            title="Lazy Paper",
+            figures=[Figure(page=1, pdf_path=pdf_path, xref=xref) for xref in xrefs],
+            tables=[Table(page=1, pdf_path=pdf_path, clip=(60, 60, 160, 160))],
+        )
+        opened = []
+        real_open = fitz.open
+        monkeypatch.setattr(fitz, "open", lambda *args, **kwargs: opened.append(args) or real_open(*args, **kwargs))
 
-        parser = PDFParser(get_config())
+        resources = ResourceManager(str(tmp_path / "report.md")).save_resources([paper])
 
-        # Test text with display equations
-        text = r"""
-        The loss function is defined as:
-        $$L = -\sum_{i=1}^{n} y_i \log(\hat{y}_i)$$
+        assert len(opened) == 1
+        assert len(resources["Lazy Paper"]["figures"]) == 3
+        assert resources["Lazy Paper"]["tables"][0]["is_image"]
 
-        And the gradient is:
-        $$\nabla L = \frac{\partial L}{\partial w}$$
-        """
 
-        equations = parser._extract_equations(text)
+# Text with display equations
+LATEX_DISPLAY_TEXT = r"""
+The loss function is defined as:
+$$L = -\sum_{i=1}^{n} y_i \log(\hat{y}_i)$$
+
+And the gradient is:
+$$\nabla L = \frac{\partial L}{\partial w}$$
+"""
+
+# Text with a simple numbered equation (and no LaTeX)
+NUMBERED_EQUATION_TEXT = """
+The relationship is given by:
+x = y + z  (1)
 
-        # Should extract at least one equation
-        assert len(equations) >= 1
-        # Check that we extracted some mathematical content
-        assert any(("sum" in eq.equation_text or "nabla" in eq.equation_text or "partial" in eq.equation_text)
-                   for eq in equations)
+where x is the result.
+"""
 
-    def test_extract_numbered_equations(self):
-        """Test extracting numbered equations"""
-        from paper_agent.core.pdf_parser import PDFParser
-        from paper_agent.core.config import get_config
 
-        parser = PDFParser(get_config())
+@pytest.fixture(scope="module")
+def parser():
+    """PDF parser shared by the equation tests (only its text methods are used)"""
+    return PDFParser(get_config())
 
-        # Test text with simple numbered equation
-        text = """
-        The relationship is given by:
-        x = y + z  (1)
 
-        where x is the result.
-        """
+class TestEquationExtraction:
+    """Test equation extraction from text"""
 
+    @pytest.mark.parametrize("text, min_equations, math_terms", [
+        (LATEX_DISPLAY_TEXT, 1, ("sum", "nabla", "partial")),
+        # Numbered plain-text equations may or may not be extracted, depending on the pattern
+        (NUMBERED_EQUATION_TEXT, 0, ()),
+    ], ids=["latex_display", "numbered"])
+    def test_extract_equations(self, parser, text, min_equations, math_terms):
+        """Test extracting LaTeX display equations and numbered equations"""
         equations = parser._extract_equations(text)
 
-        # Should extract numbered equation if no LaTeX found
-        assert len(equations) >= 0  # May or may not extract depending on pattern
+        assert len(equations) >= min_equations
+        if math_terms:
+            # Check that we extracted some mathematical content
+            assert any(term in eq.equation_text for eq in equations for term in math_terms)
 
 
 if __name__ == "__main__":
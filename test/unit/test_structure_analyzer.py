@@ -0,0 +1,93 @@
+"""
+Test Structure Analyzer
+"""
+import pytest
+
+from paper_agent.core.config import Config
+from paper_agent.core.models import PaperContent
+from paper_agent.core.structure_analyzer import StructureAnalyzer
+
+
+class TestStructureAnalyzer:
+    """Test section identification"""
+
+    def test_identify_section_follows_pattern_priority(self):
+        """Test headings map to the first section type whose pattern matches"""
+        analyzer = StructureAnalyzer(Config())
+
+        assert analyzer._identify_section("1 Introduction") == "introduction"
+        assert analyzer._identify_section("2. Related Work") == "related_work"
+        assert analyzer._identify_section("3.1 Model") == "method"
+        assert analyzer._identify_section("Experimental Results") == "experiment"
+        assert analyzer._identify_section("Appendix A: Proofs") == "appendix"
+        assert analyzer._identify_section("The model is trained") is None
+
+    def test_title_keywords_cover_every_default_pattern(self):
+        """Test the keyword prefilter cannot reject a line a default pattern would match"""
+        for patterns in StructureAnalyzer.DEFAULT_SECTION_PATTERNS.values():
+            for pattern in patterns:
+                assert any(keyword in pattern for keyword in StructureAnalyzer.DEFAULT_TITLE_KEYWORDS), pattern
+
+        config = Config()
+        config.structure_analyzer.section_patterns = {"limitations": [r"^limitations$"]}
+        assert StructureAnalyzer(config)._title_prefilter is None
+
+    def test_config_patterns_extend_a_copy_of_the_defaults(self):
+        """Test configured patterns are matched without leaking into the class defaults"""
+        defaults = len(StructureAnalyzer.DEFAULT_SECTION_PATTERNS["method"])
+        config = Config()
+        config.structure_analyzer.section_patterns = {
+            "method": [r"^our\s+approach"], "limitations": [r"^limitations$"], "future_work": [r"^Future\s+Work$"],
+        }
+        analyzer = StructureAnalyzer(config)
+
+        assert analyzer._identify_section("Our Approach") == "method"
+        assert analyzer._identify_section("5 Limitations") == "limitations"
+        assert analyzer._identify_section("6 Future Work") == "future_work"
+        assert len(StructureAnalyzer.DEFAULT_SECTION_PATTERNS["method"]) == defaults
+
+    def test_analyze_merges_sections_of_the_same_type(self):
+        """Test section contents are split at headings and merged per type"""
+        text = "Title\nAbstract\nShort abstract.\n1 Introduction\nIntro text.\n2 Method\nPart one.\n3 Approach\nPart two."
+        sections = StructureAnalyzer(Config()).analyze(PaperContent(file_path="a.pdf", full_text=text))
+
+        assert sections["abstract"] == "Short abstract."
+        assert sections["introduction"] == "Intro text."
+        assert sections["method"] == "Part one.\n\nPart two."
+
+    def test_analyze_reuses_the_split_until_the_text_changes(self):
+        """Test repeated analyze() calls split a paper once, and again after its text changes"""
+        analyzer = StructureAnalyzer(Config())
+        paper = PaperContent(file_path="a.pdf", full_text="1 Introduction\nFirst.", abstract="Abstract")
+        calls = []
+        find_sections = analyzer._find_sections
+        analyzer._find_sections = lambda text: calls.append(text) or find_sections(text)
+
+        first = analyzer.analyze(paper)
+        first["introduction"] = "Changed by the caller"
+        second = analyzer.analyze(paper)
+        paper.full_text = "1 Introduction\nSecond."
+        third = analyzer.analyze(paper)
+
+        assert second == {"introduction": "First.", "abstract": "Abstract"}
+        assert third["introduction"] == "Second."
+        assert len(calls) == 2
+
+    def test_iter_sections_yields_wanted_sections_lazily(self):
+        """Test iter_sections yields unmerged sections in order and can stop at the first match"""
+        text = "1 Introduction\nIntro.\n2 Method\nPart one.\n3 Approach\nPart two.\nReferences\n[1] A."
+        analyzer = StructureAnalyzer(Config())
+        paper = PaperContent(file_path="a.pdf", full_text=text)
+
+        methods = analyzer.iter_sections(paper, {"method"})
+        first = next(methods)
+
+        assert (first.title, first.content) == ("2 Method", "Part one.")
+        assert [s.content for s in methods] == ["Part two."]
+        assert [s.section_type for s in analyzer.iter_sections(paper)] == [
+            "introduction", "method", "method", "references"
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])